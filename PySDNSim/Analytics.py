@@ -0,0 +1,430 @@
+import fnmatch
+import hashlib
+import os
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Log import logger
+from PySDNSim.Results import NSUMMARY, iter_experiments, read_table
+
+ANALYTICS_VERSION = "2"
+# row of the summary standing for all the network services of an experiment
+ALL = "*"
+
+
+def _group(names: np.ndarray, pattern: Union[str, None]) -> Tuple[np.ndarray, np.ndarray]:
+    """Group of every network service name, the first group of ``pattern`` or the whole name."""
+    unique, inverse = np.unique(names, return_inverse=True)
+    if pattern is None or not len(unique):
+        return unique, inverse.reshape(-1)
+    regex = re.compile(pattern)
+    matches = [regex.fullmatch(name) for name in unique.tolist()]
+    mapped = np.array([match.group(1) if match is not None else name for match, name in zip(matches, unique.tolist())])
+    groups, group_inverse = np.unique(mapped, return_inverse=True)
+    return groups, group_inverse.reshape(-1)[inverse.reshape(-1)]
+
+
+class NSAggregate:
+    """
+    Network service outcomes of one or more runs, grouped by network service name.
+
+    Holds, per group, the number of network services and of completed ones, and the sorted delays
+    (``finish - start``) of the completed ones, so that any percentile is exact and aggregates of several runs
+    can be merged.
+    """
+    __slots__ = ("_groups", "_total", "_complete", "_offsets", "_delays")
+    _groups: np.ndarray
+    _total: np.ndarray
+    _complete: np.ndarray
+    _offsets: np.ndarray
+    _delays: np.ndarray
+
+    def __init__(self, groups: np.ndarray, total: np.ndarray, complete: np.ndarray, delays: np.ndarray):
+        """Grouped outcomes.
+
+        Args:
+            groups (np.ndarray): ``(groups,)`` sorted group names.
+            total (np.ndarray): ``(groups,)`` network services of every group.
+            complete (np.ndarray): ``(groups,)`` completed network services of every group.
+            delays (np.ndarray): delays of the completed network services, by group then by delay.
+
+        Raises:
+            RuntimeError: if the arrays do not match.
+        """
+        if len(groups) != len(total) or len(groups) != len(complete) or int(complete.sum()) != len(delays):
+            raise RuntimeError("Groups, counts and delays of the aggregate are miss matching!")
+        self._groups = groups
+        self._total = total.astype(np.int64)
+        self._complete = complete.astype(np.int64)
+        self._offsets = np.concatenate(([0], np.cumsum(self._complete)))
+        self._delays = delays.astype(np.float64)
+
+    @classmethod
+    def from_table(cls, table: np.ndarray, pattern: str = None) -> "NSAggregate":
+        """Aggregate an ``NSummary.csv`` table.
+
+        Args:
+            table (np.ndarray): structured array as read by :func:`PySDNSim.Results.read_table`.
+            pattern (str, optional): regular expression on the network service name, its first group is the group
+                name, names it does not match are their own group. Defaults to None, the whole name.
+
+        Returns:
+            NSAggregate: the aggregate.
+        """
+        groups, inverse = _group(table["name"], pattern)
+        complete = table["complete"].astype(bool)
+        done = inverse[complete]
+        delays = (table["finish"] - table["start"])[complete]
+        order = np.lexsort((delays, done))
+        return cls(
+            groups,
+            np.bincount(inverse, minlength=len(groups)),
+            np.bincount(done, minlength=len(groups)),
+            delays[order],
+        )
+
+    @classmethod
+    def merge(cls, aggregates: Iterable["NSAggregate"]) -> "NSAggregate":
+        """Pool the outcomes of several aggregates, group by group.
+
+        Args:
+            aggregates (Iterable[NSAggregate]): the aggregates.
+
+        Returns:
+            NSAggregate: the pooled aggregate.
+        """
+        aggregates = list(aggregates)
+        if not aggregates:
+            return cls(np.zeros(0, dtype="U1"), np.zeros(0), np.zeros(0), np.zeros(0))
+        groups = np.unique(np.concatenate([aggregate.groups for aggregate in aggregates]))
+        total = np.zeros(len(groups), dtype=np.int64)
+        complete = np.zeros(len(groups), dtype=np.int64)
+        ids = list()
+        for aggregate in aggregates:
+            mapped = np.searchsorted(groups, aggregate.groups)
+            np.add.at(total, mapped, aggregate.total)
+            np.add.at(complete, mapped, aggregate.complete)
+            ids.append(np.repeat(mapped, aggregate.complete))
+        ids = np.concatenate(ids)
+        delays = np.concatenate([aggregate._delays for aggregate in aggregates])
+        return cls(groups, total, complete, delays[np.lexsort((delays, ids))])
+
+    def pooled(self) -> "NSAggregate":
+        """All the groups as a single one named ``*``.
+
+        Returns:
+            NSAggregate: the pooled aggregate.
+        """
+        return NSAggregate(
+            np.array([ALL]),
+            np.array([self._total.sum()]),
+            np.array([self._complete.sum()]),
+            np.sort(self._delays),
+        )
+
+    @property
+    def groups(self):
+        return self._groups
+
+    @property
+    def total(self):
+        return self._total
+
+    @property
+    def complete(self):
+        return self._complete
+
+    @property
+    def failed(self) -> np.ndarray:
+        return self._total - self._complete
+
+    def delays(self, group: str) -> np.ndarray:
+        """Sorted delays of the completed network services of a group.
+
+        Args:
+            group (str): group name.
+
+        Returns:
+            np.ndarray: the delays, empty for an unknown group.
+        """
+        index = int(np.searchsorted(self._groups, group))
+        if index == len(self._groups) or self._groups[index] != group:
+            return self._delays[0:0]
+        return self._delays[self._offsets[index]:self._offsets[index + 1]]
+
+    def delay_sum(self) -> np.ndarray:
+        """``(groups,)`` sum of the delays of every group."""
+        cumulative = np.concatenate(([0.0], np.cumsum(self._delays)))
+        return cumulative[self._offsets[1:]] - cumulative[self._offsets[:-1]]
+
+    def mean_delay(self) -> np.ndarray:
+        """``(groups,)`` mean delay of every group, nan if none completed."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(self._complete > 0, self.delay_sum() / self._complete, np.nan)
+
+    def percentiles(self, q: Sequence[float]) -> np.ndarray:
+        """Delay percentiles of every group, interpolated linearly like :func:`numpy.percentile`.
+
+        Args:
+            q (Sequence[float]): percentiles, between 0 and 100.
+
+        Returns:
+            np.ndarray: ``(groups, len(q))`` percentiles, nan for groups where none completed.
+        """
+        q = np.asarray(q, dtype=np.float64).reshape(1, -1)
+        count = self._complete.reshape(-1, 1)
+        if not len(self._delays):
+            return np.full((len(self._groups), q.shape[1]), np.nan)
+        position = np.maximum(count - 1, 0) * q / 100
+        lower = np.floor(position).astype(np.int64)
+        fraction = position - lower
+        start = self._offsets[:-1].reshape(-1, 1)
+        last = len(self._delays) - 1
+        low = self._delays[np.minimum(start + lower, last)]
+        high = self._delays[np.minimum(start + np.minimum(lower + 1, np.maximum(count - 1, 0)), last)]
+        return np.where(count > 0, low + (high - low) * fraction, np.nan)
+
+    def save(self, path: str, signature: Sequence[int] = ()):
+        """Write the aggregate to an ``.npz`` file, atomically.
+
+        Args:
+            path (str): file path.
+            signature (Sequence[int], optional): integers identifying the source, checked by :meth:`load`. Defaults to ().
+        """
+        staging = path + ".tmp.npz"
+        np.savez(staging, version=np.array(ANALYTICS_VERSION), signature=np.array(signature, dtype=np.int64),
+                 groups=self._groups, total=self._total, complete=self._complete, delays=self._delays)
+        os.replace(staging, path)
+
+    @classmethod
+    def load(cls, path: str, signature: Sequence[int] = ()) -> Union["NSAggregate", None]:
+        """Read an aggregate written by :meth:`save`.
+
+        Args:
+            path (str): file path.
+            signature (Sequence[int], optional): expected signature of the source. Defaults to ().
+
+        Returns:
+            Union[NSAggregate, None]: the aggregate, None if the file is missing, stale or unreadable.
+        """
+        try:
+            with np.load(path) as data:
+                if str(data["version"]) != ANALYTICS_VERSION or data["signature"].tolist() != list(signature):
+                    return None
+                return cls(data["groups"], data["total"], data["complete"], data["delays"])
+        except (OSError, ValueError, KeyError, RuntimeError):
+            return None
+
+
+class Analytics:
+    """
+    Network service success rates and delays of every experiment of a sweep.
+
+    ``NSummary.csv`` of every experiment is parsed once into an :class:`NSAggregate`, which is cached next to the
+    results and reused until the table changes. Summaries are then computed with grouped array operations, per
+    experiment and per network service group. Delays can be corrected by the delay of each network service
+    running alone, taken from baseline experiments.
+    """
+    _root: str
+    _pattern: Union[str, None]
+    _cache_path: Union[str, None]
+    _percentiles: Tuple[float, ...]
+    _directories: Dict[str, str]
+    _aggregates: Dict[str, Tuple[Tuple[int, int], NSAggregate]]
+    _debug: bool
+
+    def __init__(
+        self,
+        root: str,
+        pattern: str = None,
+        cache_path: str = "",
+        percentiles: Sequence[float] = (50.0, 90.0, 95.0, 99.0),
+        debug: bool = False,
+    ):
+        """Analytics of a sweep.
+
+        Args:
+            root (str): output path given to the backend, or any directory above it.
+            pattern (str, optional): regular expression on network service names whose first group is the group
+                name, e.g. ``r"(.*)_\\d+"`` for the arrivals of a workload. Defaults to None, the whole name.
+            cache_path (str, optional): directory of the cached aggregates, None to not cache them on disk.
+                Defaults to ``<root>/.analytics``.
+            percentiles (Sequence[float], optional): delay percentiles of the summaries. Defaults to 50, 90, 95 and 99.
+            debug (bool, optional): log every parsed table. Defaults to False.
+        """
+        self._root = root
+        self._pattern = pattern
+        self._cache_path = os.path.join(root, ".analytics") if cache_path == "" else cache_path
+        self._percentiles = tuple(percentiles)
+        self._directories = dict()
+        self._aggregates = dict()
+        self._debug = debug
+
+    @property
+    def root(self):
+        return self._root
+
+    @property
+    def percentiles(self):
+        return self._percentiles
+
+    def names(self, pattern: str = "*") -> List[str]:
+        """Names of the experiments with an ``NSummary.csv``, in natural sort order.
+
+        Args:
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            List[str]: matching experiment names.
+        """
+        directories = dict()
+        for name, directory in iter_experiments(self._root):
+            if not os.path.isfile(os.path.join(directory, NSUMMARY)):
+                continue
+            if name in directories:
+                logger.warning(f"Experiment {name} found more than once, keeping\t {directories[name]}.")
+                continue
+            directories[name] = directory
+        self._directories = directories
+        return [name for name in directories if fnmatch.fnmatchcase(name, pattern)]
+
+    def aggregate(self, name: str) -> NSAggregate:
+        """Grouped outcomes of one experiment, from the cache when its ``NSummary.csv`` did not change.
+
+        Args:
+            name (str): experiment name.
+
+        Raises:
+            RuntimeError: if there is no such experiment.
+
+        Returns:
+            NSAggregate: the aggregate.
+        """
+        if name not in self._directories:
+            self.names()
+        if name not in self._directories:
+            raise RuntimeError(f"No results of experiment {name} in {self._root}.")
+        table_file = os.path.join(self._directories[name], NSUMMARY)
+        stat = os.stat(table_file)
+        signature = (stat.st_size, stat.st_mtime_ns)
+        cached = self._aggregates.get(name)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        cache_file = self._cache_file(table_file)
+        aggregate = NSAggregate.load(cache_file, signature) if cache_file is not None else None
+        if aggregate is None:
+            aggregate = NSAggregate.from_table(read_table(table_file), self._pattern)
+            if self._debug:
+                logger.info(f"Aggregated {int(aggregate.total.sum())} network services of experiment\t {name}.")
+            if cache_file is not None:
+                os.makedirs(self._cache_path, exist_ok=True)
+                aggregate.save(cache_file, signature)
+        self._aggregates[name] = (signature, aggregate)
+        return aggregate
+
+    def aggregates(self, pattern: str = "*") -> Dict[str, NSAggregate]:
+        """Grouped outcomes of every matching experiment, in one pass over the sweep.
+
+        Args:
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            Dict[str, NSAggregate]: experiment name to its aggregate.
+        """
+        return {name: self.aggregate(name) for name in self.names(pattern)}
+
+    def pooled(self, pattern: str = "*") -> NSAggregate:
+        """Outcomes of every matching experiment pooled together, for delay distributions across runs.
+
+        Args:
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            NSAggregate: the pooled aggregate.
+        """
+        return NSAggregate.merge(self.aggregates(pattern).values())
+
+    def baseline(self, experiments: Union[str, Sequence[str]]) -> Dict[str, float]:
+        """Mean delay of every network service group in baseline experiments.
+
+        Args:
+            experiments (Union[str, Sequence[str]]): names or shell-style patterns of the baseline experiments.
+
+        Raises:
+            RuntimeError: if no experiment matches.
+
+        Returns:
+            Dict[str, float]: group name to its mean delay, groups where none completed are left out.
+        """
+        patterns = [experiments] if isinstance(experiments, str) else list(experiments)
+        names = [name for name in self.names() if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+        if not names:
+            raise RuntimeError(f"No baseline experiment matches {patterns}.")
+        pooled = NSAggregate.merge(self.aggregate(name) for name in names)
+        mean = pooled.mean_delay()
+        return {group: float(delay) for group, delay in zip(pooled.groups.tolist(), mean) if not np.isnan(delay)}
+
+    def summary(self, pattern: str = "*", baseline: Dict[str, float] = None, by_group: bool = True) -> np.ndarray:
+        """Success rate and delays of every matching experiment.
+
+        ``excess_delay`` is the mean delay minus the baseline delay of the group. ``delay_score`` charges every
+        completed network service its excess delay and every failed one its baseline delay, averaged over all
+        network services. Groups missing from the baseline have nan for both.
+
+        Args:
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+            baseline (Dict[str, float], optional): baseline delay of every group, see :meth:`baseline`. Defaults to
+                None, no correction.
+            by_group (bool, optional): one row per experiment and group, otherwise one row per experiment with
+                group ``*``. Defaults to True.
+
+        Returns:
+            np.ndarray: structured array with the columns experiment, group, total, complete, failed, success_rate,
+            mean_delay, one ``p<q>`` column per percentile, baseline, excess_delay and delay_score.
+        """
+        baseline = dict() if baseline is None else baseline
+        aggregates = self.aggregates(pattern)
+        # names are never truncated, the text columns are as wide as the longest one
+        experiment_width = max((len(name) for name in aggregates), default=1)
+        group_width = max((aggregate.groups.dtype.itemsize // 4 for aggregate in aggregates.values()), default=1)
+        columns = [("experiment", f"U{max(experiment_width, 1)}"), ("group", f"U{max(group_width, 1)}"),
+                   ("total", "i8"), ("complete", "i8"), ("failed", "i8"), ("success_rate", "f8"), ("mean_delay", "f8")]
+        columns += [(f"p{q:g}", "f8") for q in self._percentiles]
+        columns += [("baseline", "f8"), ("excess_delay", "f8"), ("delay_score", "f8")]
+        parts = list()
+        for name, aggregate in aggregates.items():
+            base = np.array([baseline.get(group, np.nan) if baseline else 0.0 for group in aggregate.groups.tolist()])
+            excess = aggregate.delay_sum() - aggregate.complete * base
+            penalty = aggregate.failed * base
+            total, complete = aggregate.total, aggregate.complete
+            if by_group:
+                groups = aggregate.groups
+            else:
+                excess, penalty = np.array([excess.sum()]), np.array([penalty.sum()])
+                aggregate = aggregate.pooled()
+                groups, total, complete = aggregate.groups, aggregate.total, aggregate.complete
+                base = np.full(1, np.nan if baseline else 0.0)
+            part = np.zeros(len(groups), dtype=columns)
+            part["experiment"] = name
+            part["group"] = groups
+            part["total"] = total
+            part["complete"] = complete
+            part["failed"] = total - complete
+            with np.errstate(divide="ignore", invalid="ignore"):
+                part["success_rate"] = np.where(total > 0, complete / total, np.nan)
+                part["excess_delay"] = np.where(complete > 0, excess / complete, np.nan)
+                part["delay_score"] = np.where(total > 0, (excess + penalty) / total, np.nan)
+            part["mean_delay"] = aggregate.mean_delay()
+            for q, values in zip(self._percentiles, aggregate.percentiles(self._percentiles).T):
+                part[f"p{q:g}"] = values
+            part["baseline"] = base
+            parts.append(part)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=columns)
+
+    def _cache_file(self, table_file: str) -> Union[str, None]:
+        if self._cache_path is None:
+            return None
+        key = f"{os.path.abspath(table_file)}\0{self._pattern}"
+        return os.path.join(self._cache_path, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".npz")
@@ -2,6 +2,7 @@ class AutoScale:
     """
     AutoScale config for microservices.
     """
+    __slots__ = ("_telemetry", "_threshold")
     _telemetry: str
     _threshold: float
 
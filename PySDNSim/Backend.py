@@ -1,32 +1,54 @@
+import asyncio
 import json
 import os
 import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from threading import Thread
-from typing import List, Union
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterable, List, Tuple, Union
 
+from PySDNSim.Cache import ResultCache, config_digest, tree_size
 from PySDNSim.Config import Config
+from PySDNSim.ConfigWriter import BINARY, FORMATS, JSON, write_columnar_config
 from PySDNSim.Experiment import Experiment
+from PySDNSim.Feasibility import FeasibilityCheck
 from PySDNSim.Host import Host
-from PySDNSim.Log import logger
+from PySDNSim.Log import logger, open_experiment_log
+from PySDNSim.Metrics import format_summary, summarize
 from PySDNSim.Microservice import Microservice
 from PySDNSim.NetworkService import NetworkService
+from PySDNSim.NetworkServiceBatch import NetworkServiceBatch
+from PySDNSim.RunResult import RunResult
+from PySDNSim.SteadyState import SteadyStateWatcher
 
 
 class Backend:
     _ready: Union[bool, None]
     _debug:bool
+    _cache: Union[ResultCache, None]
+    _config_format: str
+    _watcher: Union[SteadyStateWatcher, None]
+    _preflight: Union[FeasibilityCheck, None]
 
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, cache: ResultCache = None, config_format: str = JSON,
+                 watcher: SteadyStateWatcher = None, preflight: FeasibilityCheck = None):
         self._debug = debug
+        self._cache = cache
+        self._config_format = self.check_format(config_format)
+        self._watcher = watcher
+        self._preflight = preflight
+        self._ready = self._find_executable()
+
+    def _find_executable(self) -> bool:
+        """Whether the simulation backend can be started, checked once when the backend is created."""
         if os.path.isfile("backend.jar"):
             if self.debug:
                 logger.info("Found simulation backend executable file.")
-            self._ready = True
-        else:
-            if self.debug:
-                logger.error("Can not find simulation backend executable file.")
-            self._ready = False
-
+            return True
+        if self.debug:
+            logger.error("Can not find simulation backend executable file.")
+        return False
 
 
     @property
@@ -37,15 +59,43 @@ class Backend:
     def debug(self):
         return self._debug
 
+    @property
+    def cache(self):
+        return self._cache
+
+    @property
+    def watcher(self):
+        """Steady-state watcher stopping runs early, None to always run to the end."""
+        return self._watcher
+
+    @property
+    def preflight(self):
+        """Capacity check rejecting experiments before their configuration is generated, None to run them all."""
+        return self._preflight
+
+    @property
+    def config_format(self):
+        """Format of the generated configuration files, see :mod:`PySDNSim.ConfigWriter`."""
+        return self._config_format
+
     @staticmethod
-    def generate_config(
+    def check_format(config_format: str) -> str:
+        if config_format not in FORMATS:
+            raise RuntimeError(f"Configuration format {config_format} does not exist.")
+        return config_format
+
+    @property
+    def tag(self):
+        """Identifies the execution engine in result cache keys, the jar itself is identified by its digest."""
+        return ""
+
+    @staticmethod
+    def build_config(
         config: Config,
         hosts: List[Host],
         microservices: List[Microservice],
         network_services: List[NetworkService],
-        config_file: str,
-        debug: bool = False,
-    ):
+    ) -> dict:
         sim_config = dict()
         sim_config["Config"] = {
             "interval": config.interval,
@@ -95,51 +145,595 @@ class Backend:
         sim_config["NetworkServices"] = list()
         for ns in network_services:
             ns_config = {"name": ns.name, "flows": ns.flows, "Job": list()}
-            for job in ns.jobs:
+            for job, schedule in ns.iter_jobs():
                 job_config = {
                     "ms": job.ms_id,
                     "length": job.length,
-                    "schedule": job.schedule,
+                    "schedule": schedule,
                 }
                 ns_config["Job"].append(job_config)
             sim_config["NetworkServices"].append(ns_config)
 
-        if os.path.exists("configs") is False:
-            os.makedirs("configs")
+        return sim_config
+
+    @staticmethod
+    def write_config(sim_config: dict, config_file: str, debug: bool = False):
+        os.makedirs("configs", exist_ok=True)
         if debug:
             logger.info(f"Generated new simulation configuration file\t {config_file}.")
         with open("configs/" + config_file, "w+") as file:
             json.dump(sim_config, file, indent=4)
 
-    def run_experiment(self, experiment: Experiment, output_path: str):
-        if self.ready is True:
-                config_file = experiment.name + ".json"
-                
-                if os.path.exists(output_path) is False:
-                    os.makedirs(output_path)
-
-                self.generate_config(
-                    config=experiment.config,
-                    hosts=[experiment.host],
-                    microservices=experiment.microservices,
-                    network_services=experiment.network_services,
-                    config_file=config_file,
-                    debug = self.debug
+    @staticmethod
+    def generate_config(
+        config: Config,
+        hosts: List[Host],
+        microservices: List[Microservice],
+        network_services: List[NetworkService],
+        config_file: str,
+        debug: bool = False,
+        config_format: str = JSON,
+    ) -> str:
+        """Write the configuration file of an experiment.
+
+        The "json" format is the one read by the jar. The "columnar" and "binary" formats are streamed by
+        :func:`PySDNSim.ConfigWriter.write_columnar_config` and are read by the in-process engine.
+
+        Args:
+            config (Config): simulation configuration.
+            hosts (List[Host]): hosts.
+            microservices (List[Microservice]): microservices.
+            network_services (List[NetworkService]): network services.
+            config_file (str): file name in the configs directory.
+            debug (bool, optional): log the generated file. Defaults to False.
+            config_format (str, optional): "json", "columnar" or "binary". Defaults to "json".
+
+        Raises:
+            RuntimeError: if the format does not exist.
+
+        Returns:
+            str: hex digest of the configuration, usable with :meth:`PySDNSim.Cache.ResultCache.digest_key`.
+        """
+        if Backend.check_format(config_format) != JSON:
+            return write_columnar_config(
+                config=config,
+                hosts=hosts,
+                microservices=microservices,
+                network_services=network_services,
+                config_file=config_file,
+                sidecar=config_format == BINARY,
+                debug=debug,
+            )
+        sim_config = Backend.build_config(
+            config=config,
+            hosts=hosts,
+            microservices=microservices,
+            network_services=network_services,
+        )
+        Backend.write_config(sim_config=sim_config, config_file=config_file, debug=debug)
+        return config_digest(sim_config)
+
+    def run_experiment(self, experiment: Experiment, output_path: str) -> RunResult:
+        """Generate the configuration of an experiment and run it with the backend.
+
+        Args:
+            experiment (Experiment): the experiment to run.
+            output_path (str): directory under which the results of the experiment are written.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing.
+
+        Returns:
+            RunResult: exit code and wall time of the run.
+        """
+        return self.run_batches(experiment, None, output_path)
+
+    def run_batches(self, experiment: Experiment, batches: Union[Iterable[NetworkServiceBatch], None],
+                    output_path: str) -> RunResult:
+        """Run an experiment whose jobs are given as job arrays, e.g. generated by :class:`PySDNSim.Workload.Workload`.
+
+        The batches are streamed into the columnar configuration writer in place of the network services of the
+        experiment, the preflight check and the result cache apply as for :meth:`run_experiment`.
+
+        Args:
+            experiment (Experiment): the experiment, its network services are ignored when batches are given.
+            batches (Union[Iterable[NetworkServiceBatch], None]): job arrays of the network services, None to use
+                the network services of the experiment.
+            output_path (str): directory under which the results of the experiment are written.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing or batches are given to a backend reading the
+                json format.
+
+        Returns:
+            RunResult: exit code and wall time of the run.
+        """
+        config_file, experiment_output, key, cached, recorded = self._prepare(experiment, output_path, batches)
+        if cached is not None:
+            return cached
+        result = self._launch(name=experiment.name, config_file=config_file, output_path=experiment_output)
+        return self._complete(key, result, recorded)
+
+    async def run_experiment_async(self, experiment: Experiment, output_path: str, timeout: float = None) -> RunResult:
+        """Generate the configuration of an experiment and run it without blocking the event loop.
+
+        The configuration is generated in the default executor of the loop and the backend is an asyncio
+        subprocess. Cancelling the coroutine kills the backend process. A :attr:`watcher` stops the run at steady
+        state as in :meth:`run_experiment`, ``peak_rss_mb`` is not measured on this path.
+
+        Args:
+            experiment (Experiment): the experiment to run.
+            output_path (str): directory under which the results of the experiment are written.
+            timeout (float, optional): seconds after which the backend process is killed. Defaults to None.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing.
+
+        Returns:
+            RunResult: exit code and wall time of the run, ``timed_out`` is set if it was killed and ``stop_reason``
+            if the watcher stopped it.
+        """
+        loop = asyncio.get_running_loop()
+        config_file, experiment_output, key, cached, recorded = await loop.run_in_executor(
+            None, self._prepare, experiment, output_path
+        )
+        if cached is not None:
+            return cached
+        result = await self._launch_async(
+            name=experiment.name, config_file=config_file, output_path=experiment_output, timeout=timeout
+        )
+        return await loop.run_in_executor(None, self._complete, key, result, recorded)
+
+    def _prepare(self, experiment: Experiment, output_path: str, batches: Iterable[NetworkServiceBatch] = None
+                 ) -> Tuple[str, str, Union[str, None], Union[RunResult, None], Dict[str, Any]]:
+        """Write the configuration of an experiment, or take its results from the cache.
+
+        Returns:
+            Tuple[str, str, Union[str, None], Union[RunResult, None], Dict[str, Any]]: configuration file,
+            output directory, cache key, the result of a cache hit or of a rejected experiment and what is recorded
+            on the result, the time spent building and writing the configuration and its digest.
+        """
+        if self.ready is not True:
+            raise RuntimeError("Simulation backend executable file is missing.")
+        if batches is not None and self.config_format == JSON:
+            raise RuntimeError("Job arrays are written in the columnar or binary format.")
+        config_file = experiment.name + ".json"
+        experiment_output = output_path + "/" + experiment.name
+
+        if self.preflight is not None:
+            feasibility = self.preflight.check(experiment)
+            if not feasibility.feasible:
+                logger.warning(f"Rejected experiment\t {experiment.name}: {feasibility.reason}")
+                rejected = RunResult(
+                    name=experiment.name,
+                    config_file="./configs/" + config_file,
+                    output_path=experiment_output,
+                    return_code=None,
+                    wall_time=0.0,
+                    reject_reason=feasibility.reason,
                 )
+                return "./configs/" + config_file, experiment_output, None, rejected, dict()
+            if feasibility.warnings and self.debug:
+                logger.warning(f"Experiment\t {experiment.name}: {feasibility.reason}")
 
-                subprocess.call(
-                        [
-                            "java",
-                            "-jar",
-                            "backend.jar",
-                            "./configs/" + config_file,
-                            output_path + "/" + experiment.name,
-                        ]
-                    )
-                if self.debug:
-                    logger.info(f"Simulation completed for experiment\t {experiment.name}.")
+        os.makedirs(output_path, exist_ok=True)
 
+        start = time.perf_counter()
+        sim_config = None
+        if self.config_format == JSON:
+            microservices, network_services = experiment.materialise()
+            sim_config = self.build_config(
+                config=experiment.config,
+                hosts=[experiment.host],
+                microservices=microservices,
+                network_services=network_services,
+            )
+            config_hash = config_digest(sim_config)
+            recorded = {"build_time": time.perf_counter() - start}
         else:
+            # streamed formats are hashed while they are written, there is no separate build phase
+            config_hash = self._generate(experiment, config_file, batches)
+            recorded = {"write_time": time.perf_counter() - start}
+        recorded["config_digest"] = config_hash
+
+        key = None
+        if self.cache is not None:
+            key = self.cache.digest_key(config_hash, self.tag)
+            if self.cache.fetch(key, experiment_output):
+                if self.debug:
+                    logger.info(f"Reused cached results for experiment\t {experiment.name}.")
+                cached = RunResult(
+                    name=experiment.name,
+                    config_file="./configs/" + config_file,
+                    output_path=experiment_output,
+                    return_code=0,
+                    wall_time=time.perf_counter() - start,
+                    cached=True,
+                    output_bytes=tree_size(experiment_output),
+                    **recorded,
+                )
+                return "./configs/" + config_file, experiment_output, key, cached, recorded
+
+        if sim_config is not None:
+            start = time.perf_counter()
+            self.write_config(sim_config=sim_config, config_file=config_file, debug=self.debug)
+            recorded["write_time"] = time.perf_counter() - start
+        return "./configs/" + config_file, experiment_output, key, None, recorded
+
+    def _complete(self, key: Union[str, None], result: RunResult, recorded: Dict[str, Any] = None) -> RunResult:
+        result._record(output_bytes=tree_size(result.output_path), **(recorded or {}))
+        # partial results of a run stopped early must not stand in for a complete run
+        if key is not None and result.success and not result.stopped_early:
+            self.cache.store(key, result.output_path)
+        if self.debug:
+            logger.info(f"Simulation completed for experiment\t {result.name}.\t {_phases(result)}")
+        return result
+
+    def cache_key(self, experiment: Experiment) -> str:
+        """Result cache key of an experiment, e.g. to invalidate it.
+
+        Args:
+            experiment (Experiment): the experiment.
+
+        Raises:
+            RuntimeError: if the backend has no result cache.
+
+        Returns:
+            str: the cache key.
+        """
+        if self.cache is None:
+            raise RuntimeError("Backend has no result cache.")
+        if self.config_format != JSON:
+            return self.cache.digest_key(self._generate(experiment, experiment.name + ".json"), self.tag)
+        microservices, network_services = experiment.materialise()
+        return self.cache.key(
+            self.build_config(
+                config=experiment.config,
+                hosts=[experiment.host],
+                microservices=microservices,
+                network_services=network_services,
+            ),
+            self.tag,
+        )
+
+    def _generate(self, experiment: Experiment, config_file: str, batches: Iterable[NetworkServiceBatch] = None) -> str:
+        microservices, network_services = experiment.materialise()
+        return self.generate_config(
+            config=experiment.config,
+            hosts=[experiment.host],
+            microservices=microservices,
+            network_services=network_services if batches is None else batches,
+            config_file=config_file,
+            debug=self.debug,
+            config_format=self.config_format,
+        )
+
+    def run_experiments(
+        self,
+        experiments: List[Experiment],
+        output_path: Union[str, List[str]],
+        max_workers: int = None,
+    ) -> List[RunResult]:
+        """Run several experiments concurrently, each in its own backend process.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+            max_workers (int, optional): maximum number of concurrent backend processes. Defaults to the number of CPUs.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing, experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[RunResult]: results in the order the experiments were given.
+        """
+        if self.ready is not True:
+            raise RuntimeError("Simulation backend executable file is missing.")
+        experiments = list(experiments)
+        output_paths = self.pair_output_paths(experiments, output_path)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self.run_experiment, experiments, output_paths))
+        if self.debug:
+            logger.info("Timing summary of the batch:\n" + format_summary(summarize(results)))
+        return results
+
+    async def run_experiments_async(
+        self,
+        experiments: List[Experiment],
+        output_path: Union[str, List[str]],
+        max_concurrency: int = None,
+        timeout: float = None,
+    ) -> List[RunResult]:
+        """Run several experiments concurrently from an event loop.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+            max_concurrency (int, optional): maximum number of concurrent backend processes. Defaults to the number of CPUs.
+            timeout (float, optional): seconds after which a backend process is killed. Defaults to None.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing, experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[RunResult]: results in the order the experiments were given.
+        """
+        tasks = self._schedule_async(experiments, output_path, max_concurrency, timeout)
+        try:
+            return list(await asyncio.gather(*tasks))
+        finally:
+            await _cancel(tasks)
+
+    async def iter_completed(
+        self,
+        experiments: List[Experiment],
+        output_path: Union[str, List[str]],
+        max_concurrency: int = None,
+        timeout: float = None,
+    ) -> AsyncIterator[RunResult]:
+        """Run several experiments concurrently and yield every result as soon as its run completes.
+
+        Closing the iterator early, or cancelling the task consuming it, kills the backend processes still running.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+            max_concurrency (int, optional): maximum number of concurrent backend processes. Defaults to the number of CPUs.
+            timeout (float, optional): seconds after which a backend process is killed. Defaults to None.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing, experiment names collide or the output paths mismatch the experiments.
+
+        Yields:
+            RunResult: results in completion order.
+        """
+        tasks = self._schedule_async(experiments, output_path, max_concurrency, timeout)
+        try:
+            for completed in asyncio.as_completed(tasks):
+                yield await completed
+        finally:
+            await _cancel(tasks)
+
+    def _schedule_async(
+        self,
+        experiments: List[Experiment],
+        output_path: Union[str, List[str]],
+        max_concurrency: Union[int, None],
+        timeout: Union[float, None],
+    ) -> List["asyncio.Future[RunResult]"]:
+        if self.ready is not True:
             raise RuntimeError("Simulation backend executable file is missing.")
+        experiments = list(experiments)
+        output_paths = self.pair_output_paths(experiments, output_path)
+        semaphore = asyncio.Semaphore(max_concurrency or os.cpu_count() or 1)
+
+        async def run(experiment: Experiment, path: str) -> RunResult:
+            async with semaphore:
+                return await self.run_experiment_async(experiment, path, timeout)
+
+        return [asyncio.ensure_future(run(experiment, path)) for experiment, path in zip(experiments, output_paths)]
+
+    @staticmethod
+    def pair_output_paths(experiments: List[Experiment], output_path: Union[str, List[str]]) -> List[str]:
+        """Pair every experiment of a batch with its output directory.
+
+        Args:
+            experiments (List[Experiment]): experiments of the batch.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+
+        Raises:
+            RuntimeError: if experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[str]: one output directory per experiment.
+        """
+        if isinstance(output_path, str):
+            output_paths = [output_path] * len(experiments)
+        else:
+            output_paths = list(output_path)
+            if len(output_paths) != len(experiments):
+                raise RuntimeError("Lists of experiments and output paths are miss matching!")
+        names = set()
+        for experiment in experiments:
+            if experiment.name in names:
+                raise RuntimeError(f"Experiment {experiment.name} is given more than once.")
+            names.add(experiment.name)
+        return output_paths
+
+    def _command(self, config_file: str, output_path: str, heap_mb: int = None) -> List[str]:
+        options = [f"-Xmx{heap_mb}m"] if heap_mb is not None else []
+        return [
+            "java",
+            *options,
+            "-jar",
+            "backend.jar",
+            config_file,
+            output_path,
+        ]
+
+    def _launch(self, name: str, config_file: str, output_path: str) -> RunResult:
+        return self._spawn(name=name, config_file=config_file, output_path=output_path)
+
+    def _spawn(self, name: str, config_file: str, output_path: str, heap_mb: int = None) -> RunResult:
+        """Run the backend in a child process, measuring its start-up and its peak resident memory.
+
+        The output of the child goes to its experiment log if those are configured, see
+        :func:`PySDNSim.Log.configure_logging`, and to our standard output otherwise. With a :attr:`watcher` the
+        child is terminated once its results reach a steady state.
+        """
+        log = open_experiment_log(name)
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            self._command(config_file, output_path, heap_mb),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT if log is not None else None,
+        )
+        first_output: List[float] = list()
+        sink = log.write if log is not None else _write_stdout
+        forward = Thread(target=_forward, args=(process.stdout, first_output, sink), daemon=True)
+        forward.start()
+        watch = None
+        if self.watcher is not None:
+            watch = self.watcher.watch(name, output_path, process.terminate, process.kill)
+        peak_rss_mb = None
+        if hasattr(os, "wait4"):
+            if watch is not None and hasattr(os, "waitid"):
+                # wait without reaping, so the watcher can not signal a recycled pid
+                os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+                watch.finish()
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = _exit_code(status)
+            # ru_maxrss is in KiB on Linux and in bytes on macOS
+            peak_rss_mb = usage.ru_maxrss / (2 ** 20 if sys.platform == "darwin" else 2 ** 10)
+        else:
+            process.wait()
+        wall_time = time.perf_counter() - start
+        stop_reason = watch.finish() if watch is not None else None
+        forward.join()
+        if log is not None:
+            log.close()
+        if process.returncode != 0 and stop_reason is None:
+            logger.warning(f"Backend exited with code {process.returncode} for experiment\t {name}.")
+        return RunResult(
+            name=name,
+            config_file=config_file,
+            output_path=output_path,
+            return_code=process.returncode,
+            wall_time=wall_time,
+            startup_time=first_output[0] - start if first_output else None,
+            peak_rss_mb=peak_rss_mb,
+            stop_reason=stop_reason,
+        )
+
+    async def _launch_async(self, name: str, config_file: str, output_path: str, timeout: float = None) -> RunResult:
+        """Run the backend as an asyncio subprocess, stopped early by the :attr:`watcher` if there is one.
+
+        The peak resident memory of the child is not measured, asyncio reaps it without its resource usage.
+        """
+        log = open_experiment_log(name)
+        start = time.perf_counter()
+        watch = None
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._command(config_file, output_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT if log is not None else None,
+            )
+            first_output: List[float] = list()
+            sink = log.write if log is not None else _write_stdout
+            forward = asyncio.ensure_future(_forward_async(process.stdout, first_output, sink))
+            loop = asyncio.get_running_loop()
+            if self.watcher is not None:
+                # the watch thread signals through the loop, which knows whether the child was reaped already
+                watch = self.watcher.watch(
+                    name,
+                    output_path,
+                    lambda: loop.call_soon_threadsafe(_signal, process, False),
+                    lambda: loop.call_soon_threadsafe(_signal, process, True),
+                )
+            timed_out = False
+            try:
+                return_code = await asyncio.wait_for(process.wait(), timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                return_code = await _kill(process)
+                logger.warning(f"Backend timed out after {timeout} s for experiment\t {name}.")
+            except asyncio.CancelledError:
+                forward.cancel()
+                await _kill(process)
+                raise
+            wall_time = time.perf_counter() - start
+            stop_reason = None
+            if watch is not None:
+                stop_reason = await loop.run_in_executor(None, watch.finish)
+                watch = None
+            await forward
+        finally:
+            if watch is not None:
+                watch.finish()
+            if log is not None:
+                log.close()
+        if return_code != 0 and not timed_out and stop_reason is None:
+            logger.warning(f"Backend exited with code {return_code} for experiment\t {name}.")
+        return RunResult(
+            name=name,
+            config_file=config_file,
+            output_path=output_path,
+            return_code=return_code,
+            wall_time=wall_time,
+            timed_out=timed_out,
+            startup_time=first_output[0] - start if first_output else None,
+            stop_reason=stop_reason,
+        )
+
+
+def _write_stdout(chunk: bytes):
+    buffer = getattr(sys.stdout, "buffer", None)
+    if buffer is not None:
+        buffer.write(chunk)
+        buffer.flush()
+    else:
+        sys.stdout.write(chunk.decode("utf-8", errors="replace"))
+
+
+def _forward(stream: IO[bytes], first_output: List[float], sink: Callable[[bytes], Any]):
+    while True:
+        chunk = os.read(stream.fileno(), 65536)
+        if not chunk:
+            break
+        if not first_output:
+            first_output.append(time.perf_counter())
+        sink(chunk)
+    stream.close()
+
+
+async def _forward_async(stream: "asyncio.StreamReader", first_output: List[float], sink: Callable[[bytes], Any]):
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        if not first_output:
+            first_output.append(time.perf_counter())
+        sink(chunk)
+
+
+def _exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+def _phases(result: RunResult) -> str:
+    phases = (("build", result.build_time), ("write", result.write_time), ("startup", result.startup_time),
+              ("wall", result.wall_time))
+    return " ".join(f"{phase}={value:.3f}s" for phase, value in phases if value is not None)
+
+
+async def _kill(process: "asyncio.subprocess.Process") -> int:
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    return await process.wait()
+
+
+def _signal(process: "asyncio.subprocess.Process", kill: bool):
+    if process.returncode is None:
+        try:
+            if kill:
+                process.kill()
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            pass
+
 
-        
+async def _cancel(tasks: List["asyncio.Future[RunResult]"]):
+    pending = [task for task in tasks if not task.done()]
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,287 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterator, Tuple
+
+from PySDNSim.Log import logger
+
+try:
+    import fcntl
+except ImportError:
+    # without advisory locks, processes sharing a cache directory may lose each other's index updates
+    fcntl = None
+
+_INDEX = "index.json"
+_INDEX_LOCK = "index.lock"
+
+
+def config_digest(sim_config: Dict[str, Any]) -> str:
+    """Canonical digest of a simulation configuration.
+
+    Args:
+        sim_config (Dict[str, Any]): configuration as built by :meth:`PySDNSim.Backend.Backend.build_config`.
+
+    Returns:
+        str: hex sha256 digest, independent of key order and formatting.
+    """
+    canonical = json.dumps(sim_config, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: str, block_size: int = 1 << 20) -> str:
+    """Hex sha256 digest of a file, read block by block.
+
+    Args:
+        path (str): path of the file.
+        block_size (int, optional): read size in bytes. Defaults to 1 MiB.
+
+    Returns:
+        str: hex sha256 digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tree_size(path: str) -> int:
+    """Total size in bytes of the files under a directory, 0 if it does not exist."""
+    size = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            size += os.path.getsize(os.path.join(root, name))
+    return size
+
+
+def _link_or_copy(src: str, dst: str):
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+class ResultCache:
+    """
+    Content addressed store of backend output directories.
+
+    Entries are keyed by the canonical digest of the generated configuration and the digest of the backend jar,
+    so an experiment is only simulated again when its configuration, seed or the backend itself changes.
+
+    The modification time of an entry directory is its last use, a hit only touches it. The index of entry sizes is
+    rewritten when entries are added or dropped, under a file lock and merged with the index on disk, so several
+    processes can share one cache directory.
+    """
+    _path: str
+    _max_bytes: int
+    _jar: str
+    _link: bool
+    _lock: threading.Lock
+    _index: Dict[str, Dict[str, int]]
+    _jar_digest: Tuple[Tuple[float, int], str]
+
+    def __init__(self, path: str = ".cache", max_bytes: int = 10 * 1024 ** 3, jar: str = "backend.jar", link: bool = False):
+        """Result cache.
+
+        Args:
+            path (str, optional): directory holding the cached output directories. Defaults to ".cache".
+            max_bytes (int, optional): total size the cache is trimmed to, least recently used entries go first. Defaults to 10 GiB.
+            jar (str, optional): backend executable whose digest is part of every key. Defaults to "backend.jar".
+            link (bool, optional): hard link cached files into the output directory instead of copying them. Defaults to False.
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._jar = jar
+        self._link = link
+        self._lock = threading.Lock()
+        self._jar_digest = ((0.0, -1), "")
+        os.makedirs(path, exist_ok=True)
+        self._index = self._load_index()
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    @property
+    def size(self):
+        with self._lock:
+            return sum(int(entry["size"]) for entry in self._index.values())
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return os.path.isdir(self._entry(key))
+
+    def jar_digest(self) -> str:
+        """Digest of the backend jar, recomputed only when the file changes.
+
+        Returns:
+            str: hex sha256 digest, empty if the jar does not exist.
+        """
+        try:
+            stat = os.stat(self._jar)
+        except OSError:
+            return ""
+        stamp = (stat.st_mtime, stat.st_size)
+        if self._jar_digest[0] != stamp:
+            self._jar_digest = (stamp, file_digest(self._jar))
+        return self._jar_digest[1]
+
+    def key(self, sim_config: Dict[str, Any], backend: str = "") -> str:
+        """Cache key of a configuration.
+
+        Args:
+            sim_config (Dict[str, Any]): configuration as built by :meth:`PySDNSim.Backend.Backend.build_config`.
+            backend (str, optional): tag of the execution engine, empty for the jar. Defaults to "".
+
+        Returns:
+            str: hex digest combining the configuration and the backend.
+        """
+        return self.digest_key(config_digest(sim_config), backend)
+
+    def digest_key(self, config_hash: str, backend: str = "") -> str:
+        """Cache key of a configuration given by its digest, e.g. one returned by a streaming writer.
+
+        Args:
+            config_hash (str): hex digest of the configuration.
+            backend (str, optional): tag of the execution engine, empty for the jar. Defaults to "".
+
+        Returns:
+            str: hex digest combining the configuration and the backend.
+        """
+        digest = hashlib.sha256()
+        digest.update((backend or self.jar_digest()).encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(config_hash.encode("ascii"))
+        return digest.hexdigest()
+
+    def fetch(self, key: str, output_path: str) -> bool:
+        """Materialise a cached output directory.
+
+        Args:
+            key (str): cache key.
+            output_path (str): directory to fill, replaced if it exists.
+
+        Returns:
+            bool: True on a hit, False if the key is not cached.
+        """
+        entry = self._entry(key)
+        try:
+            # the entry may have been stored by another process sharing the cache
+            os.utime(entry)
+        except OSError:
+            return False
+        if os.path.isdir(output_path):
+            shutil.rmtree(output_path)
+        try:
+            shutil.copytree(entry, output_path, copy_function=_link_or_copy if self._link else shutil.copy2)
+        except (OSError, shutil.Error):
+            # evicted by a concurrent store while copying
+            shutil.rmtree(output_path, ignore_errors=True)
+            return False
+        return True
+
+    def store(self, key: str, output_path: str):
+        """Add an output directory to the cache and evict least recently used entries beyond the size bound.
+
+        Args:
+            key (str): cache key.
+            output_path (str): directory written by the backend.
+        """
+        if key in self or not os.path.isdir(output_path):
+            return
+        staging = self._entry(key) + f".{os.getpid()}.{threading.get_ident()}.tmp"
+        shutil.copytree(output_path, staging)
+        size = tree_size(staging)
+        with self._locked_index():
+            if os.path.isdir(self._entry(key)):
+                shutil.rmtree(staging)
+                return
+            os.replace(staging, self._entry(key))
+            os.utime(self._entry(key))
+            self._index[key] = {"size": size}
+            self._evict()
+
+    def invalidate(self, key: str) -> bool:
+        """Drop one entry.
+
+        Args:
+            key (str): cache key.
+
+        Returns:
+            bool: True if the entry existed.
+        """
+        with self._locked_index():
+            if self._index.pop(key, None) is None:
+                return False
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            return True
+
+    def clear(self):
+        """Drop every entry."""
+        with self._locked_index():
+            for key in list(self._index):
+                shutil.rmtree(self._entry(key), ignore_errors=True)
+            self._index.clear()
+
+    def _entry(self, key: str) -> str:
+        return os.path.join(self._path, key)
+
+    def _used(self, key: str) -> float:
+        try:
+            return os.stat(self._entry(key)).st_mtime
+        except OSError:
+            return 0.0
+
+    def _evict(self):
+        total = sum(int(entry["size"]) for entry in self._index.values())
+        for key in sorted(self._index, key=self._used):
+            if total <= self._max_bytes:
+                break
+            total -= int(self._index.pop(key)["size"])
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            logger.debug(f"Evicted cached result\t {key}.")
+
+    def _load_index(self) -> Dict[str, Dict[str, int]]:
+        try:
+            with open(os.path.join(self._path, _INDEX)) as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = dict()
+        # entries are renamed into place whole, a directory not in the index is an entry whose index update was lost
+        entries = dict()
+        for key in os.listdir(self._path):
+            if key in (_INDEX, _INDEX_LOCK) or key.endswith(".tmp") or not os.path.isdir(self._entry(key)):
+                continue
+            entry = index.get(key)
+            entries[key] = {"size": int(entry["size"])} if entry is not None else {"size": tree_size(self._entry(key))}
+        return entries
+
+    def _save_index(self):
+        index_file = os.path.join(self._path, _INDEX)
+        staging = f"{index_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(staging, "w") as file:
+            json.dump(self._index, file)
+        os.replace(staging, index_file)
+
+    @contextlib.contextmanager
+    def _locked_index(self) -> Iterator[None]:
+        """Hold the index of every process sharing the cache, reloaded on entry and saved on exit."""
+        with self._lock, open(os.path.join(self._path, _INDEX_LOCK), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                self._index = self._load_index()
+                yield
+                self._save_index()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -5,6 +5,7 @@ class Config:
     """
     Simulation configurations.
     """
+    __slots__ = ("_interval", "_sample_interval", "_step_size", "_seed")
     _interval: float
     _sample_interval:float
     _step_size: float
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+from typing import Iterable, List, Union
+
+import numpy as np
+
+from PySDNSim.Config import Config
+from PySDNSim.Host import Host
+from PySDNSim.Log import logger
+from PySDNSim.Microservice import Microservice
+from PySDNSim.NetworkService import NetworkService
+from PySDNSim.NetworkServiceBatch import NetworkServiceBatch
+
+JSON = "json"
+COLUMNAR = "columnar"
+BINARY = "binary"
+FORMATS = (JSON, COLUMNAR, BINARY)
+
+# record layout of the binary job sidecar
+JOB_DTYPE = np.dtype([("ms", "<i4"), ("length", "<f8"), ("schedule", "<i8")])
+
+_COMPACT = (",", ":")
+
+
+class _HashingWriter:
+    """
+    Text file wrapper that hashes everything written through it.
+    """
+
+    def __init__(self, file, digest):
+        self._file = file
+        self._digest = digest
+
+    def write(self, text: str):
+        self._file.write(text)
+        self._digest.update(text.encode("utf-8"))
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=_COMPACT)
+
+
+def write_columnar_config(
+    config: Config,
+    hosts: List[Host],
+    microservices: List[Microservice],
+    network_services: Iterable[Union[NetworkService, NetworkServiceBatch]],
+    config_file: str,
+    sidecar: bool = False,
+    debug: bool = False,
+) -> str:
+    """Stream a configuration in the columnar format to ``configs/<config_file>``.
+
+    The header sections are the same as in the JSON format. Every network service holds its jobs as three
+    parallel arrays ``ms``, ``length`` and ``schedule`` instead of one object per job. With ``sidecar`` the
+    arrays go to a raw binary file of ``JOB_DTYPE`` records next to the configuration instead, and each network
+    service only keeps the ``[offset, count]`` of its records. Only the jobs of one network service, or of one
+    :class:`PySDNSim.NetworkServiceBatch.NetworkServiceBatch`, are held in memory at a time, so the network
+    services can be streamed from a generator.
+
+    Args:
+        config (Config): simulation configuration.
+        hosts (List[Host]): hosts.
+        microservices (List[Microservice]): microservices.
+        network_services (Iterable[Union[NetworkService, NetworkServiceBatch]]): network services, or batches of
+            generated arrivals.
+        config_file (str): file name in the configs directory.
+        sidecar (bool, optional): write the jobs to a binary sidecar file. Defaults to False.
+        debug (bool, optional): log the generated file. Defaults to False.
+
+    Returns:
+        str: hex sha256 digest of everything written, sidecar included. The sidecar is hashed separately, so the
+        digest does not depend on how network services and batches interleave the two files.
+    """
+    os.makedirs("configs", exist_ok=True)
+    digest = hashlib.sha256()
+    sidecar_digest = hashlib.sha256()
+    sidecar_name = os.path.splitext(config_file)[0] + ".jobs.bin"
+    sidecar_file = open(os.path.join("configs", sidecar_name), "wb") if sidecar else None
+    try:
+        with open(os.path.join("configs", config_file), "w") as file:
+            out = _HashingWriter(file, digest)
+            out.write('{"Format":' + _dumps(BINARY if sidecar else COLUMNAR))
+            if sidecar:
+                out.write(',"JobsFile":' + _dumps(sidecar_name))
+                out.write(',"JobsDtype":' + _dumps(JOB_DTYPE.descr))
+            out.write(',"Config":' + _dumps(
+                {
+                    "interval": config.interval,
+                    "sampleInterval": config.sample_interval,
+                    "stepSize": config.step_size,
+                    "seed": config.seed,
+                }
+            ))
+            out.write(',"Hosts":' + _dumps(
+                [
+                    {
+                        "replica": host.replicas,
+                        "ram": host.ram,
+                        "bw": host.bw,
+                        "storage": host.storage,
+                        "pes": host.cpus,
+                        "maxPower": host.max_power,
+                        "staticPower": host.static_power,
+                        "vmScheduler": host.vm_scheduler,
+                    }
+                    for host in hosts
+                ]
+            ))
+            out.write(',"Microservices":' + _dumps(
+                [
+                    {
+                        "name": ms.name,
+                        "size": ms.size,
+                        "cpu": ms.cpus,
+                        "ram": ms.ram,
+                        "bw": ms.bw,
+                        "replicas": ms.replicas,
+                        "maxReplicas": ms.max_replicas,
+                        "cpuRatio": ms.cpu_ratio,
+                        "ramRatio": ms.ram_ratio,
+                        "bwRatio": ms.bw_ratio,
+                        "idleCPU": ms.idle_cpu,
+                        "idleRAM": ms.idle_ram,
+                        "idleBW": ms.idle_bw,
+                        "autoScale": [
+                            {"telemetry": auto_scale.telemetry, "threshold": auto_scale.threshold}
+                            for auto_scale in ms.auto_scale
+                        ],
+                    }
+                    for ms in microservices
+                ]
+            ))
+            out.write(',"NetworkServices":[')
+            records = 0
+            separator = ""
+            for ns in network_services:
+                if isinstance(ns, NetworkServiceBatch):
+                    if len(ns):
+                        out.write(separator)
+                        separator = ","
+                        records = _write_batch(out, sidecar_digest, sidecar_file, ns, records)
+                    continue
+                ms_ids, lengths, schedules = list(), list(), list()
+                for job, schedule in ns.iter_jobs():
+                    ms_ids.append(job.ms_id)
+                    lengths.append(job.length)
+                    schedules.append(schedule)
+                out.write(separator)
+                separator = ","
+                out.write('{"name":' + _dumps(ns.name) + ',"flows":' + _dumps(ns.flows))
+                if sidecar:
+                    jobs = np.empty(len(ms_ids), dtype=JOB_DTYPE)
+                    jobs["ms"] = ms_ids
+                    jobs["length"] = lengths
+                    jobs["schedule"] = schedules
+                    data = jobs.tobytes()
+                    sidecar_file.write(data)
+                    sidecar_digest.update(data)
+                    out.write(',"jobs":' + _dumps([records, len(jobs)]) + "}")
+                    records += len(jobs)
+                else:
+                    out.write(',"ms":' + _dumps(ms_ids))
+                    out.write(',"length":' + _dumps(lengths))
+                    out.write(',"schedule":' + _dumps(schedules) + "}")
+            out.write("]}")
+    finally:
+        if sidecar_file is not None:
+            sidecar_file.close()
+    if debug:
+        logger.info(f"Generated new simulation configuration file\t {config_file}.")
+    if sidecar:
+        digest.update(sidecar_digest.digest())
+    return digest.hexdigest()
+
+
+def _write_batch(out: _HashingWriter, sidecar_digest, sidecar_file, batch: NetworkServiceBatch, records: int) -> int:
+    # one network service per arrival, the arrays of the whole batch are converted at once and only the
+    # arrival index is formatted per network service
+    arrivals, count = batch.lengths.shape
+    prefix = '{"name":' + _dumps(batch.name + "_")[:-1]
+    flows = '","flows":' + _dumps(batch.flows)
+    indices = range(batch.start, batch.start + arrivals)
+    if sidecar_file is not None:
+        jobs = np.empty(arrivals * count, dtype=JOB_DTYPE)
+        jobs["ms"] = np.tile(batch.ms, arrivals)
+        jobs["length"] = batch.lengths.ravel()
+        jobs["schedule"] = batch.schedules.ravel()
+        data = jobs.tobytes()
+        sidecar_file.write(data)
+        sidecar_digest.update(data)
+        out.write(",".join(
+            f'{prefix}{index}{flows},"jobs":[{offset},{count}]}}'
+            for index, offset in zip(indices, range(records, records + arrivals * count, count))
+        ))
+        return records + len(jobs)
+    ms = ',"ms":' + _dumps(batch.ms.tolist())
+    out.write(",".join(
+        f'{prefix}{index}{flows}{ms},"length":[{",".join(map(str, lengths))}],'
+        f'"schedule":[{",".join(map(str, schedules))}]}}'
+        for index, lengths, schedules in zip(indices, batch.lengths.tolist(), batch.schedules.tolist())
+    ))
+    return records + arrivals * count
+
+
+def load_jobs(config_file: str, sim_config: dict) -> dict:
+    """Attach the job arrays of a binary sidecar to the network services of a loaded configuration.
+
+    Args:
+        config_file (str): path of the configuration file, the sidecar is looked up next to it.
+        sim_config (dict): the loaded configuration, modified in place.
+
+    Returns:
+        dict: the configuration.
+    """
+    if sim_config.get("Format") != BINARY:
+        return sim_config
+    dtype = np.dtype([tuple(field) for field in sim_config["JobsDtype"]])
+    jobs = np.fromfile(os.path.join(os.path.dirname(config_file), sim_config["JobsFile"]), dtype=dtype)
+    for ns in sim_config["NetworkServices"]:
+        offset, count = ns["jobs"]
+        records = jobs[offset:offset + count]
+        ns["ms"] = records["ms"]
+        ns["length"] = records["length"]
+        ns["schedule"] = records["schedule"]
+    return sim_config
@@ -0,0 +1,716 @@
+"""
+Distributed execution of experiments over TCP.
+
+A :class:`Coordinator` generates the configurations of a batch and hands them out from a work queue. Any number
+of :class:`DistributedWorker` processes, on this or other nodes, run them with their own backend and send the
+output directories back as gzipped tarballs. Workers pull work and send heartbeats while they run. The work of a
+worker that disconnects or stops sending heartbeats is queued again. A worker is started with
+
+    PYSDNSIM_SECRET=<secret> python -m PySDNSim.Distributed <coordinator host> <coordinator port> [--slots N] [--python]
+
+Every message is a ``!II`` header giving the sizes of a JSON object and of a binary payload, followed by both.
+Coordinator and worker first prove to each other that they know the shared secret of the coordinator: each sends a
+random challenge and the other answers with its HMAC-SHA256 under the secret. Nothing is handed out before that.
+"""
+import argparse
+import hashlib
+import hmac
+import io
+import itertools
+import json
+import os
+import secrets
+import shutil
+import socket
+import socketserver
+import struct
+import tarfile
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Set, Tuple, Union
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Cache import tree_size
+from PySDNSim.ConfigWriter import JSON
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Log import logger
+from PySDNSim.RunResult import RunResult
+
+CHALLENGE = "challenge"
+HELLO = "hello"
+WELCOME = "welcome"
+HEARTBEAT = "heartbeat"
+REQUEST = "request"
+TASK = "task"
+WAIT = "wait"
+RESULT = "result"
+SHUTDOWN = "shutdown"
+
+_HEADER = struct.Struct("!II")
+# largest message accepted before the peer is authenticated
+_HANDSHAKE_LIMIT = 1 << 16
+
+
+def _send(sock: socket.socket, lock: threading.Lock, message: dict, payload: bytes = b""):
+    data = json.dumps(message).encode("utf-8")
+    with lock:
+        sock.sendall(_HEADER.pack(len(data), len(payload)) + data)
+        if payload:
+            sock.sendall(payload)
+
+
+def _recv_exactly(sock: socket.socket, size: int, progress: Callable[[], None] = None) -> bytes:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        count = sock.recv_into(view[received:], size - received)
+        if count == 0:
+            raise ConnectionError("Connection closed.")
+        received += count
+        if progress is not None:
+            progress()
+    return bytes(buffer)
+
+
+def _recv(sock: socket.socket, progress: Callable[[], None] = None, limit: int = None) -> Tuple[dict, bytes]:
+    """Receive one message.
+
+    Args:
+        sock (socket.socket): the connection.
+        progress (Callable[[], None], optional): called whenever bytes arrive. Defaults to None.
+        limit (int, optional): largest message accepted, in bytes. Defaults to no limit.
+
+    Raises:
+        ValueError: if the message is larger than ``limit``.
+
+    Returns:
+        Tuple[dict, bytes]: the JSON object and the payload.
+    """
+    header_size, payload_size = _HEADER.unpack(_recv_exactly(sock, _HEADER.size, progress))
+    if limit is not None and header_size + payload_size > limit:
+        raise ValueError(f"Message of {header_size + payload_size} bytes exceeds {limit} bytes.")
+    message = json.loads(_recv_exactly(sock, header_size, progress).decode("utf-8"))
+    payload = _recv_exactly(sock, payload_size, progress) if payload_size else b""
+    return message, payload
+
+
+def _sign(secret: str, challenge: str) -> str:
+    return hmac.new(secret.encode("utf-8"), challenge.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _verify(secret: str, challenge: str, digest) -> bool:
+    return isinstance(digest, str) and hmac.compare_digest(_sign(secret, challenge), digest)
+
+
+def _pack(files: List[Tuple[str, str]]) -> bytes:
+    """Gzipped tarball of ``(path, name in archive)`` pairs, directories are added recursively."""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for path, name in files:
+            archive.add(path, arcname=name)
+    return buffer.getvalue()
+
+
+def _unpack(data: bytes, directory: str):
+    os.makedirs(directory, exist_ok=True)
+    root = os.path.realpath(directory)
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:gz") as archive:
+        members = archive.getmembers()
+        for member in members:
+            target = os.path.realpath(os.path.join(root, member.name))
+            if not (member.isfile() or member.isdir()) or os.path.commonpath([root, target]) != root:
+                raise RuntimeError(f"Refusing to extract {member.name}.")
+        if hasattr(tarfile, "data_filter"):
+            archive.extractall(root, members, filter="data")
+        else:
+            # Python releases without extraction filters, the members were checked above
+            archive.extractall(root, members)
+
+
+class _Task:
+    """
+    One experiment of a batch.
+    """
+    __slots__ = ("id", "name", "config_file", "files", "output_path", "write_time", "config_digest", "attempts")
+
+    def __init__(self, task_id: int, name: str, config_file: str, files: List[str], output_path: str,
+                 write_time: float, config_digest: str):
+        self.id = task_id
+        self.name = name
+        self.config_file = config_file
+        self.files = files
+        self.output_path = output_path
+        self.write_time = write_time
+        self.config_digest = config_digest
+        self.attempts = 0
+
+
+class _Peer:
+    """
+    Coordinator side of one worker connection.
+    """
+
+    def __init__(self, sock: socket.socket, address: Tuple[str, int]):
+        self.sock = sock
+        self.address = address
+        self.lock = threading.Lock()
+        self.last_seen = time.monotonic()
+        self.tasks: Set[int] = set()
+        self.alive = True
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "_Server"
+
+    def handle(self):
+        self.server.coordinator._serve(self.request, self.client_address)
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    coordinator: "Coordinator"
+
+
+class Coordinator:
+    """
+    Serves the configurations of experiment batches to distributed workers and collects their outputs.
+    """
+    _host: str
+    _port: int
+    _secret: str
+    _config_format: str
+    _heartbeat_timeout: float
+    _max_in_flight: Union[int, None]
+    _max_attempts: int
+    _debug: bool
+    _server: Union[_Server, None]
+    _condition: threading.Condition
+    _queue: Deque[int]
+    _tasks: Dict[int, _Task]
+    _assigned: Dict[int, _Peer]
+    _collecting: Set[int]
+    _results: Dict[int, RunResult]
+    _peers: List[_Peer]
+    _closing: bool
+    _task_ids: "itertools.count[int]"
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        secret: str = None,
+        config_format: str = JSON,
+        heartbeat_timeout: float = 10.0,
+        max_in_flight: int = None,
+        max_attempts: int = 3,
+        debug: bool = False,
+    ):
+        """Coordinator, it listens once started by :meth:`start` or on entering the context.
+
+        Args:
+            host (str, optional): address to listen on, "0.0.0.0" to accept workers from other nodes. Defaults to "127.0.0.1".
+            port (int, optional): port to listen on, 0 picks a free one, see :attr:`address`. Defaults to 0.
+            secret (str, optional): shared secret workers must prove they know. Defaults to a random one, see :attr:`secret`.
+            config_format (str, optional): format of the generated configuration files. Defaults to "json".
+            heartbeat_timeout (float, optional): seconds of silence after which a worker is considered dead. Defaults to 10.0.
+            max_in_flight (int, optional): most experiments handed out whose results are not collected yet. Defaults to no limit.
+            max_attempts (int, optional): times an experiment is handed out before it is failed. Defaults to 3.
+            debug (bool, optional): log workers and completed experiments. Defaults to False.
+        """
+        self._host = host
+        self._port = port
+        self._secret = secret if secret is not None else secrets.token_hex(32)
+        self._config_format = Backend.check_format(config_format)
+        self._heartbeat_timeout = heartbeat_timeout
+        self._max_in_flight = max_in_flight
+        self._max_attempts = max_attempts
+        self._debug = debug
+        self._server = None
+        self._condition = threading.Condition()
+        self._queue = deque()
+        self._tasks = dict()
+        self._assigned = dict()
+        self._collecting = set()
+        self._results = dict()
+        self._peers = list()
+        self._closing = False
+        self._task_ids = itertools.count()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def address(self) -> Tuple[str, int]:
+        """Address the coordinator listens on."""
+        if self._server is None:
+            return self._host, self._port
+        return self._server.server_address[:2]
+
+    @property
+    def secret(self):
+        """Shared secret to give the workers, e.g. through ``PYSDNSIM_SECRET``."""
+        return self._secret
+
+    @property
+    def debug(self):
+        return self._debug
+
+    @property
+    def workers(self) -> int:
+        """Number of connected workers."""
+        with self._condition:
+            return sum(1 for peer in self._peers if peer.alive)
+
+    def start(self):
+        """Listen for workers and watch their heartbeats."""
+        if self._server is not None:
+            return
+        self._closing = False
+        self._server = _Server((self._host, self._port), _Handler)
+        self._server.coordinator = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        threading.Thread(target=self._watch, daemon=True).start()
+        if self.debug:
+            logger.info(f"Coordinator listening on {self.address[0]}:{self.address[1]}.")
+
+    def close(self):
+        """Tell the workers to exit and stop listening."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def run_experiments(self, experiments: List[Experiment], output_path: Union[str, List[str]]) -> List[RunResult]:
+        """Run a batch of experiments on the connected workers.
+
+        Blocks until every experiment completed or was failed after ``max_attempts``. Workers may join or leave
+        at any time.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+
+        Raises:
+            RuntimeError: if the coordinator is not started, experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[RunResult]: results in the order the experiments were given.
+        """
+        if self._server is None:
+            raise RuntimeError("Coordinator is not started.")
+        experiments = list(experiments)
+        output_paths = Backend.pair_output_paths(experiments, output_path)
+        task_ids = list()
+        for experiment, path in zip(experiments, output_paths):
+            config_file = experiment.name + ".json"
+            os.makedirs(path, exist_ok=True)
+            start = time.perf_counter()
+            microservices, network_services = experiment.materialise()
+            digest = Backend.generate_config(
+                config=experiment.config,
+                hosts=[experiment.host],
+                microservices=microservices,
+                network_services=network_services,
+                config_file=config_file,
+                debug=self.debug,
+                config_format=self._config_format,
+            )
+            files = [name for name in (config_file, experiment.name + ".jobs.bin")
+                     if os.path.isfile(os.path.join("configs", name))]
+            task = _Task(next(self._task_ids), experiment.name, config_file, files, path + "/" + experiment.name,
+                         time.perf_counter() - start, digest)
+            with self._condition:
+                self._tasks[task.id] = task
+                self._queue.append(task.id)
+            task_ids.append(task.id)
+
+        with self._condition:
+            while not all(task_id in self._results for task_id in task_ids):
+                if self._closing:
+                    raise RuntimeError("Coordinator closed before the batch completed.")
+                self._condition.wait(1.0)
+            results = [self._results.pop(task_id) for task_id in task_ids]
+            for task_id in task_ids:
+                del self._tasks[task_id]
+        return results
+
+    def _authenticate(self, sock: socket.socket, peer: _Peer) -> bool:
+        challenge = secrets.token_hex(32)
+        sock.settimeout(self._heartbeat_timeout)
+        _send(sock, peer.lock, {"type": CHALLENGE, "challenge": challenge})
+        message, _ = _recv(sock, limit=_HANDSHAKE_LIMIT)
+        if message.get("type") != HELLO or not _verify(self._secret, challenge, message.get("digest")):
+            logger.warning(f"Rejected worker {peer.address[0]}:{peer.address[1]}, it failed the handshake.")
+            return False
+        worker_challenge = message.get("challenge")
+        if not isinstance(worker_challenge, str):
+            return False
+        _send(sock, peer.lock, {"type": WELCOME, "digest": _sign(self._secret, worker_challenge)})
+        sock.settimeout(None)
+        if self.debug:
+            logger.info(f"Worker {message.get('worker')} connected from {peer.address[0]}:{peer.address[1]}.")
+        return True
+
+    def _serve(self, sock: socket.socket, address: Tuple[str, int]):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        peer = _Peer(sock, address)
+        try:
+            authenticated = self._authenticate(sock, peer)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Handshake with {address[0]}:{address[1]} failed: {error!r}")
+            authenticated = False
+        if not authenticated:
+            sock.close()
+            return
+        peer.last_seen = time.monotonic()
+        with self._condition:
+            self._peers.append(peer)
+
+        def progress():
+            # a large result upload counts as a sign of life
+            peer.last_seen = time.monotonic()
+
+        try:
+            while True:
+                message, payload = _recv(sock, progress)
+                kind = message.get("type")
+                if kind == REQUEST:
+                    task, package = self._assign(peer)
+                    if task is None:
+                        _send(sock, peer.lock, {"type": SHUTDOWN if self._closing else WAIT, "retry": 0.2})
+                    else:
+                        _send(sock, peer.lock, {"type": TASK, "task": task.id, "name": task.name,
+                                                "config_file": task.config_file}, package)
+                elif kind == RESULT:
+                    self._collect(peer, message, payload)
+                elif kind != HEARTBEAT:
+                    logger.warning(f"Unknown message {kind!r} from worker {address[0]}:{address[1]}.")
+        except (OSError, ValueError) as error:
+            if peer.alive and not self._closing:
+                logger.warning(f"Lost worker {address[0]}:{address[1]}: {error!r}")
+        finally:
+            self._drop(peer)
+
+    def _assign(self, peer: _Peer) -> Tuple[Union[_Task, None], bytes]:
+        with self._condition:
+            if self._closing or not peer.alive or not self._queue:
+                return None, b""
+            if self._max_in_flight is not None and len(self._assigned) + len(self._collecting) >= self._max_in_flight:
+                return None, b""
+            task = self._tasks[self._queue.popleft()]
+            task.attempts += 1
+            self._assigned[task.id] = peer
+            peer.tasks.add(task.id)
+        try:
+            return task, _pack([(os.path.join("configs", name), name) for name in task.files])
+        except OSError:
+            with self._condition:
+                self._release(task.id)
+                self._queue.appendleft(task.id)
+            raise
+
+    def _collect(self, peer: _Peer, message: dict, payload: bytes):
+        task_id = message["task"]
+        with self._condition:
+            task = self._tasks.get(task_id)
+            if task is None or self._assigned.get(task_id) is not peer:
+                # the experiment was given to another worker in the meantime
+                return
+            # a collecting experiment is neither handed out again nor requeued when its worker is dropped
+            self._release(task_id)
+            self._collecting.add(task_id)
+        # unpacked outside the lock, the other workers keep being served meanwhile
+        staging = tempfile.mkdtemp(prefix=f".{task.name}.", dir=os.path.dirname(task.output_path) or ".")
+        try:
+            if payload:
+                _unpack(payload, staging)
+        except (OSError, RuntimeError, tarfile.TarError) as error:
+            logger.error(f"Can not unpack the output of experiment\t {task.name} from {peer.address[0]}: {error!r}")
+            shutil.rmtree(staging, ignore_errors=True)
+            with self._condition:
+                self._collecting.discard(task_id)
+                self._retry(task_id)
+                self._condition.notify_all()
+            return
+        output_bytes = tree_size(staging) if payload else 0
+        stale = staging + ".stale"
+        with self._condition:
+            if os.path.isdir(task.output_path):
+                os.replace(task.output_path, stale)
+            if payload:
+                os.replace(staging, task.output_path)
+            self._collecting.discard(task_id)
+            self._results[task_id] = RunResult(
+                name=task.name,
+                config_file="./configs/" + task.config_file,
+                output_path=task.output_path,
+                return_code=int(message["return_code"]),
+                wall_time=float(message["wall_time"]),
+                write_time=task.write_time,
+                startup_time=message.get("startup_time"),
+                output_bytes=output_bytes,
+                peak_rss_mb=message.get("peak_rss_mb"),
+                stop_reason=message.get("stop_reason"),
+                config_digest=task.config_digest,
+            )
+            self._condition.notify_all()
+        shutil.rmtree(stale, ignore_errors=True)
+        shutil.rmtree(staging, ignore_errors=True)
+        if self.debug:
+            logger.info(f"Simulation completed for experiment\t {task.name} on {peer.address[0]}.")
+
+    def _release(self, task_id: int):
+        peer = self._assigned.pop(task_id)
+        peer.tasks.discard(task_id)
+
+    def _retry(self, task_id: int):
+        """Queue an experiment again, or fail it once it was handed out ``max_attempts`` times."""
+        task = self._tasks[task_id]
+        if task.attempts >= self._max_attempts:
+            logger.error(f"Experiment {task.name} failed on {task.attempts} workers, giving up.")
+            self._results[task_id] = RunResult(
+                name=task.name,
+                config_file="./configs/" + task.config_file,
+                output_path=task.output_path,
+                return_code=-1,
+                wall_time=0.0,
+                config_digest=task.config_digest,
+            )
+        else:
+            self._queue.appendleft(task_id)
+
+    def _drop(self, peer: _Peer):
+        with self._condition:
+            peer.alive = False
+            if peer in self._peers:
+                self._peers.remove(peer)
+            for task_id in sorted(peer.tasks):
+                self._release(task_id)
+                self._retry(task_id)
+            self._condition.notify_all()
+        try:
+            peer.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _watch(self):
+        while not self._closing:
+            time.sleep(self._heartbeat_timeout / 4)
+            now = time.monotonic()
+            with self._condition:
+                silent = [peer for peer in self._peers if now - peer.last_seen > self._heartbeat_timeout]
+            for peer in silent:
+                logger.warning(f"Worker {peer.address[0]}:{peer.address[1]} stopped sending heartbeats.")
+                self._drop(peer)
+
+
+class DistributedWorker:
+    """
+    Runs the experiments handed out by a :class:`Coordinator` with a local backend.
+    """
+    _host: str
+    _port: int
+    _secret: str
+    _backend: Backend
+    _slots: int
+    _workdir: str
+    _heartbeat_interval: float
+    _connect_timeout: float
+    _debug: bool
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        backend: Backend,
+        secret: str,
+        slots: int = 1,
+        workdir: str = None,
+        heartbeat_interval: float = 2.0,
+        connect_timeout: float = 30.0,
+        debug: bool = False,
+    ):
+        """Distributed worker, it serves the coordinator from :meth:`run`.
+
+        Args:
+            host (str): address of the coordinator.
+            port (int): port of the coordinator.
+            backend (Backend): backend running the experiments on this node.
+            secret (str): shared secret of the coordinator, see :attr:`Coordinator.secret`.
+            slots (int, optional): experiments run at once, each over its own connection. Defaults to 1.
+            workdir (str, optional): directory for configurations and outputs in transit. Defaults to a temporary directory.
+            heartbeat_interval (float, optional): seconds between heartbeats. Defaults to 2.0.
+            connect_timeout (float, optional): seconds to keep trying to reach the coordinator. Defaults to 30.0.
+            debug (bool, optional): log every completed experiment. Defaults to False.
+        """
+        if slots < 1:
+            raise RuntimeError("A worker needs at least one slot.")
+        self._host = host
+        self._port = port
+        self._secret = secret
+        self._backend = backend
+        self._slots = slots
+        self._workdir = workdir if workdir is not None else tempfile.mkdtemp(prefix="pysdnsim-worker-")
+        self._heartbeat_interval = heartbeat_interval
+        self._connect_timeout = connect_timeout
+        self._debug = debug
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def slots(self):
+        return self._slots
+
+    @property
+    def workdir(self):
+        return self._workdir
+
+    @property
+    def debug(self):
+        return self._debug
+
+    def run(self):
+        """Run experiments until the coordinator shuts down or can not be reached."""
+        threads = [threading.Thread(target=self._serve_slot, args=(slot,)) for slot in range(self.slots)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def _connect(self) -> socket.socket:
+        deadline = time.monotonic() + self._connect_timeout
+        while True:
+            try:
+                sock = socket.create_connection((self._host, self._port), timeout=self._connect_timeout)
+                sock.settimeout(None)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                return sock
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise
+                time.sleep(0.5)
+
+    def _handshake(self, sock: socket.socket, lock: threading.Lock, slot: int):
+        sock.settimeout(self._connect_timeout)
+        message, _ = _recv(sock, limit=_HANDSHAKE_LIMIT)
+        if message.get("type") != CHALLENGE or not isinstance(message.get("challenge"), str):
+            raise ValueError("Coordinator did not send a challenge.")
+        challenge = secrets.token_hex(32)
+        _send(sock, lock, {"type": HELLO, "worker": f"{socket.gethostname()}:{os.getpid()}:{slot}",
+                           "digest": _sign(self._secret, message["challenge"]), "challenge": challenge})
+        message, _ = _recv(sock, limit=_HANDSHAKE_LIMIT)
+        if message.get("type") != WELCOME or not _verify(self._secret, challenge, message.get("digest")):
+            raise ValueError("Coordinator does not know the shared secret.")
+        sock.settimeout(None)
+
+    def _heartbeat(self, sock: socket.socket, lock: threading.Lock, stop: threading.Event):
+        while not stop.wait(self._heartbeat_interval):
+            try:
+                _send(sock, lock, {"type": HEARTBEAT})
+            except OSError:
+                return
+
+    def _serve_slot(self, slot: int):
+        try:
+            sock = self._connect()
+        except OSError as error:
+            logger.error(f"Can not reach coordinator {self._host}:{self._port}: {error!r}")
+            return
+        lock = threading.Lock()
+        stop = threading.Event()
+        try:
+            self._handshake(sock, lock, slot)
+        except (OSError, ValueError) as error:
+            logger.error(f"Handshake with coordinator {self._host}:{self._port} failed: {error!r}")
+            sock.close()
+            return
+        threading.Thread(target=self._heartbeat, args=(sock, lock, stop), daemon=True).start()
+        try:
+            while True:
+                _send(sock, lock, {"type": REQUEST})
+                message, payload = _recv(sock)
+                if message["type"] == SHUTDOWN:
+                    break
+                if message["type"] == WAIT:
+                    time.sleep(message.get("retry", 0.2))
+                    continue
+                result, package = self._run_task(slot, message, payload)
+                _send(sock, lock, {"type": RESULT, "task": message["task"], "return_code": result.return_code,
+                                   "wall_time": result.wall_time, "startup_time": result.startup_time,
+                                   "peak_rss_mb": result.peak_rss_mb, "stop_reason": result.stop_reason}, package)
+        except (OSError, ValueError) as error:
+            logger.warning(f"Lost coordinator {self._host}:{self._port}: {error!r}")
+        finally:
+            stop.set()
+            sock.close()
+
+    def _run_task(self, slot: int, message: dict, payload: bytes) -> Tuple[RunResult, bytes]:
+        directory = os.path.join(self.workdir, str(slot))
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+        configs = os.path.join(directory, "configs")
+        output = os.path.join(directory, "output")
+        try:
+            _unpack(payload, configs)
+            result = self.backend._launch(
+                name=message["name"],
+                config_file=os.path.join(configs, message["config_file"]),
+                output_path=output,
+            )
+            package = _pack([(output, ".")]) if os.path.isdir(output) else b""
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+        if self.debug:
+            logger.info(f"Simulation completed for experiment\t {message['name']}.")
+        return result, package
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Run experiments handed out by a PySDNSim coordinator.")
+    parser.add_argument("host", help="address of the coordinator")
+    parser.add_argument("port", type=int, help="port of the coordinator")
+    parser.add_argument("--secret", default=os.environ.get("PYSDNSIM_SECRET"),
+                        help="shared secret of the coordinator, defaults to $PYSDNSIM_SECRET")
+    parser.add_argument("--slots", type=int, default=1, help="experiments run at once")
+    parser.add_argument("--workdir", default=None, help="directory for configurations and outputs in transit")
+    parser.add_argument("--heartbeat", type=float, default=2.0, help="seconds between heartbeats")
+    parser.add_argument("--python", action="store_true", help="use the in-process engine instead of the jar")
+    parser.add_argument("--debug", action="store_true", help="log every completed experiment")
+    args = parser.parse_args(argv)
+    if not args.secret:
+        parser.error("the shared secret of the coordinator is needed, pass --secret or set PYSDNSIM_SECRET")
+    if args.python:
+        from PySDNSim.Engine import PythonBackend
+
+        backend = PythonBackend(debug=args.debug)
+    else:
+        backend = Backend(debug=args.debug)
+        if not backend.ready:
+            raise RuntimeError("Simulation backend executable file is missing.")
+    DistributedWorker(
+        host=args.host,
+        port=args.port,
+        backend=backend,
+        secret=args.secret,
+        slots=args.slots,
+        workdir=args.workdir,
+        heartbeat_interval=args.heartbeat,
+        debug=args.debug,
+    ).run()
+
+
+if __name__ == "__main__":
+    main()
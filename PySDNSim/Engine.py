@@ -0,0 +1,479 @@
+import contextlib
+import csv
+import heapq
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Tuple
+
+import numpy as np
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Cache import ResultCache
+from PySDNSim.ConfigWriter import BINARY, load_jobs
+from PySDNSim.Feasibility import FeasibilityCheck
+from PySDNSim.Log import logger
+from PySDNSim.Results import DC, MS, NSUMMARY
+from PySDNSim.RunResult import RunResult
+from PySDNSim.SteadyState import SteadyStateWatcher
+
+ENGINE_VERSION = "1"
+NSUMMARY_COLUMNS = ["name", "start", "finish", "complete"]
+DC_COLUMNS = ["time", "power", "cpu", "ram", "bw", "vms", "active_flows", "queued_flows"]
+MS_COLUMNS = ["time", "name", "vms", "busy", "queued"]
+
+_EPS = 1e-9
+
+
+class Simulator:
+    """
+    In-process discrete event simulation of a generated configuration.
+
+    The model follows the backend: every host replica is a machine with ``pes`` CPUs, ``ram`` and ``bw``.
+    Every microservice replica is a VM placed first-fit on the hosts. A SpaceShared scheduler reserves whole
+    CPUs, a TimeShared one reserves the exact share. A VM runs as many flows at once as its CPU, RAM and BW
+    allow after its idle consumption, each flow taking ``cpuRatio``/``ramRatio``/``bwRatio`` of it and being
+    processed at ``cpuRatio`` percent of one CPU.
+
+    Each network service runs ``flows`` flows through its jobs. The jobs of schedule slot ``s`` are released once
+    every job of the previous slot completed and not before ``s * interval``. At every ``interval`` a microservice
+    whose telemetry (including queued demand) exceeds an auto scale threshold gains a replica, up to
+    ``maxReplicas``. Time advances from event to event rounded up to ``stepSize`` and the datacenter is sampled
+    every ``sampleInterval``. With ``trace``, the replicas, busy and queued flows of every microservice are also
+    written to ``MS.csv`` at every sample, see :class:`PySDNSim.Replay.Replay`.
+    """
+    _sim_config: Dict[str, Any]
+    _mips: float
+    _horizon: float
+    _trace: bool
+
+    def __init__(self, sim_config: Dict[str, Any], mips: float = 1000.0, horizon: float = 3600.0, trace: bool = False):
+        """In-process simulator.
+
+        Args:
+            sim_config (Dict[str, Any]): configuration as built by :meth:`PySDNSim.Backend.Backend.build_config`.
+            mips (float, optional): processing capacity of one host CPU in MIPS. Defaults to 1000.0.
+            horizon (float, optional): simulated time after which unfinished network services are failed. Defaults to 3600.0.
+            trace (bool, optional): also write the per microservice samples to ``MS.csv``. Defaults to False.
+        """
+        self._sim_config = sim_config
+        self._mips = mips
+        self._horizon = horizon
+        self._trace = trace
+
+    @classmethod
+    def from_file(cls, config_file: str, **kwargs) -> "Simulator":
+        """Load a configuration file written by :meth:`PySDNSim.Backend.Backend.generate_config`, in any format.
+
+        Args:
+            config_file (str): path of the configuration file.
+
+        Returns:
+            Simulator: simulator of the configuration.
+        """
+        with open(config_file) as file:
+            sim_config = json.load(file)
+        return cls(load_jobs(config_file, sim_config), **kwargs)
+
+    @property
+    def mips(self):
+        return self._mips
+
+    @property
+    def horizon(self):
+        return self._horizon
+
+    @property
+    def trace(self):
+        return self._trace
+
+    def run(self, output_path: str, stop: threading.Event = None) -> float:
+        """Run the simulation and write ``NSummary.csv``, ``DC.csv`` and, when tracing, ``MS.csv``.
+
+        Args:
+            output_path (str): directory for the results.
+            stop (threading.Event, optional): ends the simulation early once set, unfinished network services are
+                then reported as not complete. ``DC.csv`` is flushed at every sample so it can be tailed. Defaults to None.
+
+        Returns:
+            float: simulated time at which the simulation ended.
+        """
+        os.makedirs(output_path, exist_ok=True)
+        buffering = 1 if stop is not None else -1
+        with contextlib.ExitStack() as stack:
+            dc_file = stack.enter_context(open(os.path.join(output_path, DC), "w", newline="", buffering=buffering))
+            dc_writer = csv.writer(dc_file)
+            dc_writer.writerow(DC_COLUMNS)
+            ms_writer = None
+            if self._trace:
+                ms_file = stack.enter_context(open(os.path.join(output_path, MS), "w", newline=""))
+                ms_writer = csv.writer(ms_file)
+                ms_writer.writerow(MS_COLUMNS)
+            summary, end = _Run(self, dc_writer, ms_writer).simulate(stop)
+        with open(os.path.join(output_path, NSUMMARY), "w", newline="") as ns_file:
+            ns_writer = csv.writer(ns_file)
+            ns_writer.writerow(NSUMMARY_COLUMNS)
+            ns_writer.writerows(summary)
+        return end
+
+
+class _Run:
+    """
+    State of one simulation.
+    """
+
+    def __init__(self, simulator: Simulator, dc_writer, ms_writer=None):
+        sim_config = simulator._sim_config
+        config = sim_config["Config"]
+        self.interval = float(config["interval"])
+        self.sample_interval = float(config["sampleInterval"])
+        self.step = float(config["stepSize"])
+        self.horizon = simulator.horizon
+        self.dc_writer = dc_writer
+        self.ms_writer = ms_writer
+
+        hosts = [host for host in sim_config["Hosts"] for _ in range(int(host["replica"]))]
+        self.host_pes = np.array([host["pes"] for host in hosts], dtype=np.float64)
+        self.host_ram = np.array([host["ram"] for host in hosts], dtype=np.float64)
+        self.host_bw = np.array([host["bw"] for host in hosts], dtype=np.float64)
+        self.host_static = np.array([host["staticPower"] for host in hosts], dtype=np.float64)
+        self.host_dynamic = np.array([host["maxPower"] - host["staticPower"] for host in hosts], dtype=np.float64)
+        self.host_space_shared = np.array([host["vmScheduler"] != "TimeShared" for host in hosts], dtype=bool)
+        self.free_pes = self.host_pes.copy()
+        self.free_ram = self.host_ram.copy()
+        self.free_bw = self.host_bw.copy()
+
+        microservices = sim_config["Microservices"]
+        self.ms = microservices
+        self.ms_ratio = np.array(
+            [[ms["cpuRatio"], ms["ramRatio"], ms["bwRatio"]] for ms in microservices], dtype=np.float64
+        ).reshape(-1, 3)
+        self.ms_idle = np.array(
+            [[ms["idleCPU"], ms["idleRAM"], ms["idleBW"]] for ms in microservices], dtype=np.float64
+        ).reshape(-1, 3)
+        self.ms_rate = simulator.mips * self.ms_ratio[:, 0] / 100
+        self.ms_vms = np.zeros(len(microservices), dtype=np.int64)
+        self.ms_scaling = np.array(
+            [len(ms["autoScale"]) > 0 and ms["maxReplicas"] > ms["replicas"] for ms in microservices], dtype=bool
+        )
+
+        self.vm_ms = np.zeros(0, dtype=np.int64)
+        self.vm_host = np.zeros(0, dtype=np.int64)
+        self.vm_slots = np.zeros(0, dtype=np.int64)
+        self.vm_busy = np.zeros(0, dtype=np.int64)
+        for index, ms in enumerate(microservices):
+            for _ in range(int(ms["replicas"])):
+                if not self.add_vm(index):
+                    logger.warning(f"Can not place replica of microservice\t {ms['name']}.")
+
+        self.ns_names: List[str] = list()
+        self.ns_flows: List[int] = list()
+        self.ns_stages: List[List[Tuple[int, List[Tuple[int, float]]]]] = list()
+        for ns in sim_config["NetworkServices"]:
+            slots: Dict[int, List[Tuple[int, float]]] = dict()
+            for ms_id, length, schedule in _jobs(ns):
+                slots.setdefault(int(schedule), list()).append((int(ms_id), float(length)))
+            self.ns_names.append(ns["name"])
+            self.ns_flows.append(int(ns["flows"]))
+            self.ns_stages.append(sorted(slots.items()))
+        count = len(self.ns_names)
+        self.ns_stage = np.zeros(count, dtype=np.int64)
+        self.ns_remaining = np.zeros(count, dtype=np.int64)
+        self.ns_start = np.full(count, np.nan)
+        self.ns_finish = np.full(count, np.nan)
+
+        self.pending: List[Deque[Tuple[int, float]]] = [deque() for _ in microservices]
+        self.releases: List[Tuple[float, int]] = list()
+
+        capacity = 1024
+        self.flow_remaining = np.zeros(capacity, dtype=np.float64)
+        self.flow_rate = np.zeros(capacity, dtype=np.float64)
+        self.flow_vm = np.zeros(capacity, dtype=np.int64)
+        self.flow_ns = np.zeros(capacity, dtype=np.int64)
+        self.active = 0
+
+    def vm_demand(self, ms: int) -> np.ndarray:
+        config = self.ms[ms]
+        return np.array([config["cpu"], config["ram"], config["bw"]], dtype=np.float64)
+
+    def add_vm(self, ms: int) -> bool:
+        cpu, ram, bw = self.vm_demand(ms)
+        pes = np.where(self.host_space_shared, math.ceil(cpu - _EPS), cpu)
+        fits = (self.free_pes >= pes - _EPS) & (self.free_ram >= ram) & (self.free_bw >= bw)
+        hosts = np.flatnonzero(fits)
+        if len(hosts) == 0:
+            return False
+        host = hosts[0]
+        self.free_pes[host] -= pes[host]
+        self.free_ram[host] -= ram
+        self.free_bw[host] -= bw
+        capacity = np.array([cpu * 100, ram, bw]) - self.ms_idle[ms]
+        slots = np.floor(capacity / np.maximum(self.ms_ratio[ms], _EPS) + _EPS).min()
+        self.vm_ms = np.append(self.vm_ms, ms)
+        self.vm_host = np.append(self.vm_host, host)
+        self.vm_slots = np.append(self.vm_slots, max(int(slots), 0))
+        self.vm_busy = np.append(self.vm_busy, 0)
+        self.ms_vms[ms] += 1
+        return True
+
+    def release_stage(self, ns: int, now: float):
+        stages = self.ns_stages[ns]
+        stage = self.ns_stage[ns]
+        if stage >= len(stages):
+            self.ns_finish[ns] = now
+            return
+        slot, jobs = stages[stage]
+        release = max(now, slot * self.interval)
+        if release > now + _EPS:
+            heapq.heappush(self.releases, (release, ns))
+            return
+        if np.isnan(self.ns_start[ns]):
+            self.ns_start[ns] = now
+        flows = self.ns_flows[ns]
+        self.ns_remaining[ns] = len(jobs) * flows
+        for ms, length in jobs:
+            self.pending[ms].extend([(ns, length)] * flows)
+
+    def dispatch(self):
+        for ms, queue in enumerate(self.pending):
+            if not queue:
+                continue
+            vms = np.flatnonzero(self.vm_ms == ms)
+            free = self.vm_slots[vms] - self.vm_busy[vms]
+            if free.sum() <= 0:
+                continue
+            # least loaded replicas first
+            order = np.argsort(-free, kind="stable")
+            targets = np.repeat(vms[order], free[order])[: len(queue)]
+            count = len(targets)
+            self.reserve(self.active + count)
+            units = [queue.popleft() for _ in range(count)]
+            end = self.active + count
+            self.flow_ns[self.active:end] = [unit[0] for unit in units]
+            self.flow_remaining[self.active:end] = [unit[1] for unit in units]
+            self.flow_rate[self.active:end] = self.ms_rate[ms]
+            self.flow_vm[self.active:end] = targets
+            np.add.at(self.vm_busy, targets, 1)
+            self.active = end
+
+    def reserve(self, size: int):
+        capacity = len(self.flow_remaining)
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        for name in ("flow_remaining", "flow_rate", "flow_vm", "flow_ns"):
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[: self.active] = array[: self.active]
+            setattr(self, name, grown)
+
+    def advance(self, dt: float, now: float):
+        active = slice(0, self.active)
+        self.flow_remaining[active] -= self.flow_rate[active] * dt
+        done = self.flow_remaining[active] <= _EPS
+        if not done.any():
+            return
+        np.subtract.at(self.vm_busy, self.flow_vm[active][done], 1)
+        finished_ns = self.flow_ns[active][done]
+        keep = ~done
+        kept = int(keep.sum())
+        for name in ("flow_remaining", "flow_rate", "flow_vm", "flow_ns"):
+            array = getattr(self, name)
+            array[:kept] = array[active][keep]
+        self.active = kept
+        counts = np.bincount(finished_ns, minlength=len(self.ns_names))
+        self.ns_remaining -= counts
+        for ns in np.flatnonzero((counts > 0) & (self.ns_remaining == 0)):
+            self.ns_stage[ns] += 1
+            self.release_stage(ns, now)
+
+    def queued(self) -> np.ndarray:
+        return np.array([len(queue) for queue in self.pending], dtype=np.float64)
+
+    def utilisation(self) -> np.ndarray:
+        """Per microservice utilisation of cpu, ram and bw, queued flows included."""
+        vms = np.bincount(self.vm_ms, minlength=len(self.ms)).astype(np.float64)
+        busy = np.bincount(self.vm_ms, weights=self.vm_busy, minlength=len(self.ms)) + self.queued()
+        capacity = np.array([[ms["cpu"] * 100, ms["ram"], ms["bw"]] for ms in self.ms], dtype=np.float64).reshape(-1, 3)
+        used = self.ms_idle * vms[:, None] + self.ms_ratio * busy[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(vms[:, None] > 0, used / (capacity * vms[:, None]), np.where(busy[:, None] > 0, np.inf, 0.0))
+
+    def auto_scale(self):
+        telemetry = {"cpu": 0, "ram": 1, "bw": 2}
+        utilisation = self.utilisation()
+        for ms in np.flatnonzero(self.ms_scaling):
+            config = self.ms[ms]
+            if self.ms_vms[ms] >= config["maxReplicas"]:
+                continue
+            for rule in config["autoScale"]:
+                column = telemetry.get(rule["telemetry"])
+                if column is not None and utilisation[ms, column] > rule["threshold"]:
+                    self.add_vm(ms)
+                    break
+
+    def sample(self, now: float):
+        hosts = len(self.host_pes)
+        busy = self.vm_busy.astype(np.float64)
+        used = self.ms_idle[self.vm_ms] + self.ms_ratio[self.vm_ms] * busy[:, None]
+        cpu = np.bincount(self.vm_host, weights=used[:, 0] / 100, minlength=hosts) / self.host_pes
+        ram = np.bincount(self.vm_host, weights=used[:, 1], minlength=hosts) / self.host_ram
+        bw = np.bincount(self.vm_host, weights=used[:, 2], minlength=hosts) / self.host_bw
+        power = (self.host_static + self.host_dynamic * np.minimum(cpu, 1.0)).sum()
+        self.dc_writer.writerow(
+            [
+                round(now, 6),
+                round(float(power), 6),
+                round(float(cpu.mean()), 6),
+                round(float(ram.mean()), 6),
+                round(float(bw.mean()), 6),
+                len(self.vm_ms),
+                self.active,
+                int(self.queued().sum()),
+            ]
+        )
+        if self.ms_writer is not None:
+            busy = np.bincount(self.vm_ms, weights=self.vm_busy, minlength=len(self.ms)).astype(np.int64)
+            queued = self.queued().astype(np.int64)
+            self.ms_writer.writerows(
+                [round(now, 6), ms["name"], int(self.ms_vms[index]), int(busy[index]), int(queued[index])]
+                for index, ms in enumerate(self.ms)
+            )
+
+    def stalled(self) -> bool:
+        if self.active > 0 or self.releases:
+            return False
+        for ms, queue in enumerate(self.pending):
+            if queue and self.ms_scaling[ms] and self.ms_vms[ms] < self.ms[ms]["maxReplicas"]:
+                return False
+        return True
+
+    def quantise(self, dt: float) -> float:
+        return max(math.ceil(dt / self.step - 1e-6), 1) * self.step
+
+    def simulate(self, stop: threading.Event = None) -> Tuple[List[List[Any]], float]:
+        now = 0.0
+        next_sample = 0.0
+        next_scale = self.interval
+        for ns in range(len(self.ns_names)):
+            self.release_stage(ns, now)
+        while True:
+            while self.releases and self.releases[0][0] <= now + _EPS:
+                _, ns = heapq.heappop(self.releases)
+                self.release_stage(ns, now)
+            self.dispatch()
+            sampled = now >= next_sample - _EPS
+            if sampled:
+                self.sample(now)
+                next_sample += self.sample_interval
+            done = bool(np.all(~np.isnan(self.ns_finish)))
+            if done or now >= self.horizon - _EPS or self.stalled() or (stop is not None and stop.is_set()):
+                break
+            events = [next_sample, next_scale, self.horizon]
+            if self.active > 0:
+                active = slice(0, self.active)
+                events.append(now + float((self.flow_remaining[active] / self.flow_rate[active]).min()))
+            if self.releases:
+                events.append(self.releases[0][0])
+            dt = self.quantise(min(events) - now)
+            self.advance(dt, now + dt)
+            now += dt
+            if now >= next_scale - _EPS:
+                self.auto_scale()
+                next_scale += self.interval
+        if not sampled:
+            self.sample(now)
+
+        summary = list()
+        for ns, name in enumerate(self.ns_names):
+            complete = not np.isnan(self.ns_finish[ns])
+            start = self.ns_start[ns] if not np.isnan(self.ns_start[ns]) else now
+            finish = self.ns_finish[ns] if complete else now
+            summary.append([name, round(float(start), 6), round(float(finish), 6), complete])
+        return summary, now
+
+
+def _jobs(ns_config: Dict[str, Any]):
+    if "Job" in ns_config:
+        for job in ns_config["Job"]:
+            yield job["ms"], job["length"], job["schedule"]
+        return
+    # columnar and binary formats, see PySDNSim.ConfigWriter
+    columns = [ns_config[key] for key in ("ms", "length", "schedule")]
+    columns = [column.tolist() if isinstance(column, np.ndarray) else column for column in columns]
+    yield from zip(*columns)
+
+
+class PythonBackend(Backend):
+    """
+    Backend running experiments with the in-process :class:`Simulator` instead of the CloudSim Plus jar.
+    """
+    _mips: float
+    _horizon: float
+    _trace: bool
+
+    def __init__(self, debug: bool = False, cache: ResultCache = None, mips: float = 1000.0, horizon: float = 3600.0,
+                 config_format: str = BINARY, watcher: SteadyStateWatcher = None, trace: bool = False,
+                 preflight: FeasibilityCheck = None):
+        """In-process backend, no Java runtime is needed.
+
+        Args:
+            debug (bool, optional): log every completed experiment. Defaults to False.
+            cache (ResultCache, optional): result cache. Defaults to None.
+            mips (float, optional): processing capacity of one host CPU in MIPS. Defaults to 1000.0.
+            horizon (float, optional): simulated time after which unfinished network services are failed. Defaults to 3600.0.
+            config_format (str, optional): format of the generated configuration files. Defaults to "binary".
+            watcher (SteadyStateWatcher, optional): stops simulations once they reach a steady state. Defaults to None.
+            trace (bool, optional): also write the per microservice samples to ``MS.csv``. Defaults to False.
+            preflight (FeasibilityCheck, optional): rejects experiments that can not be placed. Defaults to None.
+        """
+        super().__init__(debug=debug, cache=cache, config_format=config_format, watcher=watcher, preflight=preflight)
+        self._mips = mips
+        self._horizon = horizon
+        self._trace = trace
+
+    def _find_executable(self) -> bool:
+        # the engine runs in this process
+        return True
+
+    @property
+    def tag(self):
+        # traced results have one more table, they are cached apart
+        trace = "-trace" if self._trace else ""
+        return f"python-engine-{ENGINE_VERSION}-{self._mips}-{self._horizon}{trace}"
+
+    @property
+    def trace(self):
+        return self._trace
+
+    def _command(self, config_file: str, output_path: str, heap_mb: int = None) -> List[str]:
+        # the async API needs a process it can kill, so it runs the engine in a worker process, without a heap limit
+        command = [sys.executable, "-m", "PySDNSim.Worker", config_file, output_path, str(self._mips), str(self._horizon)]
+        return command + ["--trace"] if self._trace else command
+
+    def _launch(self, name: str, config_file: str, output_path: str) -> RunResult:
+        start = time.perf_counter()
+        stop = threading.Event() if self.watcher is not None else None
+        watch = self.watcher.watch(name, output_path, stop.set) if stop is not None else None
+        try:
+            simulator = Simulator.from_file(config_file, mips=self._mips, horizon=self._horizon, trace=self._trace)
+            simulator.run(output_path, stop)
+            return_code = 0
+        except (OSError, ValueError, KeyError, IndexError) as error:
+            logger.error(f"Simulation failed for experiment\t {name}: {error!r}")
+            return_code = 1
+        finally:
+            stop_reason = watch.finish() if watch is not None else None
+        return RunResult(
+            name=name,
+            config_file=config_file,
+            output_path=output_path,
+            return_code=return_code,
+            wall_time=time.perf_counter() - start,
+            stop_reason=stop_reason,
+        )
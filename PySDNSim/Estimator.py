@@ -0,0 +1,252 @@
+from typing import List, Union
+
+import numpy as np
+
+from PySDNSim.Experiment import Experiment
+
+
+def erlang_c_wait(arrival: np.ndarray, service_time: np.ndarray, servers: np.ndarray) -> np.ndarray:
+    """Mean queueing delay of M/M/c queues, element-wise.
+
+    Args:
+        arrival (np.ndarray): arrival rates.
+        service_time (np.ndarray): mean service times.
+        servers (np.ndarray): number of servers, broadcast against the rates.
+
+    Returns:
+        np.ndarray: mean waiting time before service, inf for saturated or serverless queues.
+    """
+    arrival, service_time, servers = np.broadcast_arrays(
+        np.asarray(arrival, dtype=np.float64),
+        np.asarray(service_time, dtype=np.float64),
+        np.asarray(servers, dtype=np.int64),
+    )
+    load = arrival * service_time
+    with np.errstate(divide="ignore", invalid="ignore"):
+        utilisation = np.where(servers > 0, load / servers, np.inf)
+    # Erlang B by recurrence, kept where the step reaches the number of servers
+    blocking = np.ones_like(load)
+    erlang_b = np.ones_like(load)
+    for step in range(1, int(servers.max(initial=0)) + 1):
+        blocking = load * blocking / (step + load * blocking)
+        erlang_b = np.where(servers == step, blocking, erlang_b)
+    stable = (servers > 0) & (utilisation < 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        erlang_c = erlang_b / (1.0 - utilisation * (1.0 - erlang_b))
+        wait = erlang_c * service_time / (servers * (1.0 - utilisation))
+    wait = np.where(load == 0, 0.0, wait)
+    return np.where(stable | (load == 0), wait, np.inf)
+
+
+class Estimate:
+    """
+    Predicted behaviour of one or more candidate configurations.
+    """
+    _ns_names: List[str]
+    _ms_names: List[str]
+    _completion: np.ndarray
+    _utilisation: np.ndarray
+    _power: np.ndarray
+
+    def __init__(self, ns_names: List[str], ms_names: List[str], completion: np.ndarray, utilisation: np.ndarray,
+                 power: np.ndarray):
+        self._ns_names = ns_names
+        self._ms_names = ms_names
+        self._completion = completion
+        self._utilisation = utilisation
+        self._power = power
+
+    @property
+    def ns_names(self):
+        return self._ns_names
+
+    @property
+    def ms_names(self):
+        return self._ms_names
+
+    @property
+    def completion(self):
+        """Predicted completion time of every network service, shape (candidates, network services)."""
+        return self._completion
+
+    @property
+    def utilisation(self):
+        """Predicted utilisation of every microservice, shape (candidates, microservices)."""
+        return self._utilisation
+
+    @property
+    def power(self):
+        """Predicted datacenter power, shape (candidates,)."""
+        return self._power
+
+    @property
+    def feasible(self):
+        """Whether every microservice queue is stable, shape (candidates,)."""
+        return np.all(self._utilisation < 1.0, axis=1)
+
+
+class Estimator:
+    """
+    Closed-form queueing model of an experiment.
+
+    Every microservice is an M/M/c queue whose servers are the flows its replicas can run at once. Each network
+    service brings ``flows`` units of work per job within ``window`` seconds, a job taking ``length`` MI at
+    ``cpu_ratio`` percent of a CPU. Saturated queues fall back to a fluid approximation of their backlog. A network
+    service completes after the slowest job of every schedule slot, queueing included. Host power is linear in the
+    mean number of busy CPUs.
+
+    The structure of the experiment (jobs, ratios, host) is fixed, while microservice ``cpus``, ``ram``, ``bw``,
+    ``replicas`` and network service ``flows`` can be given per candidate to score many configurations at once.
+    """
+    _ms_names: List[str]
+    _ns_names: List[str]
+
+    def __init__(self, experiment: Experiment, mips: float = 1000.0, window: float = None):
+        """Queueing model of an experiment.
+
+        Args:
+            experiment (Experiment): the experiment, its microservices and network services give the defaults.
+            mips (float, optional): processing capacity of one host CPU in MIPS. Defaults to 1000.0.
+            window (float, optional): time over which the flows of all network services arrive. Defaults to the span of the schedule slots.
+        """
+        microservices = list(experiment.microservices)
+        network_services = list(experiment.network_services)
+        host = experiment.host
+        self._ms_names = [ms.name for ms in microservices]
+        self._ns_names = [ns.name for ns in network_services]
+
+        self._cpus = np.array([ms.cpus for ms in microservices], dtype=np.float64)
+        self._ram = np.array([ms.ram for ms in microservices], dtype=np.float64)
+        self._bw = np.array([ms.bw for ms in microservices], dtype=np.float64)
+        self._replicas = np.array([ms.replicas for ms in microservices], dtype=np.int64)
+        self._ratio = np.array([[ms.cpu_ratio, ms.ram_ratio, ms.bw_ratio] for ms in microservices], dtype=np.float64)
+        self._idle = np.array([[ms.idle_cpu, ms.idle_ram, ms.idle_bw] for ms in microservices], dtype=np.float64)
+        self._flows = np.array([ns.flows for ns in network_services], dtype=np.float64)
+
+        job_ns, job_ms, job_length, job_slot = list(), list(), list(), list()
+        for index, ns in enumerate(network_services):
+            for job, schedule in ns.iter_jobs():
+                job_ns.append(index)
+                job_ms.append(job.ms_id)
+                job_length.append(job.length)
+                job_slot.append(schedule)
+        # jobs grouped by network service, then by schedule slot
+        order = np.lexsort((np.array(job_slot), np.array(job_ns))) if job_ns else np.zeros(0, dtype=np.int64)
+        self._job_ns = np.array(job_ns, dtype=np.int64)[order]
+        self._job_ms = np.array(job_ms, dtype=np.int64)[order]
+        self._job_slot = np.array(job_slot, dtype=np.int64)[order]
+        self._job_service = np.array(job_length, dtype=np.float64)[order] / (mips * self._ratio[self._job_ms, 0] / 100)
+        group_start = np.ones(len(order), dtype=bool)
+        group_start[1:] = (np.diff(self._job_ns) != 0) | (np.diff(self._job_slot) != 0)
+        self._group_starts = np.flatnonzero(group_start)
+        self._group_ns = self._job_ns[self._group_starts]
+        # jobs and service time every network service brings to every microservice, per flow
+        self._jobs_per_ms = np.zeros((len(network_services), len(microservices)))
+        self._work_per_ms = np.zeros((len(network_services), len(microservices)))
+        np.add.at(self._jobs_per_ms, (self._job_ns, self._job_ms), 1.0)
+        np.add.at(self._work_per_ms, (self._job_ns, self._job_ms), self._job_service)
+
+        if window is None:
+            last_slot = int(self._job_slot.max()) if len(self._job_slot) > 0 else 0
+            window = (last_slot + 1) * experiment.config.interval
+        self._window = float(window)
+
+        self._hosts = host.replicas
+        self._host_pes = host.cpus
+        self._static_power = host.static_power
+        self._max_power = host.max_power
+
+    @property
+    def ms_names(self):
+        return self._ms_names
+
+    @property
+    def ns_names(self):
+        return self._ns_names
+
+    def estimate(
+        self,
+        cpus: np.ndarray = None,
+        ram: np.ndarray = None,
+        bw: np.ndarray = None,
+        replicas: np.ndarray = None,
+        flows: np.ndarray = None,
+    ) -> Estimate:
+        """Score candidate configurations.
+
+        Every argument defaults to the value of the experiment and broadcasts to shape (candidates, microservices)
+        or (candidates, network services), so a single row or a column of deltas can be given.
+
+        Args:
+            cpus (np.ndarray, optional): microservice cpus, as :attr:`PySDNSim.Microservice.Microservice.cpus`.
+            ram (np.ndarray, optional): microservice ram.
+            bw (np.ndarray, optional): microservice bw.
+            replicas (np.ndarray, optional): microservice replicas.
+            flows (np.ndarray, optional): network service flows.
+
+        Returns:
+            Estimate: predictions for every candidate.
+        """
+        cpus = np.atleast_2d(self._cpus if cpus is None else np.asarray(cpus, dtype=np.float64))
+        ram = np.atleast_2d(self._ram if ram is None else np.asarray(ram, dtype=np.float64))
+        bw = np.atleast_2d(self._bw if bw is None else np.asarray(bw, dtype=np.float64))
+        replicas = np.atleast_2d(self._replicas if replicas is None else np.asarray(replicas, dtype=np.int64))
+        flows = np.atleast_2d(self._flows if flows is None else np.asarray(flows, dtype=np.float64))
+        candidates = max(len(cpus), len(ram), len(bw), len(replicas), len(flows))
+        ms_count, ns_count = len(self._ms_names), len(self._ns_names)
+        cpus, ram, bw, replicas = (
+            np.broadcast_to(array, (candidates, ms_count)) for array in (cpus, ram, bw, replicas)
+        )
+        flows = np.broadcast_to(flows, (candidates, ns_count))
+
+        # concurrent flows of one replica, limited by its scarcest resource
+        capacity = np.stack((cpus * 100, ram, bw), axis=-1) - self._idle
+        with np.errstate(divide="ignore"):
+            slots = np.floor(capacity / self._ratio + 1e-9).min(axis=-1).clip(min=0).astype(np.int64)
+        servers = slots * replicas
+
+        # offered load of every microservice
+        arrival = flows @ self._jobs_per_ms / self._window
+        work = flows @ self._work_per_ms
+        with np.errstate(divide="ignore", invalid="ignore"):
+            service_time = np.where(arrival > 0, work / self._window / arrival, 0.0)
+            utilisation = np.where(servers > 0, arrival * service_time / servers, np.where(arrival > 0, np.inf, 0.0))
+        wait = erlang_c_wait(arrival, service_time, servers)
+        # a saturated queue drains the backlog built over the window at its service rate
+        fluid = np.where(servers > 0, np.maximum(utilisation - 1.0, 0.0) * self._window / 2, np.inf)
+        wait = np.where(np.isinf(wait) & (arrival > 0), fluid, wait)
+
+        # slowest job of every slot, summed over the slots of a network service
+        completion = np.zeros((candidates, ns_count))
+        if len(self._job_ms) > 0:
+            job_time = wait[:, self._job_ms] + self._job_service
+            slot_time = np.maximum.reduceat(job_time, self._group_starts, axis=1)
+            for group, ns in enumerate(self._group_ns):
+                completion[:, ns] += slot_time[:, group]
+
+        busy_cpus = (replicas * self._idle[:, 0] / 100).sum(axis=1)
+        busy_cpus = busy_cpus + (np.minimum(utilisation, 1.0) * servers * self._ratio[:, 0] / 100).sum(axis=1)
+        host_utilisation = np.minimum(busy_cpus / (self._hosts * self._host_pes), 1.0)
+        power = self._hosts * (self._static_power + (self._max_power - self._static_power) * host_utilisation)
+        return Estimate(
+            ns_names=self._ns_names,
+            ms_names=self._ms_names,
+            completion=completion,
+            utilisation=utilisation,
+            power=power,
+        )
+
+
+def estimate(experiment: Union[Experiment, List[Experiment]], mips: float = 1000.0) -> Union[Estimate, List[Estimate]]:
+    """Estimate one experiment, or each of a list of experiments.
+
+    Args:
+        experiment (Union[Experiment, List[Experiment]]): experiment(s) to estimate.
+        mips (float, optional): processing capacity of one host CPU in MIPS. Defaults to 1000.0.
+
+    Returns:
+        Union[Estimate, List[Estimate]]: estimate of a single candidate per experiment.
+    """
+    if isinstance(experiment, Experiment):
+        return Estimator(experiment, mips=mips).estimate()
+    return [Estimator(item, mips=mips).estimate() for item in experiment]
@@ -1,31 +1,56 @@
-from copy import deepcopy
-from typing import List, Union
+from copy import copy
+from typing import Dict, List, Tuple, Union
 from PySDNSim.Config import Config
 from PySDNSim.Host import Host
 from PySDNSim.Microservice import Microservice
+from PySDNSim.MicroservicePool import MicroservicePool
 from PySDNSim.NetworkService import NetworkService
 
+RESOURCES = {"cpu": "_cpus", "ram": "_ram", "bw": "_bw", "replicas": "_replicas"}
+
 
 class Experiment:
+    """
+    An experiment keeps a snapshot of the microservice and network service lists it is given, shares their
+    objects with the caller and only records its own overrides, the resource deltas of :meth:`scale`/:meth:`scale_all`
+    and the flows of :meth:`set_num_flows`.
+
+    The model with the overrides applied is built by :meth:`materialise` on first use and kept until the overrides
+    change, :attr:`microservices` and :attr:`network_services` read the same model. Microservices are copied only if
+    a resource is scaled and network services only if the number of flows is set, otherwise the shared objects are
+    returned. Copies are taken when the model is materialised, later changes to the shared objects only reach the
+    parts of the model that were not copied.
+    """
     _name: str
     _config: Config
     _host: Host
-    _microservices: List[Microservice]
-    _network_services: List[NetworkService]
+    _microservices: Tuple[Microservice, ...]
+    _pool: Union[MicroservicePool, None]
+    _network_services: Tuple[NetworkService, ...]
+    _scales: Dict[str, Dict[str, Union[int, float]]]
+    _scale_all: Dict[str, Union[int, float]]
+    _num_flows: Union[int, None]
+    _model: Union[Tuple[List[Microservice], List[NetworkService]], None]
 
     def __init__(
         self,
         name: str,
         config: Config,
         host:Host,
-        microservices: List[Microservice],
+        microservices: Union[MicroservicePool, List[Microservice]],
         network_services: List[NetworkService],
     ) -> None:
         self._name = name
         self._config = config
         self._host = host
-        self._microservices = deepcopy(microservices)
-        self._network_services = deepcopy(network_services)
+        # tuples are snapshots already, experiments of a sweep share them
+        self._microservices = tuple(microservices)
+        self._pool = microservices if isinstance(microservices, MicroservicePool) else None
+        self._network_services = tuple(network_services)
+        self._scales = dict()
+        self._scale_all = dict()
+        self._num_flows = None
+        self._model = None
 
     @property
     def name(self):
@@ -40,72 +65,102 @@ class Experiment:
         return self._host
 
     @property
-    def microservices(self):
-        return self._microservices
+    def microservices(self) -> List[Microservice]:
+        """Microservices with the resource deltas applied, see :meth:`materialise`."""
+        return self.materialise()[0]
+
+    @property
+    def network_services(self) -> List[NetworkService]:
+        """Network services with the number of flows applied, see :meth:`materialise`."""
+        return self.materialise()[1]
+
+    def materialise(self) -> Tuple[List[Microservice], List[NetworkService]]:
+        """Apply the overrides to the shared model, once until the overrides change.
+
+        Returns:
+            Tuple[List[Microservice], List[NetworkService]]: the microservices and network services of the experiment.
+        """
+        if self._model is None:
+            self._model = (self._materialise_microservices(), self._materialise_network_services())
+        return self._model
+
+    def _materialise_microservices(self) -> List[Microservice]:
+        if not self._scales and not self._scale_all:
+            return list(self._microservices)
+        microservices = list()
+        for ms in self._microservices:
+            deltas = self._scales.get(ms.name)
+            scaled = copy(ms)
+            scaled._auto_scale = list(ms.auto_scale)
+            for resource, attribute in RESOURCES.items():
+                value = self._scale_all.get(resource, 0)
+                if deltas is not None:
+                    value = value + deltas.get(resource, 0)
+                if value != 0:
+                    setattr(scaled, attribute, getattr(ms, attribute) + value)
+            if scaled.replicas > ms.replicas:
+                # added replicas raise the auto scaling ceiling with them
+                scaled._max_replicas = max(ms.max_replicas, scaled.replicas)
+            microservices.append(scaled)
+        return microservices
+
+    def _materialise_network_services(self) -> List[NetworkService]:
+        if self._num_flows is None:
+            return list(self._network_services)
+        network_services = list()
+        for ns in self._network_services:
+            # copies share their jobs with the originals
+            ns = copy(ns)
+            ns._slots = {slot: list(jobs) for slot, jobs in ns._slots.items()}
+            ns._slot_keys = list(ns._slot_keys)
+            ns._jobs = None
+            ns._flows = self._num_flows
+            network_services.append(ns)
+        return network_services
 
     @property
-    def network_services(self):
-        return self._network_services
+    def overrides(self) -> Dict[str, Union[Dict, int, None]]:
+        """Overrides recorded on top of the shared model."""
+        return {"scale": self._scales, "scale_all": self._scale_all, "num_flows": self._num_flows}
 
     def scale_all(self, resource: str, value: Union[int, float]):
         """Scale resoource for all microservices.
 
         Args:
-            resource (str): resource name, "cpu", "ram", or "bw".
+            resource (str): resource name, "cpu", "ram", "bw" or "replicas".
             value (Union[int,float]): value to scale.
 
         Raises:
             RuntimeWarning: if a wrong resource name is given.
         """
-        if resource == "cpu":
-            for ms in self.microservices:
-                ms._cpus = ms.cpus + value
-        elif resource == "ram":
-            for ms in self.microservices:
-                ms._ram = ms.ram + value
-        elif resource == "bw":
-            for ms in self.microservices:
-                ms._bw = ms.bw + value
-        else:
+        if resource not in RESOURCES:
             raise RuntimeWarning(f"Resource {resource} does not exist.")
+        self._scale_all[resource] = self._scale_all.get(resource, 0) + value
+        self._model = None
 
     def scale(self, ms_name: str, resource: str, value: Union[int, float]):
         """Scale resoource for a specific microservice.
 
         Args:
             ms_name (str): microservices name.
-            resource (str): resource name, "cpu", "ram", or "bw".
+            resource (str): resource name, "cpu", "ram", "bw" or "replicas".
             value (Union[int, float]): value to scale.
 
         Raises:
             RuntimeWarning: if microservice is not found or resource name is not correct.
         """
-        found_ms = False
-        if resource == "cpu":
-            for ms in self.microservices:
-                if ms.name == ms_name:
-                    ms._cpus = ms.cpus + value
-                    found_ms = True
-                    break
-        elif resource == "ram":
-            for ms in self.microservices:
-                if ms.name == ms_name:
-                    ms._ram = ms.ram + value
-                    found_ms = True
-                    break
-        elif resource == "bw":
-            for ms in self.microservices:
-                if ms.name == ms_name:
-                    ms._bw = ms.bw + value
-                    found_ms = True
-                    break
+        if resource not in RESOURCES:
+            raise RuntimeWarning(f"Resource {resource} does not exist.")
+        if self._pool is not None:
+            found = ms_name in self._pool
         else:
-            if found_ms is False:
-                raise RuntimeWarning(f"Microservice {ms_name} not found.")
-            else:
-                raise RuntimeWarning(f"Resource {resource} does not exist.")
-            
+            found = any(ms.name == ms_name for ms in self._microservices)
+        if not found:
+            raise RuntimeWarning(f"Microservice {ms_name} not found.")
+        deltas = self._scales.setdefault(ms_name, dict())
+        deltas[resource] = deltas.get(resource, 0) + value
+        self._model = None
+
     def set_num_flows(self, num_flows:int):
-        for ns in self.network_services:
-            ns._flows = num_flows
-            
+        self._num_flows = num_flows
+        self._model = None
@@ -0,0 +1,210 @@
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Log import logger
+
+RESOURCES = ("cpu", "ram", "bw")
+
+_EPS = 1e-9
+
+
+def _totals(owner: np.ndarray, values: np.ndarray, count: int) -> np.ndarray:
+    """``(count, 3)`` sums of the rows of ``values`` of every experiment."""
+    return np.stack([np.bincount(owner, weights=values[:, column], minlength=count) for column in range(3)], axis=1)
+
+
+class Feasibility:
+    """
+    Outcome of the static capacity check of one experiment, see :class:`FeasibilityCheck`.
+
+    ``errors`` are reasons the experiment can never place its initial replicas, ``warnings`` are reasons it may
+    not behave as configured, e.g. replica limits the hosts can never hold. Headroom is the fraction of every
+    host resource left once the replicas are placed, negative when they do not fit.
+    """
+    __slots__ = ("_name", "_errors", "_warnings", "_headroom", "_max_headroom")
+    _name: str
+    _errors: List[str]
+    _warnings: List[str]
+    _headroom: Dict[str, float]
+    _max_headroom: Dict[str, float]
+
+    def __init__(self, name: str, errors: List[str], warnings: List[str], headroom: Dict[str, float],
+                 max_headroom: Dict[str, float]):
+        self._name = name
+        self._errors = errors
+        self._warnings = warnings
+        self._headroom = headroom
+        self._max_headroom = max_headroom
+
+    def __repr__(self) -> str:
+        return f"Feasibility(name={self.name!r}, feasible={self.feasible}, headroom={self.min_headroom:.3f})"
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def errors(self):
+        return self._errors
+
+    @property
+    def warnings(self):
+        return self._warnings
+
+    @property
+    def feasible(self):
+        return not self._errors
+
+    @property
+    def reason(self) -> str:
+        """Errors and warnings in one line, empty if there are none."""
+        return " ".join(self._errors + self._warnings)
+
+    @property
+    def headroom(self):
+        """Fraction of the cpu, ram and bw of the hosts left by the initial replicas."""
+        return self._headroom
+
+    @property
+    def max_headroom(self):
+        """Fraction of the cpu, ram and bw of the hosts left once every auto scaled microservice is at its limit."""
+        return self._max_headroom
+
+    @property
+    def min_headroom(self) -> float:
+        """Headroom of the scarcest resource, to rank experiments by."""
+        return min(self._headroom.values())
+
+
+class FeasibilityCheck:
+    """
+    Static check that the microservices of an experiment can be placed on its hosts, without running it.
+
+    Follows the placement of the backend: every replica is a VM reserving ``cpus``, ``ram`` and ``bw`` of one host,
+    whole CPUs on a SpaceShared host. An experiment is rejected when a single replica is larger than a host or when
+    the initial replicas need more than all the hosts have together. Replica limits of auto scaled microservices
+    that the hosts can never hold, and microservices whose idle consumption leaves no room for a single flow, are
+    reported as warnings, or as errors when ``strict``. The totals are necessary conditions, an experiment that
+    passes can still fail to pack its replicas on the hosts.
+    """
+    _strict: bool
+    _debug: bool
+
+    def __init__(self, strict: bool = False, debug: bool = False):
+        """Capacity check.
+
+        Args:
+            strict (bool, optional): reject experiments with warnings too. Defaults to False.
+            debug (bool, optional): log every rejected experiment. Defaults to False.
+        """
+        self._strict = strict
+        self._debug = debug
+
+    @property
+    def strict(self):
+        return self._strict
+
+    @property
+    def debug(self):
+        return self._debug
+
+    def check(self, experiment: Experiment) -> Feasibility:
+        """Check one experiment.
+
+        Args:
+            experiment (Experiment): the experiment.
+
+        Returns:
+            Feasibility: the outcome.
+        """
+        return self.check_all([experiment])[0]
+
+    def check_all(self, experiments: Iterable[Experiment]) -> List[Feasibility]:
+        """Check a whole sweep at once, the capacities of all experiments are computed as arrays.
+
+        Args:
+            experiments (Iterable[Experiment]): the experiments.
+
+        Returns:
+            List[Feasibility]: the outcomes, in the order of the experiments.
+        """
+        experiments = list(experiments)
+        names, owner, rows = list(), list(), list()
+        hosts = np.zeros((len(experiments), 5), dtype=np.float64)
+        for index, experiment in enumerate(experiments):
+            host = experiment.host
+            hosts[index] = (host.cpus, host.ram, host.bw, host.replicas, host.vm_scheduler != "TimeShared")
+            for ms in experiment.microservices:
+                names.append(ms.name)
+                owner.append(index)
+                rows.append((ms.cpus, ms.ram, ms.bw, ms.replicas, ms.max_replicas, len(ms.auto_scale) > 0,
+                             ms.idle_cpu, ms.idle_ram, ms.idle_bw, ms.cpu_ratio, ms.ram_ratio, ms.bw_ratio))
+        owner = np.array(owner, dtype=np.int64)
+        ms = np.array(rows, dtype=np.float64).reshape(-1, 12)
+        count = len(experiments)
+
+        # what every replica reserves on its host
+        space_shared = hosts[owner, 4] > 0
+        reserved = ms[:, 0:3].copy()
+        reserved[:, 0] = np.where(space_shared, np.ceil(reserved[:, 0] - _EPS), reserved[:, 0])
+        per_host = hosts[:, 0:3]
+        capacity = per_host * hosts[:, 3:4]
+        replicas = ms[:, 3]
+        scaling = (ms[:, 5] > 0) & (ms[:, 4] > replicas)
+        limit = np.where(scaling, ms[:, 4], replicas)
+        initial = _totals(owner, reserved * replicas[:, None], count)
+        peak = _totals(owner, reserved * limit[:, None], count)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            headroom = np.where(capacity > 0, 1 - initial / capacity, -np.inf)
+            max_headroom = np.where(capacity > 0, 1 - peak / capacity, -np.inf)
+        oversized = (reserved > per_host[owner] + _EPS) & (replicas > 0)[:, None]
+        # flows a replica runs at once, cpu ratios are percents of one cpu
+        slots = np.floor((ms[:, 0:3] * [100, 1, 1] - ms[:, 6:9]) / np.maximum(ms[:, 9:12], _EPS) + _EPS).min(axis=1)
+
+        errors: List[List[str]] = [list() for _ in experiments]
+        warnings: List[List[str]] = [list() for _ in experiments]
+        for row, resource in zip(*np.nonzero(oversized)):
+            index = owner[row]
+            errors[index].append(f"A replica of microservice {names[row]} needs {reserved[row, resource]:g} "
+                                 f"{RESOURCES[resource]}, a host has {per_host[index, resource]:g}.")
+        for index, resource in zip(*np.nonzero(initial > capacity + _EPS)):
+            errors[index].append(f"Initial replicas need {initial[index, resource]:g} {RESOURCES[resource]}, "
+                                 f"the hosts have {capacity[index, resource]:g}.")
+        for index, resource in zip(*np.nonzero((peak > capacity + _EPS) & (initial <= capacity + _EPS))):
+            warnings[index].append(f"Replica limits need {peak[index, resource]:g} {RESOURCES[resource]}, "
+                                   f"the hosts have {capacity[index, resource]:g}.")
+        for row in np.flatnonzero((slots < 1) & (replicas > 0)):
+            warnings[owner[row]].append(f"Microservice {names[row]} has no room for a flow after its idle use.")
+
+        outcomes = list()
+        for index, experiment in enumerate(experiments):
+            if self._strict:
+                errors[index].extend(warnings[index])
+                warnings[index] = list()
+            outcome = Feasibility(
+                experiment.name,
+                errors[index],
+                warnings[index],
+                dict(zip(RESOURCES, headroom[index].tolist())),
+                dict(zip(RESOURCES, max_headroom[index].tolist())),
+            )
+            if self._debug and not outcome.feasible:
+                logger.info(f"Rejected experiment\t {experiment.name}: {outcome.reason}")
+            outcomes.append(outcome)
+        return outcomes
+
+    def rank(self, experiments: Iterable[Experiment]) -> List[Tuple[Experiment, Feasibility]]:
+        """Feasible experiments, the most headroom first.
+
+        Args:
+            experiments (Iterable[Experiment]): the experiments.
+
+        Returns:
+            List[Tuple[Experiment, Feasibility]]: every feasible experiment with its outcome.
+        """
+        experiments = list(experiments)
+        outcomes = self.check_all(experiments)
+        feasible = [(experiment, outcome) for experiment, outcome in zip(experiments, outcomes) if outcome.feasible]
+        return sorted(feasible, key=lambda pair: -pair[1].min_headroom)
@@ -2,6 +2,7 @@ class Host:
     """
     This class represents a host.
     """
+    __slots__ = ("_cpus", "_ram", "_bw", "_storage", "_static_power", "_max_power", "_vm_scheduler", "_replicas")
     _cpus: int
     _ram: int
     _bw: int
@@ -0,0 +1,33 @@
+import itertools
+import os
+import secrets
+
+# bits of the per-process counter, the random salt of the process sits above them
+_COUNTER_BITS = 64
+
+_ids = itertools.count()
+_salt = 0
+
+
+def _reseed():
+    """Draw a new salt and restart the counter, e.g. in a forked child that inherited the state of its parent."""
+    global _ids, _salt
+    _salt = secrets.randbits(64) << _COUNTER_BITS
+    _ids = itertools.count()
+
+
+def next_id() -> int:
+    """Allocate an id, unique across processes and increasing with creation order within a process.
+
+    Every process draws a random 64-bit salt that prefixes its counter, so objects created in different
+    processes, e.g. pickled back from a process pool or another node, do not share ids.
+
+    Returns:
+        int: the new id.
+    """
+    return _salt | next(_ids)
+
+
+_reseed()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed)
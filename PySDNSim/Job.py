@@ -1,34 +1,52 @@
-from uuid import uuid4
+from PySDNSim.Id import next_id
 from PySDNSim.Microservice import Microservice
-from typing import List
+from PySDNSim.MicroservicePool import MicroservicePool, resolve
+from typing import List, Union
 
 class Job:
     """
     Represents a single job.
     """
+    __slots__ = ("_id", "_ms", "_ms_id", "_length", "_schedule")
     _id:int
     _ms:Microservice
     _ms_id: int
     _length: int
     _schedule: int
 
-    def __init__(self, ms_name: str, length: int,schedule: int, ms_pool:List[Microservice]):
+    def __init__(self, ms_name: str, length: int,schedule: int, ms_pool:Union[MicroservicePool, List[Microservice]]):
         """
         Create a new Job with the given ms, length, file_size, schedule specified.
 
         :param ms: id of microservice.
         :param length: length of the job in MIPS.
         :param file_size: input/output size of the job in bytes.
-        :param schedule: schedule of the job.
+        :param schedule: schedule of the job, relative to its network service.
+        :param ms_pool: available microservices, a MicroservicePool resolves the name in constant time, a list is scanned.
+        :raises RuntimeError: if no microservice of the pool has the given name.
         """
-        self._id = uuid4()
-        for ms in ms_pool:
-            if ms.name == ms_name:  
-                self._ms = ms       
-                self._ms_id = ms_pool.index(ms)
+        self._id = next_id()
+        self._ms, self._ms_id = resolve(ms_pool, ms_name)
         self._length = length
         self._schedule = schedule
         
+    @classmethod
+    def resolved(cls, ms: Microservice, ms_id: int, length: int, schedule: int) -> "Job":
+        """Create a job whose microservice is already resolved, skipping the pool lookup.
+
+        :param ms: the microservice.
+        :param ms_id: index of the microservice in its pool.
+        :param length: length of the job in MIPS.
+        :param schedule: schedule of the job, relative to its network service.
+        """
+        job = cls.__new__(cls)
+        job._id = next_id()
+        job._ms = ms
+        job._ms_id = ms_id
+        job._length = length
+        job._schedule = schedule
+        return job
+
     def __lt__(self, __o: object) -> bool:
         if self.id > __o.id:
             return True
@@ -62,4 +80,6 @@ class Job:
 
     @property
     def schedule(self):
+        """Schedule slot of the job relative to its network service, see
+        :meth:`PySDNSim.NetworkService.NetworkService.offset_schedule`."""
         return self._schedule
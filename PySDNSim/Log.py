@@ -1,15 +1,236 @@
+"""
+Logging of PySDNSim.
+
+Records are put on a queue by the ``logger`` and written by a single background listener, so logging never
+waits on a console or disk. By default the listener only writes INFO and above to stderr, nothing is written
+to disk until :func:`configure_logging` asks for it. The level can also be set with the ``PYSDNSIM_LOG_LEVEL``
+environment variable.
+
+A process forked after the logging was configured can not reach the listener through a process-local queue, its
+records are then written to stderr directly.
+
+The standard output and error of every backend run can be kept in a per-experiment log file, see the
+``experiment_dir`` argument of :func:`configure_logging`.
+"""
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
+import os
+import queue
+import threading
+from typing import Any, BinaryIO, Union
+
+FORMAT = "%(asctime)s\t%(levelname)s\t%(message)s"
+formatter = logging.Formatter(FORMAT)
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
-formatter = logging.Formatter('%(asctime)s\t%(levelname)s\t%(message)s')
 
-stream_handler = logging.StreamHandler()
-stream_handler.setLevel(logging.INFO)
-stream_handler.setFormatter(formatter)
-logger.addHandler(stream_handler)
+_lock = threading.Lock()
+_queue: Any = queue.SimpleQueue()
+_listener: Union[logging.handlers.QueueListener, None] = None
+_listener_pid = 0
+_fallback_level: int = logging.INFO
+_experiment_dir: Union[str, None] = None
+_experiment_max_bytes = 0
+_experiment_backup_count = 0
+
+
+def _level(level: Union[int, str, None]) -> int:
+    if level is None:
+        level = os.environ.get("PYSDNSIM_LOG_LEVEL", "INFO")
+    if isinstance(level, str):
+        number = logging.getLevelName(level.upper())
+        if not isinstance(number, int):
+            raise RuntimeError(f"Unknown log level {level!r}.")
+        return number
+    return level
+
+
+def _stop():
+    global _listener
+    # a forked child inherits the listener of its parent, stopping it would stop the parent's through the queue
+    if _listener is not None and _listener_pid == os.getpid():
+        _listener.stop()
+    _listener = None
+
+
+def configure_logging(
+    level: Union[int, str] = None,
+    console: bool = True,
+    file: str = None,
+    file_level: Union[int, str] = logging.DEBUG,
+    max_bytes: int = 10 * 1024 ** 2,
+    backup_count: int = 5,
+    experiment_dir: str = None,
+    experiment_max_bytes: int = 10 * 1024 ** 2,
+    experiment_backup_count: int = 2,
+    multiprocess: bool = False,
+) -> Any:
+    """Set up the logging pipeline, replacing the previous one.
+
+    Args:
+        level (Union[int, str], optional): level of the console. Defaults to ``PYSDNSIM_LOG_LEVEL`` or INFO.
+        console (bool, optional): write records to stderr. Defaults to True.
+        file (str, optional): log file, rotated by size. Defaults to None.
+        file_level (Union[int, str], optional): level of the log file. Defaults to DEBUG.
+        max_bytes (int, optional): size at which the log file is rotated. Defaults to 10 MiB.
+        backup_count (int, optional): rotated log files kept. Defaults to 5.
+        experiment_dir (str, optional): directory of the per-experiment backend output logs. Defaults to None,
+            the output of the backend then goes to stdout.
+        experiment_max_bytes (int, optional): size at which a per-experiment log is rotated. Defaults to 10 MiB.
+        experiment_backup_count (int, optional): rotated logs kept per experiment, also across reruns. Defaults to 2.
+        multiprocess (bool, optional): use a queue that other processes can log to through
+            :func:`configure_worker_logging`. Defaults to False.
+
+    Returns:
+        Any: the queue the listener reads from.
+    """
+    global _queue, _listener, _listener_pid, _fallback_level, _experiment_dir, _experiment_max_bytes, \
+        _experiment_backup_count
+    handlers = list()
+    console_level = _level(level)
+    if console:
+        stream_handler = logging.StreamHandler()
+        stream_handler.setLevel(console_level)
+        stream_handler.setFormatter(formatter)
+        handlers.append(stream_handler)
+    if file is not None:
+        file_handler = logging.handlers.RotatingFileHandler(
+            file, maxBytes=max_bytes, backupCount=backup_count, delay=True
+        )
+        file_handler.setLevel(_level(file_level))
+        file_handler.setFormatter(formatter)
+        handlers.append(file_handler)
+    if experiment_dir is not None:
+        os.makedirs(experiment_dir, exist_ok=True)
+    with _lock:
+        _stop()
+        _queue = multiprocessing.Queue() if multiprocess else queue.SimpleQueue()
+        _listener = logging.handlers.QueueListener(_queue, *handlers, respect_handler_level=True)
+        _fallback_level = console_level if console else logging.WARNING
+        _attach(_queue, local=not multiprocess)
+        _listener.start()
+        _listener_pid = os.getpid()
+        _experiment_dir = experiment_dir
+        _experiment_max_bytes = experiment_max_bytes
+        _experiment_backup_count = experiment_backup_count
+    return _queue
+
+
+def configure_worker_logging(log_queue: Any):
+    """Send the records of this process to the listener of another one, e.g. in a process pool initializer.
+
+    Args:
+        log_queue (Any): queue returned by :func:`configure_logging` with ``multiprocess=True``.
+    """
+    with _lock:
+        _stop()
+        _attach(log_queue, local=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that writes to stderr directly in a process forked from the one owning a process-local queue,
+    where nothing would ever read the records.
+    """
+    _local: bool
+    _pid: int
+    _fallback: Union[logging.Handler, None]
+
+    def __init__(self, log_queue: Any, local: bool):
+        super().__init__(log_queue)
+        self._local = local
+        self._pid = os.getpid()
+        self._fallback = None
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        if self._local and os.getpid() != self._pid:
+            if self._fallback is None:
+                self._fallback = logging.StreamHandler()
+                self._fallback.setLevel(_fallback_level)
+                self._fallback.setFormatter(formatter)
+            return self._fallback.handle(record)
+        return super().handle(record)
+
+
+def _attach(log_queue: Any, local: bool):
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(_QueueHandler(log_queue, local))
+
+
+class ExperimentLog:
+    """
+    Log file of the output of one backend run, rotated by size.
+
+    An existing log of the same experiment is rotated away when the file is opened, so reruns keep the logs of
+    ``backup_count`` previous runs.
+    """
+    _path: str
+    _max_bytes: int
+    _backup_count: int
+    _file: BinaryIO
+    _size: int
+
+    def __init__(self, path: str, max_bytes: int = 10 * 1024 ** 2, backup_count: int = 2):
+        """Open a log file.
+
+        Args:
+            path (str): path of the log file.
+            max_bytes (int, optional): size at which the file is rotated, 0 never rotates. Defaults to 10 MiB.
+            backup_count (int, optional): rotated files kept. Defaults to 2.
+        """
+        self._path = path
+        self._max_bytes = max_bytes
+        self._backup_count = backup_count
+        if os.path.exists(path):
+            self._rotate()
+        self._file = open(path, "wb")
+        self._size = 0
+
+    @property
+    def path(self):
+        return self._path
+
+    def write(self, data: bytes):
+        if self._max_bytes and self._size + len(data) > self._max_bytes and self._size > 0:
+            self._file.close()
+            self._rotate()
+            self._file = open(self._path, "wb")
+            self._size = 0
+        self._file.write(data)
+        self._size += len(data)
+
+    def close(self):
+        self._file.close()
+
+    def _rotate(self):
+        if self._backup_count <= 0:
+            os.remove(self._path)
+            return
+        for index in range(self._backup_count - 1, 0, -1):
+            source = f"{self._path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self._path}.{index + 1}")
+        os.replace(self._path, self._path + ".1")
+
+
+def open_experiment_log(name: str) -> Union[ExperimentLog, None]:
+    """Open the log of a backend run, if per-experiment logs are configured.
+
+    Args:
+        name (str): experiment name.
+
+    Returns:
+        Union[ExperimentLog, None]: the log file, None if the backend output goes to stdout.
+    """
+    if _experiment_dir is None:
+        return None
+    return ExperimentLog(os.path.join(_experiment_dir, name + ".log"), _experiment_max_bytes,
+                         _experiment_backup_count)
+
 
-file_handler = logging.FileHandler(filename='.log', mode='w')
-file_handler.setLevel(logging.DEBUG)
-file_handler.setFormatter(formatter)
-logger.addHandler(file_handler)
+configure_logging()
+atexit.register(_stop)
@@ -0,0 +1,156 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, TextIO, Union
+
+import numpy as np
+
+from PySDNSim.RunResult import RunResult
+
+# timed phases of a run, in the order they happen
+PHASES = ("build_time", "write_time", "startup_time", "wall_time")
+METRICS = PHASES + ("output_bytes", "peak_rss_mb")
+QUANTILES = (0.5, 0.95)
+
+
+def records(results: Iterable[RunResult]) -> List[Dict[str, Any]]:
+    """Structured records of runs.
+
+    Args:
+        results (Iterable[RunResult]): results of the runs.
+
+    Returns:
+        List[Dict[str, Any]]: one :meth:`PySDNSim.RunResult.RunResult.as_dict` per run.
+    """
+    return [result.as_dict() for result in results]
+
+
+def write_jsonl(results: Iterable[RunResult], file: Union[str, TextIO], append: bool = True):
+    """Write one JSON line per run.
+
+    Args:
+        results (Iterable[RunResult]): results of the runs.
+        file (Union[str, TextIO]): path or open text file.
+        append (bool, optional): append to an existing file instead of replacing it. Defaults to True.
+    """
+    if isinstance(file, str):
+        with open(file, "a" if append else "w") as stream:
+            write_jsonl(results, stream)
+        return
+    for record in records(results):
+        file.write(json.dumps(record) + "\n")
+
+
+def summarize(results: Iterable[RunResult]) -> Dict[str, Dict[str, float]]:
+    """Distribution of every metric over a sweep.
+
+    Runs that did not measure a metric, e.g. cached runs for the start-up time, are left out of its statistics.
+
+    Args:
+        results (Iterable[RunResult]): results of the runs.
+
+    Returns:
+        Dict[str, Dict[str, float]]: for every entry of ``METRICS``, its ``count``, ``sum``, ``mean``, ``p50``,
+        ``p95`` and ``max``.
+    """
+    rows = records(results)
+    summary = dict()
+    for metric in METRICS:
+        values = np.array([row[metric] for row in rows if row[metric] is not None], dtype=np.float64)
+        stats = {"count": float(len(values)), "sum": float(values.sum())}
+        if len(values):
+            p50, p95 = np.percentile(values, [100 * quantile for quantile in QUANTILES])
+            stats.update(mean=float(values.mean()), p50=float(p50), p95=float(p95), max=float(values.max()))
+        else:
+            stats.update(mean=np.nan, p50=np.nan, p95=np.nan, max=np.nan)
+        summary[metric] = stats
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render a :func:`summarize` result as a table.
+
+    Args:
+        summary (Dict[str, Dict[str, float]]): the summary.
+
+    Returns:
+        str: one line per metric.
+    """
+    lines = [f"{'metric':<14}{'count':>7}{'mean':>12}{'p50':>12}{'p95':>12}{'max':>12}"]
+    for metric, stats in summary.items():
+        lines.append(f"{metric:<14}{stats['count']:>7.0f}{stats['mean']:>12.4g}{stats['p50']:>12.4g}"
+                     f"{stats['p95']:>12.4g}{stats['max']:>12.4g}")
+    return "\n".join(lines)
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    if np.isnan(value):
+        return "NaN"
+    return repr(float(value))
+
+
+def prometheus_text(results: Iterable[RunResult], prefix: str = "pysdnsim") -> str:
+    """Prometheus text exposition of runs and of their phase summary.
+
+    Args:
+        results (Iterable[RunResult]): results of the runs.
+        prefix (str, optional): prefix of the metric names. Defaults to "pysdnsim".
+
+    Returns:
+        str: the exposition, e.g. for a node exporter textfile collector.
+    """
+    results = list(results)
+    lines = list()
+
+    def family(name: str, kind: str, help_text: str):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    family("run_phase_seconds", "gauge", "Time spent in each phase of a backend run.")
+    for result in results:
+        for phase in PHASES:
+            value = getattr(result, phase)
+            if value is not None:
+                lines.append(f'{prefix}_run_phase_seconds{{experiment="{_label(result.name)}",'
+                             f'phase="{phase[:-len("_time")]}"}} {_number(value)}')
+    family("run_output_bytes", "gauge", "Size of the output directory of a backend run.")
+    for result in results:
+        if result.output_bytes is not None:
+            lines.append(f'{prefix}_run_output_bytes{{experiment="{_label(result.name)}"}} {result.output_bytes}')
+    family("run_peak_rss_bytes", "gauge", "Peak resident memory of a backend process.")
+    for result in results:
+        if result.peak_rss_mb is not None:
+            lines.append(f'{prefix}_run_peak_rss_bytes{{experiment="{_label(result.name)}"}} '
+                         f'{int(result.peak_rss_mb * 2 ** 20)}')
+    family("run_success", "gauge", "Whether a backend run completed or was stopped early at steady state, 0 for "
+                                   "failed and rejected runs.")
+    for result in results:
+        lines.append(f'{prefix}_run_success{{experiment="{_label(result.name)}",'
+                     f'cached="{str(result.cached).lower()}"}} {int(result.success)}')
+
+    summary = summarize(results)
+    family("phase_seconds", "summary", "Distribution of the time spent in each phase over the runs.")
+    for phase in PHASES:
+        stats = summary[phase]
+        label = phase[:-len("_time")]
+        for quantile, key in zip(QUANTILES, ("p50", "p95")):
+            lines.append(f'{prefix}_phase_seconds{{phase="{label}",quantile="{quantile}"}} {_number(stats[key])}')
+        lines.append(f'{prefix}_phase_seconds_sum{{phase="{label}"}} {_number(stats["sum"])}')
+        lines.append(f'{prefix}_phase_seconds_count{{phase="{label}"}} {int(stats["count"])}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(results: Iterable[RunResult], path: str, prefix: str = "pysdnsim"):
+    """Write :func:`prometheus_text` atomically, so that a scraper never reads a partial file.
+
+    Args:
+        results (Iterable[RunResult]): results of the runs.
+        path (str): destination file.
+        prefix (str, optional): prefix of the metric names. Defaults to "pysdnsim".
+    """
+    with open(path + ".tmp", "w") as file:
+        file.write(prometheus_text(results, prefix))
+    os.replace(path + ".tmp", path)
@@ -1,10 +1,12 @@
-from uuid import uuid4
 from PySDNSim.AutoScale import AutoScale
+from PySDNSim.Id import next_id
 from typing import List
 class Microservice:
     """
     Represents a Microservice.
     """
+    __slots__ = ("_id", "_name", "_size", "_cpus", "_ram", "_bw", "_replicas", "_max_replicas", "_cpu_ratio",
+                 "_ram_ratio", "_bw_ratio", "_idle_cpu", "_idle_ram", "_idle_bw", "_auto_scale")
     _id:int
     _name: str
     _size: int
@@ -37,7 +39,7 @@ class Microservice:
         :param ram_ratio: amount of ram that each flow consumes.
         :param bw_ratio: amount of bw that each flow consumes.
         """
-        self._id = uuid4()
+        self._id = next_id()
         self._name = name
         self._size = size
         self._replicas = replicas
@@ -0,0 +1,178 @@
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+
+from PySDNSim.Microservice import Microservice
+
+
+class MicroservicePool:
+    """
+    Ordered collection of microservices with constant time lookup by name and by id.
+
+    The position of a microservice in the pool is its id in the generated configuration.
+    """
+    __slots__ = ("_microservices", "_by_name", "_by_id")
+    _microservices: List[Microservice]
+    _by_name: Dict[str, int]
+    _by_id: Dict[int, int]
+
+    def __init__(self, microservices: Iterable[Microservice] = ()):
+        """Create a pool.
+
+        Args:
+            microservices (Iterable[Microservice], optional): initial microservices, in order. Defaults to ().
+
+        Raises:
+            RuntimeError: if two microservices share a name.
+        """
+        self._microservices = list()
+        self._by_name = dict()
+        self._by_id = dict()
+        for ms in microservices:
+            self.append(ms)
+
+    @classmethod
+    def of(cls, ms_pool: Union["MicroservicePool", List[Microservice]]) -> "MicroservicePool":
+        """Return the given pool, or build one from a list of microservices.
+
+        Args:
+            ms_pool (Union[MicroservicePool, List[Microservice]]): pool or list of microservices.
+
+        Returns:
+            MicroservicePool: the pool.
+        """
+        if isinstance(ms_pool, cls):
+            return ms_pool
+        return cls(ms_pool)
+
+    def append(self, ms: Microservice):
+        """Add a microservice at the end of the pool.
+
+        Args:
+            ms (Microservice): the microservice.
+
+        Raises:
+            RuntimeError: if a microservice with the same name is already in the pool.
+        """
+        if ms.name in self._by_name:
+            raise RuntimeError(f"Microservice {ms.name} is already in the pool.")
+        self._by_name[ms.name] = len(self._microservices)
+        self._by_id[ms.id] = len(self._microservices)
+        self._microservices.append(ms)
+
+    def __len__(self) -> int:
+        return len(self._microservices)
+
+    def __iter__(self) -> Iterator[Microservice]:
+        return iter(self._microservices)
+
+    def __getitem__(self, index: int) -> Microservice:
+        return self._microservices[index]
+
+    def __contains__(self, item: Union[str, Microservice]) -> bool:
+        if isinstance(item, Microservice):
+            return item.id in self._by_id
+        return item in self._by_name
+
+    @property
+    def names(self) -> List[str]:
+        return [ms.name for ms in self._microservices]
+
+    def index(self, ms: Microservice) -> int:
+        """Position of a microservice, as ``list.index``.
+
+        Args:
+            ms (Microservice): the microservice.
+
+        Raises:
+            RuntimeError: if the microservice is not in the pool.
+
+        Returns:
+            int: its position.
+        """
+        try:
+            return self._by_id[ms.id]
+        except KeyError:
+            raise RuntimeError(f"Microservice {ms.name} not found.") from None
+
+    def index_of(self, ms_name: str) -> int:
+        """Position of a microservice by name.
+
+        Args:
+            ms_name (str): name of the microservice.
+
+        Raises:
+            RuntimeError: if no microservice has that name.
+
+        Returns:
+            int: its position.
+        """
+        try:
+            return self._by_name[ms_name]
+        except KeyError:
+            raise RuntimeError(f"Microservice {ms_name} not found.") from None
+
+    def get(self, ms_name: str) -> Microservice:
+        """Microservice by name.
+
+        Args:
+            ms_name (str): name of the microservice.
+
+        Raises:
+            RuntimeError: if no microservice has that name.
+
+        Returns:
+            Microservice: the microservice.
+        """
+        return self._microservices[self.index_of(ms_name)]
+
+    def resolve(self, ms_name: str) -> Tuple[Microservice, int]:
+        """Microservice and position by name.
+
+        Args:
+            ms_name (str): name of the microservice.
+
+        Raises:
+            RuntimeError: if no microservice has that name.
+
+        Returns:
+            Tuple[Microservice, int]: the microservice and its position.
+        """
+        index = self.index_of(ms_name)
+        return self._microservices[index], index
+
+
+def resolve(ms_pool: Union[MicroservicePool, List[Microservice]], ms_name: str) -> Tuple[Microservice, int]:
+    """Microservice and position by name, in a pool or a plain list.
+
+    A pool is looked up in constant time, a list is scanned and the last microservice with the name wins.
+
+    Args:
+        ms_pool (Union[MicroservicePool, List[Microservice]]): pool or list of microservices.
+        ms_name (str): name of the microservice.
+
+    Raises:
+        RuntimeError: if no microservice has that name.
+
+    Returns:
+        Tuple[Microservice, int]: the microservice and its position.
+    """
+    if isinstance(ms_pool, MicroservicePool):
+        return ms_pool.resolve(ms_name)
+    found = None
+    for index, ms in enumerate(ms_pool):
+        if ms.name == ms_name:
+            found = ms, index
+    if found is None:
+        raise RuntimeError(f"Microservice {ms_name} not found.")
+    return found
+
+
+def name_index(ms_pool: Union[MicroservicePool, List[Microservice]]) -> Dict[str, Tuple[Microservice, int]]:
+    """Microservice and position of every name, built once to resolve many jobs against a plain list.
+
+    Args:
+        ms_pool (Union[MicroservicePool, List[Microservice]]): pool or list of microservices.
+
+    Returns:
+        Dict[str, Tuple[Microservice, int]]: microservice and position by name, the last one of a duplicated name.
+    """
+    return {ms.name: (ms, index) for index, ms in enumerate(ms_pool)}
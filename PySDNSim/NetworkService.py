@@ -1,18 +1,26 @@
-from distutils.log import INFO
-from typing import List
-from uuid import uuid4
+from bisect import insort
+from typing import Dict, Iterator, List, Sequence, Tuple, Union
 
+from PySDNSim.Id import next_id
 from PySDNSim.Job import Job
 from PySDNSim.Microservice import Microservice
+from PySDNSim.MicroservicePool import MicroservicePool, name_index
 
 
 class NetworkService:
     """
     Represents a network service.
+
+    Jobs are indexed by schedule slot. Job schedules are relative to the network service, and
+    :meth:`offset_schedule` only moves the base :attr:`offset` of the whole service.
     """
+    __slots__ = ("_id", "_name", "_flows", "_slots", "_slot_keys", "_offset", "_jobs")
     _id:int
     _name: str
     _flows: int
+    _slots: Dict[int, List[Job]]
+    _slot_keys: List[int]
+    _offset: int
     _jobs: List[Job]
 
     def __init__(self, name: str, flows: int):
@@ -22,10 +30,13 @@ class NetworkService:
         :param name: name of the network service.
         :param flows: number of flows of the network service.
         """
-        self._id = uuid4()
+        self._id = next_id()
         self._name = name
         self._flows = flows
-        self._jobs = list()
+        self._slots = dict()
+        self._slot_keys = list()
+        self._offset = 0
+        self._jobs = None
         
     def __lt__(self, __o: object) -> bool:
         if self.id > __o.id:
@@ -59,30 +70,131 @@ class NetworkService:
         self._flows = flows
 
     @property
-    def jobs(self):
+    def jobs(self) -> List[Job]:
+        """Jobs in schedule order, jobs of the same slot in insertion order."""
+        if self._jobs is None:
+            self._jobs = [job for slot in self._slot_keys for job in self._slots[slot]]
         return self._jobs
 
-    def add_job(self, ms_name:str, length:int, schedule:int, ms_pool:List[Microservice]):
+    @property
+    def offset(self) -> int:
+        """Offset added to the schedule of every job."""
+        return self._offset
+
+    @property
+    def slots(self) -> List[int]:
+        """Occupied schedule slots, offset included, in increasing order."""
+        return [slot + self._offset for slot in self._slot_keys]
+
+    def jobs_at(self, slot: int) -> List[Job]:
+        """Jobs scheduled at a slot.
+
+        Args:
+            slot (int): schedule slot, offset included.
+
+        Returns:
+            List[Job]: the jobs, in insertion order.
+        """
+        return list(self._slots.get(slot - self._offset, ()))
+
+    def schedule_of(self, job: Job) -> int:
+        """Schedule of one of the jobs of this network service, offset included.
+
+        Args:
+            job (Job): the job.
+
+        Returns:
+            int: its schedule slot.
+        """
+        return job.schedule + self._offset
+
+    def iter_jobs(self) -> Iterator[Tuple[Job, int]]:
+        """Iterate over the jobs in schedule order.
+
+        Yields:
+            Tuple[Job, int]: every job and its schedule, offset included.
+        """
+        for slot in self._slot_keys:
+            for job in self._slots[slot]:
+                yield job, slot + self._offset
+
+    def _insert(self, job: Job):
+        bucket = self._slots.get(job.schedule)
+        if bucket is None:
+            bucket = self._slots[job.schedule] = list()
+            insort(self._slot_keys, job.schedule)
+        bucket.append(job)
+        self._jobs = None
+
+    def add_job(self, ms_name:str, length:int, schedule:int, ms_pool:Union[MicroservicePool, List[Microservice]]):
         """Add a job to network service.
         
         Args:
             ms_name (str): name of the microservice.
             length (int): length of the job.
-            schedule (int): schedule of the job.
-            ms_pool (List[Microservice]): available microservices.
+            schedule (int): schedule of the job, offset included.
+            ms_pool (Union[MicroservicePool, List[Microservice]]): available microservices.
+
+        Raises:
+            RuntimeError: if the microservice is not in the pool.
+        """
+        job = Job(ms_name=ms_name, length=length, schedule=schedule - self._offset, ms_pool=ms_pool)
+        self._insert(job)
+
+    def add_jobs(self, ms_names: Sequence[str], lengths: Sequence[int], schedules: Sequence[int],
+                 ms_pool: Union[MicroservicePool, List[Microservice]]):
+        """Add many jobs at once from parallel sequences, the microservices are resolved in one pass.
+
+        Args:
+            ms_names (Sequence[str]): name of the microservice of every job.
+            lengths (Sequence[int]): length of every job.
+            schedules (Sequence[int]): schedule of every job, offset included.
+            ms_pool (Union[MicroservicePool, List[Microservice]]): available microservices.
+
+        Raises:
+            RuntimeError: if the sequences have different lengths or a microservice is not in the pool.
         """
-        job = Job(ms_name=ms_name, length=length, schedule=schedule, ms_pool=ms_pool)
-        self.jobs.append(job)
-        self.jobs.sort(key=lambda x: x.schedule)
+        if len(ms_names) != len(lengths) or len(ms_names) != len(schedules):
+            raise RuntimeError("Lists of microservices, schedule amd length are miss matching!")
+        if isinstance(ms_pool, MicroservicePool):
+            lookup = ms_pool.resolve
+        else:
+            by_name = name_index(ms_pool)
+
+            def lookup(ms_name: str) -> Tuple[Microservice, int]:
+                try:
+                    return by_name[ms_name]
+                except KeyError:
+                    raise RuntimeError(f"Microservice {ms_name} not found.") from None
+
+        slots = dict()
+        for ms_name, length, schedule in zip(_as_list(ms_names), _as_list(lengths), _as_list(schedules)):
+            schedule = schedule - self._offset
+            ms, ms_id = lookup(ms_name)
+            slots.setdefault(schedule, list()).append(Job.resolved(ms, ms_id, length, schedule))
+        new_slots = list()
+        for schedule, jobs in slots.items():
+            bucket = self._slots.get(schedule)
+            if bucket is None:
+                self._slots[schedule] = jobs
+                new_slots.append(schedule)
+            else:
+                bucket.extend(jobs)
+        if new_slots:
+            self._slot_keys = sorted(self._slot_keys + new_slots)
+        self._jobs = None
 
     def offset_schedule(self, offset: int):
         """Offset all the job schedule. This allow you to predefine and reuse a network services with different start time.
 
+        Only the base offset of the network service changes, jobs are not touched and can be shared with copies.
+        ``Job.schedule`` therefore no longer includes the offset, as it did when jobs were rewritten; the slot a job
+        runs at is :meth:`schedule_of`, and :meth:`iter_jobs` yields every job with its slot.
+
         Args:
             offset (int): the offset.
         """
-        for job in self.jobs:
-            job._schedule = job.schedule + offset
+        self._offset = self._offset + offset
             
     def get_schedule(self)->List[List[int]]:
         """Return the schedule of the network service.
@@ -90,17 +202,19 @@ class NetworkService:
         Returns:
             List[List[int]]: list of schedule in microservice id.
         """
+        if not self._slot_keys:
+            return list()
         schedule = list()
-        self.jobs.sort(key=lambda x: x.schedule)
-        for i in range(self.jobs[-1].schedule+1):
-            time_slot = list()
-            for job in self.jobs:
-                if job.schedule == i:
-                    time_slot.append(job.ms_id)
-            schedule.append(time_slot)
+        for i in range(self._slot_keys[-1] + self._offset + 1):
+            schedule.append([job.ms_id for job in self._slots.get(i - self._offset, ())])
         return schedule
 
-def create_network_service(name:str, microservices:List[str], schdeule:List[int], schedule_length:List[int], ms_pool:List[Microservice], flows:int=1) -> NetworkService:
+
+def _as_list(values: Sequence) -> list:
+    # numpy arrays convert to python scalars in one call
+    return values.tolist() if hasattr(values, "tolist") else values
+
+def create_network_service(name:str, microservices:List[str], schdeule:List[int], schedule_length:List[int], ms_pool:Union[MicroservicePool, List[Microservice]], flows:int=1) -> NetworkService:
     """Create a network service.
 
     Args:
@@ -109,10 +223,10 @@ def create_network_service(name:str, microservices:List[str], schdeule:List[int]
         schdeule (List[int]): list of schedule  for each microservice.
         schedule_length (List[int]): list of length for each schedule.
         flows (int, optional): number of flows. Defaults to 1.
-        ms_pool (List[Microservice]): list of available microservices.
+        ms_pool (Union[MicroservicePool, List[Microservice]]): available microservices.
 
     Raises:
-        RuntimeError: If lists of microservices, schedule and schedule length are mismatching.
+        RuntimeError: If lists of microservices, schedule and schedule length are mismatching, or a microservice is not in the pool.
 
     Returns:
         NetworkService: the created network service.
@@ -122,6 +236,5 @@ def create_network_service(name:str, microservices:List[str], schdeule:List[int]
         raise RuntimeError("Lists of microservices, schedule amd length are miss matching!")
     else:
         ns = NetworkService(name=name,flows=flows)
-        for index, value  in enumerate(microservices):
-            ns.add_job(ms_name=value, length=schedule_length[index], schedule=schdeule[index], ms_pool=ms_pool)
-        return ns
\ No newline at end of file
+        ns.add_jobs(ms_names=microservices, lengths=schedule_length, schedules=schdeule, ms_pool=ms_pool)
+        return ns
@@ -0,0 +1,75 @@
+from typing import List
+
+import numpy as np
+
+
+class NetworkServiceBatch:
+    """
+    Arrivals of one network service template as job arrays, without a Python object per job.
+
+    Arrival ``i`` of the batch is the network service ``<name>_<start + i>``. All arrivals run the jobs of the
+    template on the same microservices, their lengths and schedules are given per arrival. Batches are written by
+    :func:`PySDNSim.ConfigWriter.write_columnar_config` like network services.
+    """
+    __slots__ = ("_name", "_start", "_flows", "_ms", "_lengths", "_schedules")
+    _name: str
+    _start: int
+    _flows: int
+    _ms: np.ndarray
+    _lengths: np.ndarray
+    _schedules: np.ndarray
+
+    def __init__(self, name: str, start: int, flows: int, ms: np.ndarray, lengths: np.ndarray, schedules: np.ndarray):
+        """Batch of arrivals.
+
+        Args:
+            name (str): name of the template, arrivals are named after it.
+            start (int): index of the first arrival of the batch.
+            flows (int): flows of every arrival.
+            ms (np.ndarray): ``(jobs,)`` microservice id of every job of the template.
+            lengths (np.ndarray): ``(arrivals, jobs)`` length of every job.
+            schedules (np.ndarray): ``(arrivals, jobs)`` schedule of every job.
+
+        Raises:
+            RuntimeError: if the shapes of the arrays mismatch.
+        """
+        if lengths.ndim != 2 or lengths.shape != schedules.shape or lengths.shape[1] != len(ms):
+            raise RuntimeError("Arrays of microservices, schedule and length are miss matching!")
+        self._name = name
+        self._start = start
+        self._flows = flows
+        self._ms = ms
+        self._lengths = lengths
+        self._schedules = schedules
+
+    def __len__(self) -> int:
+        return self._lengths.shape[0]
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def start(self):
+        return self._start
+
+    @property
+    def flows(self):
+        return self._flows
+
+    @property
+    def ms(self):
+        return self._ms
+
+    @property
+    def lengths(self):
+        return self._lengths
+
+    @property
+    def schedules(self):
+        return self._schedules
+
+    @property
+    def names(self) -> List[str]:
+        """Network service name of every arrival."""
+        return [f"{self._name}_{index}" for index in range(self._start, self._start + len(self))]
@@ -0,0 +1,386 @@
+import itertools
+import math
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Config import Config
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Host import Host
+from PySDNSim.Log import logger
+from PySDNSim.Microservice import Microservice
+from PySDNSim.Results import MS, read_table
+
+TELEMETRY = {"cpu": 0, "ram": 1, "bw": 2}
+
+_EPS = 1e-9
+
+
+class ReplayResult:
+    """
+    Replica timelines, power and overload of every auto scale policy replayed by :meth:`Replay.evaluate`.
+
+    Policy ``c`` scales microservice ``m`` above ``thresholds[c, m]`` up to ``max_replicas[c, m]`` replicas.
+    A microservice is overloaded at a sample when its recorded demand, busy and queued flows, exceeds the flows
+    its replicas can run at once.
+    """
+    _times: np.ndarray
+    _names: List[str]
+    _thresholds: np.ndarray
+    _max_replicas: np.ndarray
+    _replicas: np.ndarray
+    _power: np.ndarray
+    _overloaded: np.ndarray
+
+    def __init__(self, times: np.ndarray, names: List[str], thresholds: np.ndarray, max_replicas: np.ndarray,
+                 replicas: np.ndarray, power: np.ndarray, overloaded: np.ndarray):
+        self._times = times
+        self._names = names
+        self._thresholds = thresholds
+        self._max_replicas = max_replicas
+        self._replicas = replicas
+        self._power = power
+        self._overloaded = overloaded
+
+    def __len__(self) -> int:
+        return self._power.shape[0]
+
+    @property
+    def times(self):
+        """``(samples,)`` simulated time of every sample."""
+        return self._times
+
+    @property
+    def names(self):
+        """Names of the microservices."""
+        return self._names
+
+    @property
+    def thresholds(self):
+        """``(policies, microservices)`` auto scale thresholds."""
+        return self._thresholds
+
+    @property
+    def max_replicas(self):
+        """``(policies, microservices)`` replica limits."""
+        return self._max_replicas
+
+    @property
+    def replicas(self):
+        """``(policies, samples, microservices)`` replicas of every microservice."""
+        return self._replicas
+
+    @property
+    def power(self):
+        """``(policies, samples)`` estimated datacenter power."""
+        return self._power
+
+    @property
+    def overloaded(self):
+        """``(policies, samples, microservices)`` whether a microservice is overloaded."""
+        return self._overloaded
+
+    @property
+    def durations(self) -> np.ndarray:
+        """``(samples,)`` simulated time each sample stands for, until the next one, 0 for the last."""
+        return np.append(np.diff(self._times), 0.0)
+
+    @property
+    def energy(self) -> np.ndarray:
+        """``(policies,)`` estimated energy, power integrated over the samples."""
+        return self._power @ self.durations
+
+    @property
+    def overload_time(self) -> np.ndarray:
+        """``(policies, microservices)`` simulated time every microservice is overloaded."""
+        return np.einsum("ctm,t->cm", self._overloaded, self.durations)
+
+    @property
+    def replica_time(self) -> np.ndarray:
+        """``(policies, microservices)`` replica seconds of every microservice."""
+        return np.einsum("ctm,t->cm", self._replicas, self.durations)
+
+    def overload_periods(self, policy: int) -> List[Tuple[str, float, float]]:
+        """Overload periods of one policy.
+
+        Args:
+            policy (int): index of the policy.
+
+        Returns:
+            List[Tuple[str, float, float]]: microservice, start and end of every period, by start.
+        """
+        overloaded = self._overloaded[policy].astype(np.int8)
+        edges = np.diff(np.pad(overloaded, ((1, 1), (0, 0))), axis=0)
+        ends = np.append(self._times, self._times[-1] if len(self._times) else 0.0)
+        periods = list()
+        for index, name in enumerate(self._names):
+            starts = np.flatnonzero(edges[:, index] == 1)
+            stops = np.flatnonzero(edges[:, index] == -1)
+            periods.extend((name, float(ends[start]), float(ends[stop])) for start, stop in zip(starts, stops))
+        return sorted(periods, key=lambda period: period[1])
+
+    def ranking(self, max_overload: float = 0.0) -> np.ndarray:
+        """Policies by energy, among those whose microservices are overloaded at most ``max_overload`` in total.
+
+        Args:
+            max_overload (float, optional): largest acceptable overload time, summed over the microservices. Defaults to 0.0.
+
+        Returns:
+            np.ndarray: indices of the acceptable policies, least energy first.
+        """
+        acceptable = np.flatnonzero(self.overload_time.sum(axis=1) <= max_overload + _EPS)
+        return acceptable[np.argsort(self.energy[acceptable], kind="stable")]
+
+    def best(self, max_overload: float = 0.0) -> Union[int, None]:
+        """Policy using the least energy, among those overloaded at most ``max_overload``.
+
+        Args:
+            max_overload (float, optional): largest acceptable overload time, summed over the microservices. Defaults to 0.0.
+
+        Returns:
+            Union[int, None]: index of the policy, None if no policy is acceptable.
+        """
+        ranking = self.ranking(max_overload)
+        return int(ranking[0]) if len(ranking) else None
+
+    def summary(self, policy: int) -> Dict[str, float]:
+        """Scores of one policy.
+
+        Args:
+            policy (int): index of the policy.
+
+        Returns:
+            Dict[str, float]: energy, peak power, overload and replica time, and peak replicas.
+        """
+        return {
+            "energy": float(self.energy[policy]),
+            "peak_power": float(self._power[policy].max(initial=0.0)),
+            "overload_time": float(self.overload_time[policy].sum()),
+            "replica_time": float(self.replica_time[policy].sum()),
+            "peak_replicas": int(self._replicas[policy].sum(axis=1).max(initial=0)),
+        }
+
+
+class Replay:
+    """
+    Offline replay of auto scale policies against the per microservice samples of a finished run.
+
+    The samples are written to ``MS.csv`` by the in-process engine when tracing, see
+    :class:`PySDNSim.Engine.PythonBackend`. The recorded demand of every microservice, its busy and queued flows, is
+    taken as given and the auto scale of the engine is re-applied to it at every ``Config.interval``: a
+    microservice whose utilisation exceeds its threshold gains a replica, up to its replica limit. Power follows
+    the engine model, static power of every host plus dynamic power in proportion to the CPUs in use.
+
+    The replay is open loop: a policy changes how many flows run, not when flows arrive or how long they wait, so
+    it ranks policies, the best ones are worth a full run. Replicas are assumed to always fit on the hosts.
+    """
+    _interval: float
+    _host: Host
+    _names: List[str]
+    _times: np.ndarray
+    _demand: np.ndarray
+    _recorded: np.ndarray
+    _capacity: np.ndarray
+    _idle: np.ndarray
+    _ratio: np.ndarray
+    _slots: np.ndarray
+    _replicas: np.ndarray
+    _max_replicas: np.ndarray
+    _thresholds: Dict[str, np.ndarray]
+    _debug: bool
+
+    def __init__(self, config: Config, host: Host, microservices: List[Microservice], output_path: str,
+                 debug: bool = False):
+        """Replay of a traced run.
+
+        Args:
+            config (Config): simulation config of the run.
+            host (Host): host of the run.
+            microservices (List[Microservice]): microservices of the run.
+            output_path (str): output directory of the run.
+            debug (bool, optional): log every replay. Defaults to False.
+
+        Raises:
+            RuntimeError: if the run was not traced or its samples do not match the microservices.
+        """
+        try:
+            trace = read_table(output_path, MS)
+        except FileNotFoundError:
+            raise RuntimeError(f"No {MS} in {output_path}, run the experiment with tracing on.")
+        self._interval = config.interval
+        self._host = host
+        self._names = [ms.name for ms in microservices]
+        self._debug = debug
+
+        count = len(microservices)
+        if count == 0 or len(trace) % count:
+            raise RuntimeError(f"Samples in {output_path} do not match the microservices.")
+        rows = trace.reshape(-1, count)
+        if np.any(rows["name"] != np.array(self._names)):
+            raise RuntimeError(f"Samples in {output_path} do not match the microservices.")
+        self._times = rows["time"][:, 0]
+        self._demand = rows["busy"] + rows["queued"]
+        self._recorded = rows["vms"].astype(np.int64)
+
+        self._capacity = np.array([[ms.cpus * 100, ms.ram, ms.bw] for ms in microservices], dtype=np.float64)
+        self._idle = np.array([[ms.idle_cpu, ms.idle_ram, ms.idle_bw] for ms in microservices], dtype=np.float64)
+        self._ratio = np.array([[ms.cpu_ratio, ms.ram_ratio, ms.bw_ratio] for ms in microservices], dtype=np.float64)
+        slots = np.floor((self._capacity - self._idle) / np.maximum(self._ratio, _EPS) + _EPS).min(axis=1)
+        self._slots = np.maximum(slots, 0)
+        self._replicas = np.array([ms.replicas for ms in microservices], dtype=np.int64)
+        self._max_replicas = np.array([ms.max_replicas for ms in microservices], dtype=np.int64)
+        self._thresholds = {
+            telemetry: np.array(
+                [min((rule.threshold for rule in ms.auto_scale if rule.telemetry == telemetry), default=np.inf)
+                 for ms in microservices],
+                dtype=np.float64,
+            )
+            for telemetry in TELEMETRY
+        }
+
+    @classmethod
+    def from_experiment(cls, experiment: Experiment, output_path: str, debug: bool = False) -> "Replay":
+        """Replay of a traced run of an experiment.
+
+        Args:
+            experiment (Experiment): the experiment.
+            output_path (str): output path given to the backend, the results are in its experiment directory.
+            debug (bool, optional): log every replay. Defaults to False.
+
+        Returns:
+            Replay: replay of the run.
+        """
+        return cls(experiment.config, experiment.host, experiment.microservices,
+                   f"{output_path}/{experiment.name}", debug)
+
+    @property
+    def names(self):
+        return self._names
+
+    @property
+    def times(self):
+        return self._times
+
+    @property
+    def demand(self):
+        """``(samples, microservices)`` recorded busy and queued flows."""
+        return self._demand
+
+    @property
+    def recorded(self):
+        """``(samples, microservices)`` recorded replicas."""
+        return self._recorded
+
+    def thresholds(self, telemetry: str = "cpu") -> np.ndarray:
+        """Auto scale thresholds of the run.
+
+        Args:
+            telemetry (str, optional): telemetry of the thresholds. Defaults to "cpu".
+
+        Returns:
+            np.ndarray: ``(microservices,)`` lowest threshold on the telemetry, inf without one.
+        """
+        return self._thresholds[_telemetry(telemetry)].copy()
+
+    @staticmethod
+    def grid(thresholds: Sequence[float], max_replicas: Sequence[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Every combination of a threshold and a replica limit, applied to all microservices.
+
+        Args:
+            thresholds (Sequence[float]): thresholds.
+            max_replicas (Sequence[int]): replica limits.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: ``(policies,)`` thresholds and replica limits, for :meth:`evaluate`.
+        """
+        combinations = np.array(list(itertools.product(thresholds, max_replicas)), dtype=np.float64).reshape(-1, 2)
+        return combinations[:, 0], combinations[:, 1].astype(np.int64)
+
+    def evaluate(
+        self,
+        thresholds: Union[float, Sequence, np.ndarray],
+        max_replicas: Union[int, Sequence, np.ndarray] = None,
+        telemetry: str = "cpu",
+        microservices: Sequence[str] = None,
+    ) -> ReplayResult:
+        """Replay auto scale policies.
+
+        Thresholds and replica limits are a scalar for every microservice of a single policy, a ``(policies,)``
+        array for every microservice of each policy, or a ``(policies, microservices)`` array.
+
+        Args:
+            thresholds (Union[float, Sequence, np.ndarray]): utilisation above which a replica is added.
+            max_replicas (Union[int, Sequence, np.ndarray], optional): replica limits. Defaults to the ones of the run.
+            telemetry (str, optional): utilisation compared with the thresholds, "cpu", "ram" or "bw". Defaults to "cpu".
+            microservices (Sequence[str], optional): microservices the policies apply to, the others keep the
+                recorded replicas. Defaults to all.
+
+        Raises:
+            RuntimeError: if the telemetry or a microservice is unknown, or the policies do not broadcast.
+
+        Returns:
+            ReplayResult: the replayed policies.
+        """
+        column = TELEMETRY[_telemetry(telemetry)]
+        count = len(self._names)
+        thresholds = _policies(thresholds, count, np.float64)
+        limits = self._max_replicas[None, :] if max_replicas is None else _policies(max_replicas, count, np.int64)
+        try:
+            thresholds, limits = np.broadcast_arrays(thresholds, limits)
+        except ValueError:
+            raise RuntimeError("Thresholds and replica limits do not broadcast to the same policies.")
+        thresholds, limits = thresholds.copy(), limits.copy()
+        replayed = np.ones(count, dtype=bool)
+        if microservices is not None:
+            unknown = set(microservices) - set(self._names)
+            if unknown:
+                raise RuntimeError(f"Unknown microservices {sorted(unknown)}.")
+            replayed = np.isin(self._names, list(microservices))
+
+        policies, samples = thresholds.shape[0], len(self._times)
+        capacity = self._capacity[:, column]
+        idle = self._idle[:, column]
+        ratio = self._ratio[:, column]
+        replicas = np.empty((policies, samples, count), dtype=np.int64)
+        current = np.broadcast_to(np.minimum(self._replicas, limits), (policies, count)).copy()
+        # the engine scales at every interval, with the demand of the sample taken right after
+        scales = self._interval * np.arange(1, math.floor(self._times[-1] / self._interval + _EPS) + 1) \
+            if samples else np.zeros(0)
+        last = np.searchsorted(scales, self._times, side="right")
+        scaled = 0
+        for sample in range(samples):
+            demand = self._demand[sample]
+            for _ in range(scaled, last[sample]):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    utilisation = (idle * current + ratio * demand) / (capacity * current)
+                utilisation = np.where(current > 0, utilisation, np.where(demand > 0, np.inf, 0.0))
+                current += (utilisation > thresholds) & (current < limits)
+            scaled = last[sample]
+            replicas[:, sample] = np.where(replayed, current, self._recorded[sample])
+
+        running = np.minimum(self._demand, replicas * self._slots)
+        overloaded = self._demand > replicas * self._slots
+        cpus = (replicas * self._idle[:, 0] + running * self._ratio[:, 0]).sum(axis=2) / 100
+        hosts = self._host.replicas
+        dynamic = self._host.max_power - self._host.static_power
+        power = hosts * self._host.static_power + dynamic * np.minimum(cpus / self._host.cpus, hosts)
+        if self._debug:
+            logger.info(f"Replayed {policies} auto scale policies over {samples} samples.")
+        return ReplayResult(self._times, list(self._names), thresholds, limits, replicas, power, overloaded)
+
+
+def _telemetry(telemetry: str) -> str:
+    if telemetry not in TELEMETRY:
+        raise RuntimeError(f"Unknown telemetry {telemetry}, expected one of {list(TELEMETRY)}.")
+    return telemetry
+
+
+def _policies(values: Union[float, Sequence, np.ndarray], count: int, dtype: type) -> np.ndarray:
+    array = np.asarray(values, dtype=dtype)
+    if array.ndim == 0:
+        return array.reshape(1, 1)
+    if array.ndim == 1:
+        return array.reshape(-1, 1)
+    if array.ndim == 2 and array.shape[1] in (1, count):
+        return array
+    raise RuntimeError(f"Policies must be a scalar, a (policies,) or a (policies, {count}) array.")
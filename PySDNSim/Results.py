@@ -0,0 +1,217 @@
+import csv
+import os
+import re
+from collections import namedtuple
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+import numpy as np
+
+NSUMMARY = "NSummary.csv"
+DC = "DC.csv"
+# per microservice samples, only written by the in-process engine when tracing
+MS = "MS.csv"
+TABLES = (NSUMMARY, DC)
+
+# dtypes of the columns that are not plain floats, text columns ("U") are sized to the longest value read
+COLUMN_DTYPES: Dict[str, str] = {
+    "name": "U",
+    "complete": "?",
+}
+
+
+def _parse_bool(value: str) -> bool:
+    return value.strip().lower() in ("true", "1", "yes")
+
+
+def column_dtype(column: str, width: int = 1) -> np.dtype:
+    """Dtype of a result column.
+
+    Args:
+        column (str): column name from the csv header.
+        width (int, optional): characters of a text column, the length of its longest value. Defaults to 1.
+
+    Returns:
+        np.dtype: dtype of the column, float64 unless listed in ``COLUMN_DTYPES``.
+    """
+    dtype = COLUMN_DTYPES.get(column, "f8")
+    return np.dtype(f"U{max(width, 1)}" if dtype == "U" else dtype)
+
+
+def table_dtype(header: List[str], widths: Dict[str, int] = None) -> np.dtype:
+    """Structured dtype of a result table.
+
+    Args:
+        header (List[str]): csv header.
+        widths (Dict[str, int], optional): characters of every text column. Defaults to 1 for all.
+
+    Returns:
+        np.dtype: one field per column.
+    """
+    widths = widths or dict()
+    return np.dtype([(column, column_dtype(column, widths.get(column, 1))) for column in header])
+
+
+def text_widths(header: List[str], rows: List[Tuple]) -> Dict[str, int]:
+    """Length of the longest value of every text column.
+
+    Args:
+        header (List[str]): csv header.
+        rows (List[Tuple]): rows, as read from the csv.
+
+    Returns:
+        Dict[str, int]: characters of every text column.
+    """
+    return {
+        column: max((len(row[index]) for row in rows if index < len(row)), default=1)
+        for index, column in enumerate(header)
+        if column_dtype(column).kind == "U"
+    }
+
+
+def _parsers(header: List[str]) -> List[Callable[[str], Any]]:
+    parsers = list()
+    for column in header:
+        kind = column_dtype(column).kind
+        if kind == "b":
+            parsers.append(_parse_bool)
+        elif kind == "U":
+            parsers.append(str)
+        else:
+            parsers.append(float)
+    return parsers
+
+
+_record_types: Dict[Tuple[str, ...], type] = dict()
+
+
+def _record_type(header: List[str]) -> type:
+    key = tuple(header)
+    if key not in _record_types:
+        fields = [re.sub(r"\W", "_", column) or f"column_{index}" for index, column in enumerate(header)]
+        _record_types[key] = namedtuple("Record", fields, rename=True)
+    return _record_types[key]
+
+
+def _natural_key(name: str) -> List[Any]:
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def _table_path(path: str, table: str) -> str:
+    return path if os.path.isfile(path) else os.path.join(path, table)
+
+
+def iter_records(path: str, table: str = NSUMMARY) -> Iterator[NamedTuple]:
+    """Iterate over the rows of a result table as typed records.
+
+    Args:
+        path (str): result csv file, or the output directory of an experiment.
+        table (str, optional): table to read when a directory is given. Defaults to ``NSummary.csv``.
+
+    Yields:
+        NamedTuple: one record per row, fields named after the header.
+    """
+    with open(_table_path(path, table), newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        record = _record_type(header)
+        parsers = _parsers(header)
+        for row in reader:
+            if row:
+                yield record(*(parse(value) for parse, value in zip(parsers, row)))
+
+
+def iter_chunks(path: str, table: str = NSUMMARY, chunk_size: int = 65536) -> Iterator[np.ndarray]:
+    """Iterate over a result table in fixed-size structured arrays.
+
+    Only one chunk is held in memory at a time. Text columns are sized to the longest value of each chunk.
+
+    Args:
+        path (str): result csv file, or the output directory of an experiment.
+        table (str, optional): table to read when a directory is given. Defaults to ``NSummary.csv``.
+        chunk_size (int, optional): rows per chunk, the last one may be shorter. Defaults to 65536.
+
+    Yields:
+        np.ndarray: structured array with one field per column, see :func:`table_dtype`.
+    """
+    with open(_table_path(path, table), newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        parsers = _parsers(header)
+        rows = list()
+        for row in reader:
+            if not row:
+                continue
+            rows.append(tuple(parse(value) for parse, value in zip(parsers, row)))
+            if len(rows) == chunk_size:
+                yield np.array(rows, dtype=table_dtype(header, text_widths(header, rows)))
+                rows = list()
+        if rows:
+            yield np.array(rows, dtype=table_dtype(header, text_widths(header, rows)))
+
+
+def read_table(path: str, table: str = NSUMMARY) -> np.ndarray:
+    """Read a whole result table.
+
+    Args:
+        path (str): result csv file, or the output directory of an experiment.
+        table (str, optional): table to read when a directory is given. Defaults to ``NSummary.csv``.
+
+    Returns:
+        np.ndarray: structured array with one field per column.
+    """
+    chunks = list(iter_chunks(path, table))
+    if not chunks:
+        with open(_table_path(path, table), newline="") as file:
+            header = next(csv.reader(file), [])
+        return np.zeros(0, dtype=table_dtype(header))
+    names = list(chunks[0].dtype.names)
+    widths = {
+        column: max(chunk.dtype[column].itemsize // 4 for chunk in chunks)
+        for column in names
+        if chunks[0].dtype[column].kind == "U"
+    }
+    dtype = table_dtype(names, widths)
+    return np.concatenate([chunk.astype(dtype, copy=False) for chunk in chunks])
+
+
+def iter_experiments(root: str) -> Iterator[Tuple[str, str]]:
+    """Walk a sweep tree lazily and find the output directories of experiments.
+
+    Args:
+        root (str): output path given to the backend, or any directory above it.
+
+    Yields:
+        Tuple[str, str]: name and directory of every experiment, in natural sort order.
+    """
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: _natural_key(entry.name), reverse=True)
+        except OSError:
+            continue
+        names = set(entry.name for entry in entries if entry.is_file())
+        if any(table in names for table in TABLES):
+            yield os.path.basename(os.path.normpath(directory)), directory
+        stack.extend(entry.path for entry in entries if entry.is_dir())
+
+
+def iter_sweep_chunks(root: str, table: str = NSUMMARY, chunk_size: int = 65536) -> Iterator[Tuple[str, np.ndarray]]:
+    """Iterate over one table of every experiment of a sweep.
+
+    Args:
+        root (str): output path given to the backend, or any directory above it.
+        table (str, optional): table to read. Defaults to ``NSummary.csv``.
+        chunk_size (int, optional): rows per chunk. Defaults to 65536.
+
+    Yields:
+        Tuple[str, np.ndarray]: experiment name and a chunk of its table.
+    """
+    for name, directory in iter_experiments(root):
+        if os.path.isfile(os.path.join(directory, table)):
+            for chunk in iter_chunks(directory, table, chunk_size):
+                yield name, chunk
@@ -0,0 +1,171 @@
+from typing import Any, Dict, Union
+
+
+class RunResult:
+    """
+    Outcome of a single backend run.
+    """
+    _name: str
+    _config_file: str
+    _output_path: str
+    _return_code: Union[int, None]
+    _wall_time: float
+    _cached: bool
+    _timed_out: bool
+    _build_time: Union[float, None]
+    _write_time: Union[float, None]
+    _startup_time: Union[float, None]
+    _output_bytes: Union[int, None]
+    _peak_rss_mb: Union[float, None]
+    _stop_reason: Union[str, None]
+    _reject_reason: Union[str, None]
+    _config_digest: Union[str, None]
+
+    def __init__(self, name: str, config_file: str, output_path: str, return_code: Union[int, None], wall_time: float,
+                 cached: bool = False, timed_out: bool = False, build_time: float = None, write_time: float = None,
+                 startup_time: float = None, output_bytes: int = None, peak_rss_mb: float = None,
+                 stop_reason: str = None, reject_reason: str = None, config_digest: str = None):
+        """Outcome of a single backend run.
+
+        Args:
+            name (str): name of the experiment.
+            config_file (str): path of the generated configuration file.
+            output_path (str): directory the backend wrote its results to.
+            return_code (Union[int, None]): exit code of the backend process, None if it was never started, e.g. for a
+                :attr:`rejected` experiment.
+            wall_time (float): wall clock time of the run in seconds.
+            cached (bool, optional): whether the results were reused from the result cache. Defaults to False.
+            timed_out (bool, optional): whether the backend process was killed after a timeout. Defaults to False.
+            build_time (float, optional): seconds spent building the configuration. Defaults to None.
+            write_time (float, optional): seconds spent serialising the configuration file. Defaults to None.
+            startup_time (float, optional): seconds from spawning the backend to its first output. Defaults to None.
+            output_bytes (int, optional): size of the output directory. Defaults to None.
+            peak_rss_mb (float, optional): peak resident memory of the backend process in MiB. Defaults to None.
+            stop_reason (str, optional): why the run was stopped before the end of the simulation, see
+                :class:`PySDNSim.SteadyState.SteadyStateWatcher`. Defaults to None.
+            reject_reason (str, optional): why the experiment was not run at all, see
+                :class:`PySDNSim.Feasibility.FeasibilityCheck`. Defaults to None.
+            config_digest (str, optional): digest of the configuration the run was generated from, see
+                :func:`PySDNSim.Cache.config_digest`. Defaults to None.
+
+        Metrics that were not measured are None.
+        """
+        self._name = name
+        self._config_file = config_file
+        self._output_path = output_path
+        self._return_code = return_code
+        self._wall_time = wall_time
+        self._cached = cached
+        self._timed_out = timed_out
+        self._build_time = build_time
+        self._write_time = write_time
+        self._startup_time = startup_time
+        self._output_bytes = output_bytes
+        self._peak_rss_mb = peak_rss_mb
+        self._stop_reason = stop_reason
+        self._reject_reason = reject_reason
+        self._config_digest = config_digest
+
+    def __repr__(self) -> str:
+        return f"RunResult(name={self.name!r}, return_code={self.return_code}, wall_time={self.wall_time:.3f})"
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def config_file(self):
+        return self._config_file
+
+    @property
+    def output_path(self):
+        return self._output_path
+
+    @property
+    def return_code(self):
+        return self._return_code
+
+    @property
+    def wall_time(self):
+        return self._wall_time
+
+    @property
+    def cached(self):
+        return self._cached
+
+    @property
+    def timed_out(self):
+        return self._timed_out
+
+    @property
+    def build_time(self):
+        return self._build_time
+
+    @property
+    def write_time(self):
+        return self._write_time
+
+    @property
+    def startup_time(self):
+        return self._startup_time
+
+    @property
+    def output_bytes(self):
+        return self._output_bytes
+
+    @property
+    def peak_rss_mb(self):
+        return self._peak_rss_mb
+
+    @property
+    def stop_reason(self):
+        return self._stop_reason
+
+    @property
+    def stopped_early(self):
+        return self._stop_reason is not None
+
+    @property
+    def reject_reason(self):
+        return self._reject_reason
+
+    @property
+    def rejected(self):
+        return self._reject_reason is not None
+
+    @property
+    def config_digest(self):
+        """Digest of the generated configuration, None if it was not recorded."""
+        return self._config_digest
+
+    @property
+    def success(self):
+        """Whether the backend completed, or was stopped early and kept its results."""
+        return not self.rejected and (self._return_code == 0 or self.stopped_early)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Structured record of the run, e.g. for :mod:`PySDNSim.Metrics`."""
+        return {
+            "name": self.name,
+            "config_file": self.config_file,
+            "output_path": self.output_path,
+            "return_code": self.return_code,
+            "success": self.success,
+            "cached": self.cached,
+            "timed_out": self.timed_out,
+            "build_time": self.build_time,
+            "write_time": self.write_time,
+            "startup_time": self.startup_time,
+            "wall_time": self.wall_time,
+            "output_bytes": self.output_bytes,
+            "peak_rss_mb": self.peak_rss_mb,
+            "stop_reason": self.stop_reason,
+            "reject_reason": self.reject_reason,
+            "config_digest": self.config_digest,
+        }
+
+    def _record(self, **metrics: Any):
+        # filled in by the backend as the phases of a run complete
+        for metric, value in metrics.items():
+            setattr(self, "_" + metric, value)
+
@@ -0,0 +1,362 @@
+import json
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Log import logger
+from PySDNSim.RunResult import RunResult
+
+# features of an experiment the memory of a backend run is modelled on
+FEATURES = ("cloudlets", "hosts", "vms", "samples")
+# prior MiB per unit of every feature, refined from measured runs
+PRIOR_MB = np.array([0.004, 0.5, 0.25, 0.002])
+# resident memory of an idle JVM on top of its heap
+JVM_OVERHEAD_MB = 160.0
+MIN_HEAP_MB = 256
+HEAP_STEP_MB = 64
+
+
+def physical_memory_mb() -> float:
+    """Physical memory of the machine in MiB, 8 GiB if it can not be read."""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 2 ** 20
+    except (AttributeError, ValueError, OSError):
+        return 8192.0
+
+
+def experiment_features(experiment: Experiment) -> np.ndarray:
+    """Size of an experiment as seen by the backend.
+
+    Args:
+        experiment (Experiment): the experiment.
+
+    Returns:
+        np.ndarray: one value per entry of ``FEATURES``: jobs times flows, host replicas, the most VMs auto
+        scaling can create, and datacenter samples over the scheduled horizon.
+    """
+    cloudlets = 0
+    last_slot = 0
+    for ns in experiment.network_services:
+        cloudlets += len(ns.jobs) * ns.flows
+        slots = ns.slots
+        if slots:
+            last_slot = max(last_slot, slots[-1])
+    vms = sum(max(ms.replicas, ms.max_replicas) for ms in experiment.microservices)
+    config = experiment.config
+    horizon = (last_slot + 1) * config.interval
+    samples = horizon / config.sample_interval if config.sample_interval > 0 else 0.0
+    return np.array([cloudlets, experiment.host.replicas, vms, samples], dtype=np.float64)
+
+
+class Footprint:
+    """
+    Resources reserved for one backend run.
+    """
+    __slots__ = ("_heap_mb", "_cpus")
+    _heap_mb: int
+    _cpus: float
+
+    def __init__(self, heap_mb: int, cpus: float):
+        self._heap_mb = heap_mb
+        self._cpus = cpus
+
+    def __repr__(self) -> str:
+        return f"Footprint(heap_mb={self.heap_mb}, memory_mb={self.memory_mb:.0f}, cpus={self.cpus})"
+
+    @property
+    def heap_mb(self):
+        """Maximum JVM heap, passed as ``-Xmx``."""
+        return self._heap_mb
+
+    @property
+    def memory_mb(self):
+        """Memory reserved against the budget, heap plus JVM overhead."""
+        return self._heap_mb + JVM_OVERHEAD_MB
+
+    @property
+    def cpus(self):
+        return self._cpus
+
+
+class AdmissionScheduler:
+    """
+    Runs experiments concurrently within machine-level CPU and memory budgets.
+
+    The peak memory of every run is predicted from the size of its experiment with a linear model, which starts
+    from ``PRIOR_MB`` and is refitted, with an intercept for the memory every run needs, on the peak RSS measured
+    for every completed run. The prediction sets the JVM heap of the run and is reserved against the memory budget
+    until the run exits. The largest pending run that fits is admitted first, so big runs start early and small
+    ones fill the remaining room.
+    """
+    _backend: Backend
+    _memory_budget_mb: float
+    _cpu_budget: float
+    _cpus_per_run: float
+    _headroom: float
+    _retries: int
+    _history: Union[str, None]
+    _debug: bool
+    _coefficients: np.ndarray
+    _intercept: float
+    _observations: List[Tuple[List[float], float]]
+    _condition: threading.Condition
+    _used_mb: float
+    _used_cpus: float
+    _running: int
+
+    def __init__(
+        self,
+        backend: Backend,
+        memory_budget_mb: float = None,
+        cpu_budget: float = None,
+        cpus_per_run: float = 1.0,
+        headroom: float = 1.25,
+        retries: int = 1,
+        history: str = None,
+        debug: bool = False,
+    ):
+        """Admission scheduler.
+
+        Args:
+            backend (Backend): backend the experiments are run with.
+            memory_budget_mb (float, optional): memory all runs may use together, in MiB. Defaults to 80% of the physical memory.
+            cpu_budget (float, optional): CPUs all runs may use together. Defaults to the number of CPUs.
+            cpus_per_run (float, optional): CPUs reserved for every run. Defaults to 1.0.
+            headroom (float, optional): factor applied to the predicted memory. Defaults to 1.25.
+            retries (int, optional): reruns with a doubled heap, capped at the memory budget, of a failed run that
+                used up its heap. Defaults to 1.
+            history (str, optional): JSON file keeping the measured runs across sessions. Defaults to None.
+            debug (bool, optional): log every admission. Defaults to False.
+        """
+        self._backend = backend
+        self._memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else 0.8 * physical_memory_mb()
+        self._cpu_budget = cpu_budget if cpu_budget is not None else float(os.cpu_count() or 1)
+        if cpus_per_run > self._cpu_budget:
+            raise RuntimeError("A run needs more CPUs than the CPU budget.")
+        self._cpus_per_run = cpus_per_run
+        self._headroom = headroom
+        self._retries = retries
+        self._history = history
+        self._debug = debug
+        self._coefficients = PRIOR_MB.copy()
+        self._intercept = 0.0
+        self._observations = list()
+        self._condition = threading.Condition()
+        self._used_mb = 0.0
+        self._used_cpus = 0.0
+        self._running = 0
+        if history is not None and os.path.isfile(history):
+            with open(history) as file:
+                self._observations = [(list(features), float(rss)) for features, rss in json.load(file)]
+            self._fit()
+
+    @property
+    def backend(self):
+        return self._backend
+
+    @property
+    def memory_budget_mb(self):
+        return self._memory_budget_mb
+
+    @property
+    def cpu_budget(self):
+        return self._cpu_budget
+
+    @property
+    def coefficients(self) -> np.ndarray:
+        """MiB of peak memory per unit of every entry of ``FEATURES``."""
+        return self._coefficients.copy()
+
+    @property
+    def intercept(self) -> float:
+        """MiB of peak memory of every run on top of the JVM overhead, whatever its size."""
+        return self._intercept
+
+    @property
+    def observations(self) -> int:
+        """Number of measured runs the model is fitted on."""
+        return len(self._observations)
+
+    @property
+    def debug(self):
+        return self._debug
+
+    def predict_mb(self, features: np.ndarray) -> np.ndarray:
+        """Predicted peak resident memory of runs.
+
+        Args:
+            features (np.ndarray): ``(..., len(FEATURES))`` sizes, see :func:`experiment_features`.
+
+        Returns:
+            np.ndarray: peak RSS in MiB, JVM overhead included and headroom excluded.
+        """
+        return JVM_OVERHEAD_MB + self._intercept + np.asarray(features, dtype=np.float64) @ self._coefficients
+
+    def estimate(self, experiment: Experiment) -> Footprint:
+        """Resources to reserve for an experiment.
+
+        Args:
+            experiment (Experiment): the experiment.
+
+        Returns:
+            Footprint: heap size and CPUs of its run.
+        """
+        return self._footprint(experiment_features(experiment))
+
+    def observe(self, features: np.ndarray, peak_rss_mb: float):
+        """Refine the memory model with a measured run.
+
+        Args:
+            features (np.ndarray): size of the experiment, see :func:`experiment_features`.
+            peak_rss_mb (float): peak resident memory of its backend process in MiB.
+        """
+        with self._condition:
+            self._observations.append(([float(value) for value in features], float(peak_rss_mb)))
+            self._fit()
+            if self._history is not None:
+                with open(self._history, "w") as file:
+                    json.dump(self._observations, file)
+
+    def run_experiments(self, experiments: List[Experiment], output_path: Union[str, List[str]]) -> List[RunResult]:
+        """Run several experiments, admitting each once its predicted footprint fits in the budgets.
+
+        A run predicted to exceed the memory budget on its own is started alone.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing, experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[RunResult]: results in the order the experiments were given.
+        """
+        if self.backend.ready is not True:
+            raise RuntimeError("Simulation backend executable file is missing.")
+        experiments = list(experiments)
+        output_paths = Backend.pair_output_paths(experiments, output_path)
+        features = np.array([experiment_features(experiment) for experiment in experiments]).reshape(-1, len(FEATURES))
+        pending = list(range(len(experiments)))
+        results: List[Union[RunResult, None]] = [None] * len(experiments)
+        max_workers = max(1, int(self.cpu_budget // self._cpus_per_run))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = list()
+            while pending:
+                index, footprint = self._admit(pending, features)
+                futures.append(executor.submit(
+                    self._run, experiments[index], output_paths[index], features[index], footprint, results, index
+                ))
+            for future in futures:
+                future.result()
+        return results
+
+    def _footprint(self, features: np.ndarray) -> Footprint:
+        rss = float(self.predict_mb(features)) * self._headroom
+        heap = max(MIN_HEAP_MB, rss - JVM_OVERHEAD_MB)
+        return Footprint(int(math.ceil(heap / HEAP_STEP_MB)) * HEAP_STEP_MB, self._cpus_per_run)
+
+    def _max_heap_mb(self) -> int:
+        """Largest heap whose run still fits in the memory budget on its own."""
+        return int((self._memory_budget_mb - JVM_OVERHEAD_MB) // HEAP_STEP_MB) * HEAP_STEP_MB
+
+    def _fits(self, footprint: Footprint) -> bool:
+        return self._used_mb + footprint.memory_mb <= self._memory_budget_mb and \
+            self._used_cpus + footprint.cpus <= self._cpu_budget + 1e-9
+
+    def _admit(self, pending: List[int], features: np.ndarray) -> Tuple[int, Footprint]:
+        with self._condition:
+            while True:
+                # predictions change as runs complete, so the order is recomputed at every admission
+                predicted = self.predict_mb(features[pending])
+                for position in np.argsort(-predicted, kind="stable"):
+                    footprint = self._footprint(features[pending[position]])
+                    if self._fits(footprint) or self._running == 0:
+                        if not self._fits(footprint):
+                            logger.warning(f"Run of {footprint.memory_mb:.0f} MiB exceeds the memory budget, "
+                                           f"starting it alone.")
+                        index = pending.pop(int(position))
+                        self._reserve(footprint, 1)
+                        return index, footprint
+                self._condition.wait()
+
+    def _reserve(self, footprint: Footprint, sign: int):
+        self._used_mb += sign * footprint.memory_mb
+        self._used_cpus += sign * footprint.cpus
+        self._running += sign
+
+    def _run(self, experiment: Experiment, output_path: str, features: np.ndarray, footprint: Footprint,
+             results: List[Union[RunResult, None]], index: int):
+        try:
+            config_file, experiment_output, key, cached, recorded = self.backend._prepare(experiment, output_path)
+            if cached is not None:
+                results[index] = cached
+                return
+            for attempt in range(self._retries + 1):
+                if self.debug:
+                    logger.info(f"Admitted experiment\t {experiment.name} with {footprint}.")
+                result = self.backend._spawn(experiment.name, config_file, experiment_output, footprint.heap_mb)
+                if result.peak_rss_mb is None:
+                    break
+                if result.success:
+                    self.observe(features, result.peak_rss_mb)
+                    break
+                if result.peak_rss_mb < 0.9 * footprint.memory_mb or attempt == self._retries:
+                    break
+                # the run most likely ran out of heap, retry with twice the heap as far as the budget allows
+                heap_mb = min(footprint.heap_mb * 2, self._max_heap_mb())
+                if heap_mb <= footprint.heap_mb:
+                    logger.error(f"Experiment\t {experiment.name} ran out of {footprint.heap_mb} MiB of heap, "
+                                 f"a larger heap exceeds the memory budget.")
+                    break
+                grown = Footprint(heap_mb, footprint.cpus)
+                with self._condition:
+                    self._reserve(footprint, -1)
+                    # wait for room like an admission, a run alone always fits as the heap is capped
+                    while not self._fits(grown) and self._running > 0:
+                        self._condition.wait()
+                    self._reserve(grown, 1)
+                footprint = grown
+                logger.warning(f"Retrying experiment\t {experiment.name} with {footprint}.")
+            results[index] = self.backend._complete(key, result, recorded)
+        finally:
+            with self._condition:
+                self._reserve(footprint, -1)
+                self._condition.notify_all()
+
+    def _fit(self):
+        if not self._observations:
+            return
+        features = np.array([features for features, _ in self._observations], dtype=np.float64)
+        excess = np.maximum(np.array([rss for _, rss in self._observations]) - JVM_OVERHEAD_MB, 0.0)
+        if len(self._observations) > len(FEATURES) + 1:
+            # the intercept takes the memory every run needs, so it is not spread over the coefficients. A feature
+            # that never varied can not be told apart from the intercept and one fitted negative can not free memory,
+            # those keep their prior and the others are refitted around them.
+            fixed = np.ptp(features, axis=0) == 0
+            while True:
+                free = np.flatnonzero(~fixed)
+                design = np.hstack([features[:, free], np.ones((len(features), 1))])
+                target = excess - features[:, fixed] @ PRIOR_MB[fixed]
+                solution, *_ = np.linalg.lstsq(design, target, rcond=None)
+                negative = solution[:-1] < 0
+                if not np.any(negative):
+                    break
+                fixed[free[negative]] = True
+            coefficients = PRIOR_MB.copy()
+            coefficients[free] = solution[:-1]
+            self._coefficients = coefficients
+            self._intercept = float(solution[-1])
+            return
+        # too few runs for a fit, scale the prior by the typical ratio of measured to predicted memory
+        prior = features @ PRIOR_MB
+        ratios = excess[prior > 0] / prior[prior > 0]
+        if len(ratios):
+            self._coefficients = PRIOR_MB * max(float(np.median(ratios)), 1e-3)
+
@@ -0,0 +1,358 @@
+import math
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Log import logger
+from PySDNSim.Results import read_table
+from PySDNSim.RunResult import RunResult
+from PySDNSim.Sweep import Sweep
+
+
+class Score:
+    """
+    How well a candidate configuration does: its measured latency and success rate and its resource cost.
+    """
+    __slots__ = ("_latency", "_success", "_cost", "_violation")
+    _latency: float
+    _success: float
+    _cost: float
+    _violation: float
+
+    def __init__(self, latency: float, success: float, cost: float, violation: float):
+        self._latency = latency
+        self._success = success
+        self._cost = cost
+        self._violation = violation
+
+    def __repr__(self) -> str:
+        return (f"Score(latency={self.latency:.4g}, success={self.success:.3f}, cost={self.cost:.4g}, "
+                f"violation={self.violation:.3g})")
+
+    @property
+    def latency(self):
+        """Network service latency at the percentile of the objective, inf if none completed."""
+        return self._latency
+
+    @property
+    def success(self):
+        """Fraction of network services that completed."""
+        return self._success
+
+    @property
+    def cost(self):
+        return self._cost
+
+    @property
+    def violation(self):
+        """Relative amount by which the latency and success targets are missed, 0 if they are met."""
+        return self._violation
+
+    @property
+    def feasible(self):
+        return self._violation == 0
+
+    @property
+    def key(self) -> Tuple[bool, float, float, float]:
+        """Sort key, feasible candidates first by cost, then the others by how much they miss the targets."""
+        return not self.feasible, self._violation, self._cost, self._latency
+
+
+class Objective:
+    """
+    Cheapest configuration whose network service latency and success rate meet a service level objective.
+
+    The latency is the given percentile of ``finish - start`` over the completed network services of all the runs
+    of a candidate, the success rate the fraction of network services that completed. The cost is by default the
+    CPUs, RAM and BW reserved by all the initial microservice replicas, weighted per resource.
+    """
+    _latency_slo: float
+    _percentile: float
+    _min_success: float
+    _weights: Tuple[float, float, float]
+    _cost: Union[Callable[[Experiment], float], None]
+
+    def __init__(
+        self,
+        latency_slo: float,
+        percentile: float = 95.0,
+        min_success: float = 1.0,
+        cpu_cost: float = 1.0,
+        ram_cost: float = 0.0,
+        bw_cost: float = 0.0,
+        cost: Callable[[Experiment], float] = None,
+    ):
+        """Search objective.
+
+        Args:
+            latency_slo (float): largest acceptable latency in simulated seconds.
+            percentile (float, optional): percentile of the latency held to the objective. Defaults to 95.0.
+            min_success (float, optional): smallest acceptable fraction of completed network services. Defaults to 1.0.
+            cpu_cost (float, optional): cost of one CPU of one replica. Defaults to 1.0.
+            ram_cost (float, optional): cost of one unit of RAM of one replica. Defaults to 0.0.
+            bw_cost (float, optional): cost of one unit of BW of one replica. Defaults to 0.0.
+            cost (Callable[[Experiment], float], optional): cost of an experiment, replaces the resource weights. Defaults to None.
+        """
+        self._latency_slo = latency_slo
+        self._percentile = percentile
+        self._min_success = min_success
+        self._weights = (cpu_cost, ram_cost, bw_cost)
+        self._cost = cost
+
+    @property
+    def latency_slo(self):
+        return self._latency_slo
+
+    @property
+    def percentile(self):
+        return self._percentile
+
+    @property
+    def min_success(self):
+        return self._min_success
+
+    def cost(self, experiment: Experiment) -> float:
+        """Resource cost of an experiment.
+
+        Args:
+            experiment (Experiment): the experiment.
+
+        Returns:
+            float: its cost.
+        """
+        if self._cost is not None:
+            return float(self._cost(experiment))
+        cpu, ram, bw = self._weights
+        return float(sum(ms.replicas * (cpu * ms.cpus + ram * ms.ram + bw * ms.bw) for ms in experiment.microservices))
+
+    def evaluate(self, experiment: Experiment, results: Sequence[RunResult]) -> Score:
+        """Score the runs of a candidate.
+
+        Args:
+            experiment (Experiment): one of the experiments of the candidate, for its cost.
+            results (Sequence[RunResult]): its runs, a failed run counts as no network service completed.
+
+        Returns:
+            Score: the score.
+        """
+        delays, completed, total = list(), 0, 0
+        for result in results:
+            summary = read_table(result.output_path) if result.success else None
+            if summary is None or not len(summary):
+                total += max(1, len(experiment.network_services))
+                continue
+            complete = summary["complete"]
+            delays.append((summary["finish"] - summary["start"])[complete])
+            completed += int(complete.sum())
+            total += len(summary)
+        delays = np.concatenate(delays) if delays else np.zeros(0)
+        latency = float(np.percentile(delays, self._percentile)) if len(delays) else math.inf
+        success = completed / total if total else 0.0
+        violation = max(0.0, latency / self._latency_slo - 1.0) if math.isfinite(latency) else math.inf
+        violation += max(0.0, self._min_success - success)
+        return Score(latency, success, self.cost(experiment), violation)
+
+
+class SearchResult:
+    """
+    Outcome of a search.
+    """
+    _ranking: List[Tuple[Dict[str, Any], Score]]
+    _history: List[Dict[str, Any]]
+    _runs: int
+    _wall_time: float
+
+    def __init__(self, ranking: List[Tuple[Dict[str, Any], Score]], history: List[Dict[str, Any]], runs: int,
+                 wall_time: float):
+        self._ranking = ranking
+        self._history = history
+        self._runs = runs
+        self._wall_time = wall_time
+
+    def __repr__(self) -> str:
+        return f"SearchResult(best={self.best!r}, score={self.score!r}, runs={self.runs})"
+
+    @property
+    def best(self) -> Dict[str, Any]:
+        """Axis values of the best candidate."""
+        return self._ranking[0][0]
+
+    @property
+    def score(self) -> Score:
+        return self._ranking[0][1]
+
+    @property
+    def ranking(self) -> List[Tuple[Dict[str, Any], Score]]:
+        """Candidates of the last rung with their scores, best first."""
+        return list(self._ranking)
+
+    @property
+    def history(self) -> List[Dict[str, Any]]:
+        """One record per rung: its ``budget``, the number of ``candidates`` and ``runs`` and the ``kept`` ones."""
+        return list(self._history)
+
+    @property
+    def runs(self) -> int:
+        """Backend runs the search took."""
+        return self._runs
+
+    @property
+    def wall_time(self) -> float:
+        """Wall clock seconds of all the backend runs."""
+        return self._wall_time
+
+
+class SuccessiveHalving:
+    """
+    Successive halving search over the grid of a :class:`PySDNSim.Sweep.Sweep`.
+
+    Every candidate is first run with a small budget, the best ``1 / eta`` of them are kept and run with ``eta``
+    times the budget, and so on until the full budget. The budget is either the number of seeds a candidate is run
+    with, runs of the previous rungs being reused, or the simulated horizon, given as increasing ``horizons`` with
+    a ``backend`` that builds a backend for a horizon, e.g. ``lambda horizon: PythonBackend(horizon=horizon)``.
+    """
+    _sweep: Sweep
+    _objective: Objective
+    _backend: Union[Backend, Callable[[float], Backend]]
+    _output_path: str
+    _eta: int
+    _seeds: List[Any]
+    _min_seeds: int
+    _horizons: Union[List[float], None]
+    _max_workers: Union[int, None]
+    _debug: bool
+
+    def __init__(
+        self,
+        sweep: Sweep,
+        objective: Objective,
+        backend: Union[Backend, Callable[[float], Backend]],
+        output_path: str,
+        eta: int = 3,
+        seeds: Sequence[Any] = None,
+        min_seeds: int = 1,
+        horizons: Sequence[float] = None,
+        max_workers: int = None,
+        debug: bool = False,
+    ):
+        """Successive halving search.
+
+        Args:
+            sweep (Sweep): candidates, every point of its grid.
+            objective (Objective): how candidates are scored.
+            backend (Union[Backend, Callable[[float], Backend]]): backend, or a function building one for a horizon.
+            output_path (str): directory under which the runs are written.
+            eta (int, optional): factor by which candidates are cut and the budget grows at every rung. Defaults to 3.
+            seeds (Sequence[Any], optional): seeds of the full budget. Defaults to the seed of the sweep.
+            min_seeds (int, optional): seeds of the first rung. Defaults to 1.
+            horizons (Sequence[float], optional): increasing horizon of every rung, instead of a seed budget. Defaults to None.
+            max_workers (int, optional): concurrent backend runs. Defaults to the number of CPUs.
+            debug (bool, optional): log every rung. Defaults to False.
+
+        Raises:
+            RuntimeError: if ``eta`` is smaller than 2, or horizons are given without a backend factory.
+        """
+        if eta < 2:
+            raise RuntimeError("Successive halving needs eta of at least 2.")
+        if horizons is not None and isinstance(backend, Backend):
+            raise RuntimeError("A horizon budget needs a function building the backend of a horizon.")
+        self._sweep = sweep
+        self._objective = objective
+        self._backend = backend
+        self._output_path = output_path
+        self._eta = eta
+        self._seeds = list(seeds) if seeds is not None else [sweep.config.seed]
+        self._min_seeds = max(1, min(min_seeds, len(self._seeds)))
+        self._horizons = list(horizons) if horizons is not None else None
+        self._max_workers = max_workers
+        self._debug = debug
+
+    @property
+    def eta(self):
+        return self._eta
+
+    @property
+    def debug(self):
+        return self._debug
+
+    @property
+    def budgets(self) -> List[Union[int, float]]:
+        """Budget of every rung, seeds or horizon."""
+        if self._horizons is not None:
+            return list(self._horizons)
+        budgets = [self._min_seeds]
+        while budgets[-1] < len(self._seeds):
+            budgets.append(min(budgets[-1] * self._eta, len(self._seeds)))
+        return budgets
+
+    def run(self) -> SearchResult:
+        """Run the search.
+
+        Returns:
+            SearchResult: the best candidate and the ranking of the last rung.
+        """
+        return self._search(self.budgets)
+
+    def grid(self) -> SearchResult:
+        """Run every candidate with the full budget, the brute force search the halving is measured against.
+
+        Returns:
+            SearchResult: the best candidate and the ranking of all candidates.
+        """
+        return self._search(self.budgets[-1:])
+
+    def _search(self, budgets: List[Union[int, float]]) -> SearchResult:
+        points = list(self._sweep.points())
+        candidates = list(range(len(points)))
+        runs: Dict[Tuple[int, Any, int], RunResult] = dict()
+        history = list()
+        total_runs, wall_time = 0, 0.0
+        ranking: List[Tuple[int, Score]] = list()
+        for rung, budget in enumerate(budgets):
+            new = self._run_rung(candidates, points, budget, runs)
+            total_runs += len(new)
+            wall_time += sum(result.wall_time for result in new)
+            ranking = sorted(
+                ((number, self._score(number, points[number], budget, runs)) for number in candidates),
+                key=lambda item: item[1].key,
+            )
+            kept = len(ranking) if rung == len(budgets) - 1 else max(1, math.ceil(len(ranking) / self._eta))
+            candidates = [number for number, _ in ranking[:kept]]
+            history.append({"rung": rung, "budget": budget, "candidates": len(ranking), "runs": len(new),
+                            "kept": kept})
+            if self.debug:
+                logger.info(f"Rung {rung} with budget {budget}: kept {kept} of {len(ranking)} candidates, best "
+                            f"{self._sweep.parameters(points[ranking[0][0]])} {ranking[0][1]!r}.")
+        return SearchResult(
+            [(self._sweep.parameters(points[number]), score) for number, score in ranking], history, total_runs,
+            wall_time,
+        )
+
+    def _rung_runs(self, number: int, budget: Union[int, float]) -> List[Tuple[int, Any, int]]:
+        # runs of a seed budget are shared by all rungs, runs of a horizon budget belong to their horizon
+        if self._horizons is not None:
+            return [(number, budget, seed) for seed in range(len(self._seeds))]
+        return [(number, None, seed) for seed in range(int(budget))]
+
+    def _experiment(self, number: int, point: Tuple[int, ...], horizon: Union[float, None], seed: int) -> Experiment:
+        suffix = f"_h{horizon:g}" if horizon is not None else ""
+        return self._sweep.experiment(point, number, name=f"{self._sweep.name}_{number}{suffix}_s{seed}",
+                                      seed=self._seeds[seed])
+
+    def _run_rung(self, candidates: List[int], points: List[Tuple[int, ...]], budget: Union[int, float],
+                  runs: Dict[Tuple[int, Any, int], RunResult]) -> List[RunResult]:
+        keys = [key for number in candidates for key in self._rung_runs(number, budget) if key not in runs]
+        if not keys:
+            return list()
+        backend = self._backend(budget) if self._horizons is not None else self._backend
+        experiments = [self._experiment(number, points[number], horizon, seed) for number, horizon, seed in keys]
+        results = backend.run_experiments(experiments, self._output_path, self._max_workers)
+        runs.update(zip(keys, results))
+        return results
+
+    def _score(self, number: int, point: Tuple[int, ...], budget: Union[int, float],
+               runs: Dict[Tuple[int, Any, int], RunResult]) -> Score:
+        results = [runs[key] for key in self._rung_runs(number, budget)]
+        return self._objective.evaluate(self._sweep.experiment(point, number), results)
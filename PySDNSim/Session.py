@@ -0,0 +1,239 @@
+import itertools
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from typing import List, Union
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Cache import tree_size
+from PySDNSim.ConfigWriter import JSON
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Log import logger
+from PySDNSim.RunResult import RunResult
+from PySDNSim.Worker import DONE, ERROR, QUIT, READY, RUN
+
+JAR_COMMAND = ["java", "-jar", "backend.jar", "--batch"]
+STAND_IN_COMMAND = [sys.executable, "-m", "PySDNSim.Worker"]
+
+
+class _SessionWorker:
+    """
+    A long-lived backend process driven over its stdin/stdout.
+    """
+    _command: List[str]
+    _process: subprocess.Popen
+
+    def __init__(self, command: List[str]):
+        self._command = command
+        self._process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+            bufsize=1,
+        )
+        greeting = self._process.stdout.readline().rstrip("\n")
+        if greeting != READY:
+            self.kill()
+            raise RuntimeError(f"Backend worker {command} did not start, got {greeting!r}.")
+
+    @property
+    def alive(self):
+        return self._process.poll() is None
+
+    def request(self, request_id: str, config_file: str, output_path: str) -> int:
+        self._process.stdin.write(f"{RUN}\t{request_id}\t{config_file}\t{output_path}\n")
+        self._process.stdin.flush()
+        fields = self._process.stdout.readline().rstrip("\n").split("\t")
+        if fields[0] == ERROR:
+            raise RuntimeError(f"Backend worker rejected request {request_id}: {' '.join(fields[1:])}")
+        if len(fields) != 3 or fields[0] != DONE or fields[1] != request_id:
+            raise RuntimeError(f"Backend worker answered {fields} to request {request_id}.")
+        return int(fields[2])
+
+    def close(self, timeout: float = 10.0):
+        if self.alive:
+            try:
+                self._process.stdin.write(QUIT + "\n")
+                self._process.stdin.close()
+                self._process.wait(timeout=timeout)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+
+    def kill(self):
+        if self.alive:
+            self._process.kill()
+        self._process.wait()
+
+
+class BackendSession:
+    """
+    A warm pool of long-lived backend processes that run many experiments without restarting the JVM.
+    """
+    _workers: int
+    _command: List[str]
+    _debug: bool
+    _config_format: str
+    _idle: "Queue[Union[_SessionWorker, None]]"
+    _pool: List[_SessionWorker]
+    _request_ids: "itertools.count[int]"
+
+    def __init__(self, workers: int = 1, command: List[str] = None, debug: bool = False, config_format: str = JSON):
+        """Backend session, the processes are started by :meth:`start` or on entering the context.
+
+        Args:
+            workers (int, optional): number of backend processes kept warm. Defaults to 1.
+            command (List[str], optional): command starting one backend process in batch mode. Defaults to the backend jar.
+            debug (bool, optional): log every completed experiment. Defaults to False.
+            config_format (str, optional): format of the generated configuration files, the jar reads "json". Defaults to "json".
+        """
+        if workers < 1:
+            raise RuntimeError("A session needs at least one worker.")
+        self._workers = workers
+        self._command = list(command) if command is not None else list(JAR_COMMAND)
+        self._debug = debug
+        self._config_format = Backend.check_format(config_format)
+        self._idle = Queue()
+        self._pool = list()
+        self._request_ids = itertools.count()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def workers(self):
+        return self._workers
+
+    @property
+    def command(self):
+        return self._command
+
+    @property
+    def debug(self):
+        return self._debug
+
+    @property
+    def config_format(self):
+        return self._config_format
+
+    def start(self):
+        """Start the backend processes."""
+        if not self._pool:
+            self._idle = Queue()
+        while len(self._pool) < self.workers:
+            worker = _SessionWorker(self.command)
+            self._pool.append(worker)
+            self._idle.put(worker)
+        if self.debug:
+            logger.info(f"Started {self.workers} backend worker(s).")
+
+    def close(self):
+        """Ask every backend process to exit and wait for it."""
+        for worker in self._pool:
+            worker.close()
+        self._pool.clear()
+        self._idle = Queue()
+
+    def run_experiment(self, experiment: Experiment, output_path: str) -> RunResult:
+        """Generate the configuration of an experiment and run it on an idle backend process.
+
+        Args:
+            experiment (Experiment): the experiment to run.
+            output_path (str): directory under which the results of the experiment are written.
+
+        Raises:
+            RuntimeError: if the session is not started.
+
+        Returns:
+            RunResult: exit code and wall time of the run.
+        """
+        if len(self._pool) == 0:
+            raise RuntimeError("Backend session is not started.")
+        config_file = experiment.name + ".json"
+        os.makedirs(output_path, exist_ok=True)
+        start = time.perf_counter()
+        microservices, network_services = experiment.materialise()
+        digest = Backend.generate_config(
+            config=experiment.config,
+            hosts=[experiment.host],
+            microservices=microservices,
+            network_services=network_services,
+            config_file=config_file,
+            debug=self.debug,
+            config_format=self.config_format,
+        )
+        write_time = time.perf_counter() - start
+        result = self._submit(
+            name=experiment.name,
+            config_file="./configs/" + config_file,
+            output_path=output_path + "/" + experiment.name,
+        )
+        result._record(write_time=write_time, output_bytes=tree_size(result.output_path), config_digest=digest)
+        return result
+
+    def run_experiments(self, experiments: List[Experiment], output_path: Union[str, List[str]]) -> List[RunResult]:
+        """Run several experiments across the warm backend processes.
+
+        Args:
+            experiments (List[Experiment]): experiments to run, names must be unique.
+            output_path (Union[str, List[str]]): output directory shared by all experiments, or one per experiment.
+
+        Raises:
+            RuntimeError: if experiment names collide or the output paths mismatch the experiments.
+
+        Returns:
+            List[RunResult]: results in the order the experiments were given.
+        """
+        experiments = list(experiments)
+        output_paths = Backend.pair_output_paths(experiments, output_path)
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            return list(executor.map(self.run_experiment, experiments, output_paths))
+
+    def _release(self, worker: _SessionWorker):
+        """Put a worker back on the idle queue, or a fresh one in place of a dead one."""
+        if worker.alive:
+            self._idle.put(worker)
+            return
+        self._pool.remove(worker)
+        try:
+            worker = _SessionWorker(self.command)
+        except (OSError, RuntimeError) as error:
+            logger.error(f"Can not replace backend worker: {error}")
+            if not self._pool:
+                # wakes the submissions waiting for a worker
+                self._idle.put(None)
+            return
+        self._pool.append(worker)
+        self._idle.put(worker)
+
+    def _submit(self, name: str, config_file: str, output_path: str) -> RunResult:
+        worker = self._idle.get()
+        if worker is None:
+            self._idle.put(None)
+            raise RuntimeError("Backend session has no worker left.")
+        start = time.perf_counter()
+        try:
+            return_code = worker.request(str(next(self._request_ids)), config_file, output_path)
+        except (OSError, RuntimeError, ValueError) as error:
+            logger.error(f"Backend worker failed on experiment\t {name}: {error}")
+            worker.kill()
+            return_code = -1
+        finally:
+            self._release(worker)
+        wall_time = time.perf_counter() - start
+        if self.debug:
+            logger.info(f"Simulation completed for experiment\t {name}.")
+        return RunResult(
+            name=name,
+            config_file=config_file,
+            output_path=output_path,
+            return_code=return_code,
+            wall_time=wall_time,
+        )
@@ -0,0 +1,308 @@
+import csv
+import os
+import threading
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Log import logger
+from PySDNSim.Results import DC, NSUMMARY
+
+# metric computed from the finish times in NSummary.csv instead of a DC.csv column
+COMPLETION_RATE = "completion_rate"
+
+
+class SteadyStateTest:
+    """
+    Batch means test on the datacenter samples of a run.
+
+    The latest ``batches * batch_size`` samples are cut into ``batches`` consecutive batches. The run is in steady
+    state once, for every metric, the mean of every batch is within ``tolerance`` (relative) plus ``atol`` of the
+    mean of all batches. Metrics are columns of ``DC.csv``, or ``completion_rate``, the network services completed
+    per simulated second, which needs a backend that appends to ``NSummary.csv`` as network services complete.
+    """
+    _metrics: Tuple[str, ...]
+    _batches: int
+    _batch_size: int
+    _tolerance: float
+    _atol: float
+    _warmup: float
+
+    def __init__(
+        self,
+        metrics: Sequence[str] = ("power", "active_flows"),
+        batches: int = 5,
+        batch_size: int = 20,
+        tolerance: float = 0.05,
+        atol: float = 1e-6,
+        warmup: float = 0.0,
+    ):
+        """Batch means steady-state test.
+
+        Args:
+            metrics (Sequence[str], optional): tested metrics. Defaults to power and active flows.
+            batches (int, optional): number of batches, at least 2. Defaults to 5.
+            batch_size (int, optional): samples per batch. Defaults to 20.
+            tolerance (float, optional): largest relative deviation of a batch mean. Defaults to 0.05.
+            atol (float, optional): absolute deviation always accepted, for metrics that stay near 0. Defaults to 1e-6.
+            warmup (float, optional): simulated seconds ignored at the start of the run. Defaults to 0.0.
+
+        Raises:
+            RuntimeError: if there are no metrics or fewer than 2 batches.
+        """
+        if not metrics:
+            raise RuntimeError("Steady-state test needs at least one metric.")
+        if batches < 2 or batch_size < 1:
+            raise RuntimeError("Steady-state test needs at least 2 batches of 1 sample.")
+        self._metrics = tuple(metrics)
+        self._batches = batches
+        self._batch_size = batch_size
+        self._tolerance = tolerance
+        self._atol = atol
+        self._warmup = warmup
+
+    @property
+    def metrics(self):
+        return self._metrics
+
+    @property
+    def samples(self) -> int:
+        """Samples the test looks at."""
+        return self._batches * self._batch_size
+
+    def check(self, dc: Dict[str, np.ndarray], finished: np.ndarray = None) -> Union[str, None]:
+        """Test the samples of a run.
+
+        Args:
+            dc (Dict[str, np.ndarray]): columns of ``DC.csv``, ``time`` included.
+            finished (np.ndarray, optional): finish times of the completed network services. Defaults to None.
+
+        Returns:
+            Union[str, None]: why the run is in steady state, None if it is not.
+        """
+        times = dc["time"]
+        start = int(np.searchsorted(times, self._warmup))
+        if len(times) - start < self.samples:
+            return None
+        window = slice(len(times) - self.samples, len(times))
+        details = list()
+        for metric in self._metrics:
+            if metric == COMPLETION_RATE:
+                if finished is None or not len(finished):
+                    return None
+                edges = np.append(times[window][::self._batch_size], times[-1])
+                counts, _ = np.histogram(finished, bins=edges)
+                means = counts / np.maximum(np.diff(edges), 1e-12)
+            elif metric in dc:
+                means = dc[metric][window].reshape(self._batches, self._batch_size).mean(axis=1)
+            else:
+                return None
+            mean = float(means.mean())
+            spread = float(np.abs(means - mean).max())
+            if spread > self._tolerance * abs(mean) + self._atol:
+                return None
+            details.append(f"{metric} {mean:.6g} +- {spread:.3g}")
+        return f"steady state at t={float(times[-1]):g}: " + ", ".join(details)
+
+
+class _Tail:
+    """
+    Incremental reader of a csv file that is still being written.
+
+    Every read parses only the rows appended since the previous one and appends the values of the columns of
+    interest to growing arrays, so a poll costs the new rows, not the whole file.
+    """
+
+    def __init__(self, path: str, parsers: Dict[str, Callable[[str], float]]):
+        self.path = path
+        self.header: Union[List[str], None] = None
+        self._parsers = parsers
+        self._indices: Dict[str, int] = dict()
+        self._values: Dict[str, np.ndarray] = dict()
+        self._size = 0
+        self._offset = 0
+        self._buffer = b""
+        # results of a previous run are ignored until the backend rewrites the file
+        self._stale = _signature(path)
+
+    def read(self):
+        signature = _signature(self.path)
+        if signature is None or signature == self._stale:
+            return
+        self._stale = None
+        with open(self.path, "rb") as file:
+            file.seek(self._offset)
+            data = file.read()
+        self._offset += len(data)
+        lines = (self._buffer + data).split(b"\n")
+        self._buffer = lines.pop()
+        rows = [row for row in csv.reader(line.decode("utf-8", errors="replace").rstrip("\r") for line in lines)
+                if row]
+        if self.header is None and rows:
+            self.header = rows.pop(0)
+            self._indices = {name: self.header.index(name) for name in self._parsers if name in self.header}
+            self._values = {name: np.empty(1024, dtype=np.float64) for name in self._indices}
+        if self.header is None:
+            return
+        rows = [row for row in rows if len(row) >= len(self.header)]
+        if not rows:
+            return
+        size = self._size + len(rows)
+        for name, index in self._indices.items():
+            values = self._values[name]
+            if size > len(values):
+                values = np.resize(values, max(size, 2 * len(values)))
+                self._values[name] = values
+            parse = self._parsers[name]
+            values[self._size:size] = [parse(row[index]) for row in rows]
+        self._size = size
+
+    def column(self, name: str) -> Union[np.ndarray, None]:
+        if name not in self._indices:
+            return None
+        return self._values[name][:self._size]
+
+
+def _flag(value: str) -> float:
+    return float(value.strip().lower() in ("true", "1", "yes"))
+
+
+def _signature(path: str) -> Union[Tuple[int, int], None]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+class SteadyStateWatch:
+    """
+    Watch of one run, see :meth:`SteadyStateWatcher.watch`.
+    """
+    _reason: Union[str, None]
+
+    def __init__(self, watcher: "SteadyStateWatcher", name: str, output_path: str, terminate: Callable[[], None],
+                 kill: Union[Callable[[], None], None]):
+        self._watcher = watcher
+        self._name = name
+        self._dc = _Tail(os.path.join(output_path, DC),
+                         {metric: float for metric in ("time",) + watcher.test.metrics if metric != COMPLETION_RATE})
+        self._nsummary = _Tail(os.path.join(output_path, NSUMMARY), {"finish": float, "complete": _flag})
+        self._terminate = terminate
+        self._kill = kill
+        self._reason = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def reason(self):
+        """Why the run was stopped, None if it was not."""
+        return self._reason
+
+    def finish(self) -> Union[str, None]:
+        """Stop watching, once the run exited.
+
+        Returns:
+            Union[str, None]: why the watcher stopped the run, None if it was not stopped.
+        """
+        with self._lock:
+            self._done.set()
+        self._thread.join()
+        return self._reason
+
+    def _run(self):
+        test = self._watcher.test
+        while not self._done.wait(self._watcher.poll_interval):
+            try:
+                self._dc.read()
+                self._nsummary.read()
+                times = self._dc.column("time")
+                if times is None:
+                    continue
+                dc = {"time": times}
+                for metric in test.metrics:
+                    values = self._dc.column(metric)
+                    if values is not None:
+                        dc[metric] = values
+                reason = test.check(dc, self._finished())
+            except (OSError, ValueError) as error:
+                logger.warning(f"Steady-state watcher failed for experiment\t {self._name}: {error!r}")
+                return
+            if reason is not None:
+                self._stop(reason)
+                return
+
+    def _finished(self) -> Union[np.ndarray, None]:
+        finish = self._nsummary.column("finish")
+        complete = self._nsummary.column("complete")
+        if finish is None or complete is None:
+            return finish
+        return finish[complete > 0]
+
+    def _stop(self, reason: str):
+        with self._lock:
+            if self._done.is_set():
+                return
+            self._reason = reason
+            logger.info(f"Stopping experiment\t {self._name} at {reason}.")
+            self._terminate()
+        if self._kill is not None and not self._done.wait(self._watcher.grace):
+            with self._lock:
+                if not self._done.is_set():
+                    logger.warning(f"Killing experiment\t {self._name}, it did not stop within {self._watcher.grace} s.")
+                    self._kill()
+
+
+class SteadyStateWatcher:
+    """
+    Stops backend runs once they reach a steady state.
+
+    While a run is going, ``DC.csv`` and ``NSummary.csv`` are tailed every ``poll_interval`` seconds and the
+    samples, one per ``Config.sample_interval`` of simulated time, are given to a :class:`SteadyStateTest`. Once it
+    passes, the backend is asked to stop, killed after ``grace`` seconds, and the reason is recorded in
+    :attr:`PySDNSim.RunResult.RunResult.stop_reason`. The results written until then are kept.
+    """
+    _test: SteadyStateTest
+    _poll_interval: float
+    _grace: float
+
+    def __init__(self, test: SteadyStateTest = None, poll_interval: float = 1.0, grace: float = 10.0):
+        """Steady-state watcher.
+
+        Args:
+            test (SteadyStateTest, optional): the test. Defaults to a :class:`SteadyStateTest` with its defaults.
+            poll_interval (float, optional): wall clock seconds between reads of the results. Defaults to 1.0.
+            grace (float, optional): seconds a stopped backend has to write its results and exit. Defaults to 10.0.
+        """
+        self._test = test if test is not None else SteadyStateTest()
+        self._poll_interval = poll_interval
+        self._grace = grace
+
+    @property
+    def test(self):
+        return self._test
+
+    @property
+    def poll_interval(self):
+        return self._poll_interval
+
+    @property
+    def grace(self):
+        return self._grace
+
+    def watch(self, name: str, output_path: str, terminate: Callable[[], None],
+              kill: Callable[[], None] = None) -> SteadyStateWatch:
+        """Start watching a run.
+
+        Args:
+            name (str): experiment name.
+            output_path (str): directory the backend writes its results to.
+            terminate (Callable[[], None]): asks the backend to stop and write its results.
+            kill (Callable[[], None], optional): stops the backend at once, after the grace period. Defaults to None.
+
+        Returns:
+            SteadyStateWatch: the watch, to be finished once the run exited.
+        """
+        return SteadyStateWatch(self, name, output_path, terminate, kill)
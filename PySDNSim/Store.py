@@ -0,0 +1,277 @@
+import csv
+import fnmatch
+import json
+import os
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from PySDNSim.Log import logger
+from PySDNSim.Results import TABLES, column_dtype, iter_chunks, iter_experiments
+from PySDNSim.RunResult import RunResult
+
+INDEX_FILE = "index.json"
+
+
+def _table_name(table: str) -> str:
+    return os.path.splitext(table)[0]
+
+
+def _count_rows(path: str) -> Tuple[List[str], int, Dict[str, int]]:
+    with open(path, newline="") as file:
+        reader = csv.reader(file)
+        header = next(reader, [])
+        text = [index for index, column in enumerate(header) if column_dtype(column).kind == "U"]
+        if text:
+            # text columns are sized to their longest value, which needs the rows parsed
+            rows, widths = 0, dict.fromkeys(text, 1)
+            for row in reader:
+                if not row:
+                    continue
+                rows += 1
+                for index in text:
+                    if index < len(row) and len(row[index]) > widths[index]:
+                        widths[index] = len(row[index])
+            return header, rows, {header[index]: width for index, width in widths.items()}
+    with open(path, "rb") as file:
+        # the readers skip blank lines, so do not count them
+        rows = sum(1 for line in file if line.strip())
+    return header, max(rows - 1, 0), dict()
+
+
+def _blank(dtype: np.dtype):
+    if dtype.kind == "f":
+        return np.nan
+    if dtype.kind == "U":
+        return ""
+    return 0
+
+
+class ColumnStore:
+    """
+    Columnar store of the result tables of a whole sweep.
+
+    Every column of every table is one ``.npy`` file opened as a memory map, and the rows of each experiment
+    are a contiguous range of it. Cross-experiment queries are therefore views into the maps, no csv is parsed
+    and nothing is copied.
+    """
+    _path: str
+    _index: Dict
+    _columns: Dict[Tuple[str, str], np.ndarray]
+
+    def __init__(self, path: str):
+        """Open an existing store.
+
+        Args:
+            path (str): directory written by :meth:`ingest`.
+        """
+        self._path = path
+        with open(os.path.join(path, INDEX_FILE)) as file:
+            self._index = json.load(file)
+        self._columns = dict()
+
+    @classmethod
+    def ingest(cls, root: str, path: str, results: Iterable[RunResult] = None,
+               chunk_size: int = 65536) -> "ColumnStore":
+        """Convert the outputs of a finished sweep into a store.
+
+        Args:
+            root (str): output path given to the backend, or any directory above it.
+            path (str): directory of the new store, existing columns are overwritten.
+            results (Iterable[RunResult], optional): results of the sweep, the configuration digest recorded for
+                every run is indexed with its experiment. Defaults to None, no digests.
+            chunk_size (int, optional): rows read at a time. Defaults to 65536.
+
+        Returns:
+            ColumnStore: the opened store.
+        """
+        digests = {result.name: result.config_digest for result in results or ()}
+        experiments = dict()
+        tables = dict()
+        # first pass: headers and row counts, so that every column is written once to its final size
+        for name, directory in iter_experiments(root):
+            if name in experiments:
+                logger.warning(f"Experiment {name} found more than once, keeping\t {experiments[name]['path']}.")
+                continue
+            entry = {"path": os.path.relpath(directory, root), "config_hash": digests.get(name) or "", "rows": dict()}
+            for table in TABLES:
+                table_file = os.path.join(directory, table)
+                if not os.path.isfile(table_file):
+                    continue
+                header, rows, widths = _count_rows(table_file)
+                layout = tables.setdefault(_table_name(table), {"columns": list(), "rows": 0, "widths": dict()})
+                for column in header:
+                    if column not in layout["columns"]:
+                        layout["columns"].append(column)
+                for column, width in widths.items():
+                    layout["widths"][column] = max(layout["widths"].get(column, 1), width)
+                entry["rows"][_table_name(table)] = [layout["rows"], rows]
+                layout["rows"] += rows
+            experiments[name] = entry
+
+        os.makedirs(path, exist_ok=True)
+        for table in TABLES:
+            table_name = _table_name(table)
+            layout = tables.get(table_name)
+            if layout is None:
+                continue
+            os.makedirs(os.path.join(path, table_name), exist_ok=True)
+            dtypes = {column: column_dtype(column, layout["widths"].get(column, 1)) for column in layout["columns"]}
+            layout["dtypes"] = {column: dtype.str for column, dtype in dtypes.items()}
+            maps = {
+                column: np.lib.format.open_memmap(
+                    os.path.join(path, table_name, column + ".npy"),
+                    mode="w+",
+                    dtype=dtypes[column],
+                    shape=(layout["rows"],),
+                )
+                for column in layout["columns"]
+            }
+            # second pass: copy chunk by chunk into the maps
+            for name, entry in experiments.items():
+                if table_name not in entry["rows"]:
+                    continue
+                offset, rows = entry["rows"][table_name]
+                position = offset
+                for chunk in iter_chunks(os.path.join(root, entry["path"]), table, chunk_size):
+                    for column, array in maps.items():
+                        if column in chunk.dtype.names:
+                            array[position:position + len(chunk)] = chunk[column]
+                        else:
+                            array[position:position + len(chunk)] = _blank(array.dtype)
+                    position += len(chunk)
+                if position != offset + rows:
+                    raise RuntimeError(f"Table {table} of experiment {name} changed while being ingested.")
+            for array in maps.values():
+                array.flush()
+            del maps
+
+        with open(os.path.join(path, INDEX_FILE), "w") as file:
+            json.dump({"tables": tables, "experiments": experiments}, file)
+        return cls(path)
+
+    @property
+    def path(self):
+        return self._path
+
+    @property
+    def tables(self) -> List[str]:
+        return list(self._index["tables"])
+
+    def columns(self, table: str) -> List[str]:
+        """Columns of a table.
+
+        Args:
+            table (str): "NSummary" or "DC".
+
+        Returns:
+            List[str]: column names.
+        """
+        return list(self._index["tables"][_table_name(table)]["columns"])
+
+    def names(self, pattern: str = "*") -> List[str]:
+        """Names of the stored experiments, in storage order.
+
+        Args:
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            List[str]: matching experiment names.
+        """
+        return [name for name in self._index["experiments"] if fnmatch.fnmatchcase(name, pattern)]
+
+    def with_config_hash(self, config_hash: str) -> List[str]:
+        """Names of the experiments generated from a configuration.
+
+        Args:
+            config_hash (str): digest as recorded in :attr:`PySDNSim.RunResult.RunResult.config_digest`.
+
+        Returns:
+            List[str]: matching experiment names.
+        """
+        return [name for name, entry in self._index["experiments"].items() if entry["config_hash"] == config_hash]
+
+    def config_hash(self, name: str) -> str:
+        return self._index["experiments"][name]["config_hash"]
+
+    def column(self, table: str, column: str) -> np.ndarray:
+        """A whole column across all experiments, memory mapped read only.
+
+        Args:
+            table (str): "NSummary" or "DC".
+            column (str): column name.
+
+        Returns:
+            np.ndarray: the memory map.
+        """
+        key = (_table_name(table), column)
+        if key not in self._columns:
+            if column not in self._index["tables"][key[0]]["columns"]:
+                raise RuntimeError(f"Column {column} does not exist in table {key[0]}.")
+            self._columns[key] = np.load(os.path.join(self._path, key[0], column + ".npy"), mmap_mode="r")
+        return self._columns[key]
+
+    def rows(self, name: str, table: str) -> Tuple[int, int]:
+        """Row range of an experiment in a table.
+
+        Args:
+            name (str): experiment name.
+            table (str): "NSummary" or "DC".
+
+        Returns:
+            Tuple[int, int]: offset and number of rows, (0, 0) if the experiment has no such table.
+        """
+        offset, rows = self._index["experiments"][name]["rows"].get(_table_name(table), (0, 0))
+        return offset, rows
+
+    def get(self, name: str, table: str, column: str) -> np.ndarray:
+        """Column of one experiment, a view into the memory map.
+
+        Args:
+            name (str): experiment name.
+            table (str): "NSummary" or "DC".
+            column (str): column name.
+
+        Returns:
+            np.ndarray: rows of the experiment.
+        """
+        offset, rows = self.rows(name, table)
+        return self.column(table, column)[offset:offset + rows]
+
+    def select(self, table: str, column: str, pattern: str = "*") -> Dict[str, np.ndarray]:
+        """Column of every matching experiment, each a view into the memory map.
+
+        Args:
+            table (str): "NSummary" or "DC".
+            column (str): column name.
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            Dict[str, np.ndarray]: experiment name to its rows, in storage order.
+        """
+        return {name: self.get(name, table, column) for name in self.names(pattern)}
+
+    def stacked(self, table: str, column: str, pattern: str = "*") -> np.ndarray:
+        """Column of every matching experiment as one array.
+
+        The result is a view when the matching experiments are stored next to each other, which is the case
+        for the runs of one sweep directory, and a copy otherwise.
+
+        Args:
+            table (str): "NSummary" or "DC".
+            column (str): column name.
+            pattern (str, optional): shell-style pattern on the experiment name. Defaults to "*".
+
+        Returns:
+            np.ndarray: concatenated rows.
+        """
+        ranges = sorted(self.rows(name, table) for name in self.names(pattern))
+        ranges = [(offset, rows) for offset, rows in ranges if rows > 0]
+        data = self.column(table, column)
+        if not ranges:
+            return data[0:0]
+        contiguous = all(ranges[i][0] + ranges[i][1] == ranges[i + 1][0] for i in range(len(ranges) - 1))
+        if contiguous:
+            return data[ranges[0][0]:ranges[-1][0] + ranges[-1][1]]
+        return np.concatenate([data[offset:offset + rows] for offset, rows in ranges])
+
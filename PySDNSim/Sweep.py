@@ -0,0 +1,343 @@
+import itertools
+from typing import Any, Callable, Dict, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Config import Config
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Host import Host
+from PySDNSim.Microservice import Microservice
+from PySDNSim.MicroservicePool import MicroservicePool
+from PySDNSim.NetworkService import NetworkService
+
+RESOURCES = ("cpu", "ram", "bw", "replicas")
+
+
+def _reseed(config: Config, seed: Any) -> Config:
+    """Copy of a configuration with another seed."""
+    return Config(
+        seed=seed,
+        interval=config.interval,
+        sample_interval=config.sample_interval,
+        step_size=config.step_size,
+    )
+
+
+class _Axis:
+    """
+    One swept parameter: its values and how a value is applied to an experiment.
+    """
+
+    def __init__(self, label: str, values: Sequence[Any], apply: Callable[["_Point", Any], None]):
+        if len(values) == 0:
+            raise RuntimeError(f"Axis {label} has no values.")
+        self.label = label
+        self.values = list(values)
+        self.apply = apply
+
+
+class _Point:
+    """
+    Arguments of the experiment of one design point, filled in by the axes.
+    """
+
+    def __init__(self, sweep: "Sweep"):
+        self.config = sweep.config
+        self.host = sweep.host
+        self.network_services = sweep.network_services
+        self.scales: List[Tuple[Union[str, None], str, Union[int, float]]] = list()
+        self.flows: Union[int, None] = None
+
+
+class Sweep:
+    """
+    Declarative parameter sweep over a base experiment.
+
+    Axes are declared with the methods below and a design then yields one :class:`PySDNSim.Experiment.Experiment`
+    per point, lazily, so arbitrarily large designs can be streamed into a backend.
+    """
+    _name: str
+    _config: Config
+    _host: Host
+    _microservices: Union[MicroservicePool, Tuple[Microservice, ...]]
+    _network_services: Tuple[NetworkService, ...]
+    _axes: List[_Axis]
+
+    def __init__(
+        self,
+        name: str,
+        config: Config,
+        host: Host,
+        microservices: List[Microservice],
+        network_services: List[NetworkService],
+    ):
+        """Sweep over a base experiment.
+
+        Args:
+            name (str): prefix of the experiment names, the n-th point is named ``{name}_{n}``.
+            config (Config): base simulation configuration.
+            host (Host): base host.
+            microservices (List[Microservice]): base microservices.
+            network_services (List[NetworkService]): base network services.
+        """
+        self._name = name
+        self._config = config
+        self._host = host
+        # one snapshot shared by the experiments of every point
+        self._microservices = microservices if isinstance(microservices, MicroservicePool) else tuple(microservices)
+        self._network_services = tuple(network_services)
+        self._axes = list()
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def config(self):
+        return self._config
+
+    @property
+    def host(self):
+        return self._host
+
+    @property
+    def microservices(self):
+        return self._microservices
+
+    @property
+    def network_services(self):
+        return self._network_services
+
+    @property
+    def axes(self) -> List[str]:
+        return [axis.label for axis in self._axes]
+
+    @property
+    def size(self) -> int:
+        """Number of points of the full grid."""
+        size = 1
+        for axis in self._axes:
+            size *= len(axis.values)
+        return size
+
+    def scale(self, resource: str, values: Sequence[Union[int, float]], ms_name: str = None) -> "Sweep":
+        """Sweep a resource delta, as :meth:`PySDNSim.Experiment.Experiment.scale` or ``scale_all``.
+
+        Args:
+            resource (str): resource name, "cpu", "ram", "bw" or "replicas".
+            values (Sequence[Union[int, float]]): deltas to apply.
+            ms_name (str, optional): microservice to scale, all microservices if not given. Defaults to None.
+
+        Raises:
+            RuntimeWarning: if a wrong resource name is given.
+
+        Returns:
+            Sweep: the sweep, for chaining.
+        """
+        if resource not in RESOURCES:
+            raise RuntimeWarning(f"Resource {resource} does not exist.")
+        label = f"{ms_name or '*'}.{resource}"
+
+        def apply(point: _Point, value: Union[int, float]):
+            point.scales.append((ms_name, resource, value))
+
+        self._axes.append(_Axis(label, values, apply))
+        return self
+
+    def flows(self, values: Sequence[int]) -> "Sweep":
+        """Sweep the number of flows of every network service, as :meth:`PySDNSim.Experiment.Experiment.set_num_flows`.
+
+        Args:
+            values (Sequence[int]): numbers of flows.
+
+        Returns:
+            Sweep: the sweep, for chaining.
+        """
+
+        def apply(point: _Point, value: int):
+            point.flows = value
+
+        self._axes.append(_Axis("flows", values, apply))
+        return self
+
+    def host_replicas(self, values: Sequence[int]) -> "Sweep":
+        """Sweep the number of host replicas.
+
+        Args:
+            values (Sequence[int]): numbers of replicas.
+
+        Returns:
+            Sweep: the sweep, for chaining.
+        """
+
+        def apply(point: _Point, value: int):
+            host = point.host
+            point.host = Host(
+                cpus=host.cpus,
+                ram=host.ram,
+                bw=host.bw,
+                storage=host.storage,
+                static_power=host.static_power,
+                max_power=host.max_power,
+                replicas=value,
+                vm_scheduler=host.vm_scheduler,
+            )
+
+        self._axes.append(_Axis("host.replicas", values, apply))
+        return self
+
+    def seeds(self, values: Sequence[Any]) -> "Sweep":
+        """Sweep the random seed.
+
+        Args:
+            values (Sequence[Any]): seeds.
+
+        Returns:
+            Sweep: the sweep, for chaining.
+        """
+
+        def apply(point: _Point, value: Any):
+            point.config = _reseed(point.config, value)
+
+        self._axes.append(_Axis("seed", values, apply))
+        return self
+
+    def network_service_subsets(self, values: Sequence[Sequence[NetworkService]]) -> "Sweep":
+        """Sweep the network services run together.
+
+        Args:
+            values (Sequence[Sequence[NetworkService]]): subsets of network services.
+
+        Returns:
+            Sweep: the sweep, for chaining.
+        """
+
+        def apply(point: _Point, value: Sequence[NetworkService]):
+            point.network_services = list(value)
+
+        self._axes.append(_Axis("network_services", values, apply))
+        return self
+
+    def grid(self, with_parameters: bool = False) -> Iterator[Union[Experiment, Tuple[Dict[str, Any], Experiment]]]:
+        """Full factorial design, the last axis varying fastest.
+
+        Args:
+            with_parameters (bool, optional): yield the axis values along with every experiment. Defaults to False.
+
+        Yields:
+            Union[Experiment, Tuple[Dict[str, Any], Experiment]]: one experiment per point.
+        """
+        return self._experiments(self.points(), with_parameters)
+
+    def points(self) -> Iterator[Tuple[int, ...]]:
+        """Points of the full grid, the last axis varying fastest.
+
+        Yields:
+            Tuple[int, ...]: index of the value of every axis, see :meth:`experiment`.
+        """
+        return itertools.product(*(range(len(axis.values)) for axis in self._axes))
+
+    def parameters(self, point: Sequence[int]) -> Dict[str, Any]:
+        """Axis values of a point.
+
+        Args:
+            point (Sequence[int]): index of the value of every axis.
+
+        Returns:
+            Dict[str, Any]: value of every axis, by label.
+        """
+        return {axis.label: axis.values[index] for axis, index in zip(self._axes, point)}
+
+    def random(self, samples: int, seed: Any = None, with_parameters: bool = False
+               ) -> Iterator[Union[Experiment, Tuple[Dict[str, Any], Experiment]]]:
+        """Points drawn uniformly and independently from the grid.
+
+        Args:
+            samples (int): number of points.
+            seed (Any, optional): seed of the design. Defaults to None.
+            with_parameters (bool, optional): yield the axis values along with every experiment. Defaults to False.
+
+        Yields:
+            Union[Experiment, Tuple[Dict[str, Any], Experiment]]: one experiment per point.
+        """
+        rng = np.random.default_rng(seed)
+        sizes = [len(axis.values) for axis in self._axes]
+
+        def points() -> Iterator[Tuple[int, ...]]:
+            remaining = samples
+            while remaining > 0:
+                block = min(remaining, 4096)
+                indices = np.stack([rng.integers(0, size, block) for size in sizes], axis=1) if sizes else \
+                    np.zeros((block, 0), dtype=np.int64)
+                for row in indices:
+                    yield tuple(int(index) for index in row)
+                remaining -= block
+
+        return self._experiments(points(), with_parameters)
+
+    def latin_hypercube(self, samples: int, seed: Any = None, with_parameters: bool = False
+                        ) -> Iterator[Union[Experiment, Tuple[Dict[str, Any], Experiment]]]:
+        """Latin hypercube design, every axis is split into ``samples`` strata that are each hit once.
+
+        Only one permutation per axis is kept, the experiments themselves are still built lazily.
+
+        Args:
+            samples (int): number of points.
+            seed (Any, optional): seed of the design. Defaults to None.
+            with_parameters (bool, optional): yield the axis values along with every experiment. Defaults to False.
+
+        Yields:
+            Union[Experiment, Tuple[Dict[str, Any], Experiment]]: one experiment per point.
+        """
+        rng = np.random.default_rng(seed)
+        columns = list()
+        for axis in self._axes:
+            strata = (rng.permutation(samples) + rng.random(samples)) / samples
+            columns.append(np.minimum((strata * len(axis.values)).astype(np.int64), len(axis.values) - 1))
+
+        def points() -> Iterator[Tuple[int, ...]]:
+            for row in range(samples):
+                yield tuple(int(column[row]) for column in columns)
+
+        return self._experiments(points(), with_parameters)
+
+    def experiment(self, point: Sequence[int], number: int, name: str = None, seed: Any = None) -> Experiment:
+        """Build the experiment of one design point.
+
+        Args:
+            point (Sequence[int]): index of the value of every axis.
+            number (int): number of the point, used in the experiment name.
+            name (str, optional): experiment name. Defaults to the sweep name and the number of the point.
+            seed (Any, optional): seed replacing the one of the point, e.g. to repeat a point. Defaults to None.
+
+        Returns:
+            Experiment: the experiment.
+        """
+        arguments = _Point(self)
+        for axis, index in zip(self._axes, point):
+            axis.apply(arguments, axis.values[index])
+        if seed is not None:
+            arguments.config = _reseed(arguments.config, seed)
+        experiment = Experiment(
+            name=name if name is not None else f"{self.name}_{number}",
+            config=arguments.config,
+            host=arguments.host,
+            microservices=self.microservices,
+            network_services=arguments.network_services,
+        )
+        for ms_name, resource, value in arguments.scales:
+            if ms_name is None:
+                experiment.scale_all(resource, value)
+            else:
+                experiment.scale(ms_name, resource, value)
+        if arguments.flows is not None:
+            experiment.set_num_flows(arguments.flows)
+        return experiment
+
+    def _experiments(self, points: Iterator[Sequence[int]], with_parameters: bool):
+        for number, point in enumerate(points):
+            experiment = self.experiment(point, number)
+            if with_parameters:
+                yield self.parameters(point), experiment
+            else:
+                yield experiment
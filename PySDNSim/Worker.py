@@ -0,0 +1,91 @@
+"""
+Stand-in for the batch mode of the simulation backend.
+
+It speaks the same line protocol as ``java -jar backend.jar --batch`` so that
+:class:`PySDNSim.Session.BackendSession` can be exercised without the jar,
+every configuration is simulated with :class:`PySDNSim.Engine.Simulator`:
+
+    python -m PySDNSim.Worker
+
+or, like ``java -jar backend.jar <config file> <output path>``, to run a single configuration:
+
+    python -m PySDNSim.Worker <config file> <output path> [mips] [horizon] [--trace]
+
+Every message is a single tab separated line. The worker greets with ``READY``,
+then answers every ``RUN\\t<id>\\t<config file>\\t<output path>`` request with
+``DONE\\t<id>\\t<exit code>`` and exits on ``QUIT`` or end of input. A malformed ``RUN`` request is answered
+with exit code 1, any other line with ``ERROR\\t<reason>``, so the other end never waits for an answer.
+"""
+import signal
+import sys
+import threading
+from typing import TextIO
+
+from PySDNSim.Engine import Simulator
+
+READY = "READY"
+RUN = "RUN"
+DONE = "DONE"
+ERROR = "ERROR"
+QUIT = "QUIT"
+
+
+def run(config_file: str, output_path: str, mips: float = 1000.0, horizon: float = 3600.0,
+        stop: threading.Event = None, trace: bool = False) -> int:
+    """Simulate a configuration file with the in-process engine.
+
+    Args:
+        config_file (str): path of the simulation configuration file.
+        output_path (str): directory for the results.
+        mips (float, optional): processing capacity of one host CPU in MIPS. Defaults to 1000.0.
+        horizon (float, optional): simulated time after which unfinished network services are failed. Defaults to 3600.0.
+        stop (threading.Event, optional): ends the simulation early once set, with its results written. Defaults to None.
+        trace (bool, optional): also write the per microservice samples to ``MS.csv``. Defaults to False.
+
+    Returns:
+        int: exit code, 0 on success.
+    """
+    try:
+        Simulator.from_file(config_file, mips=mips, horizon=horizon, trace=trace).run(output_path, stop)
+    except (OSError, ValueError, KeyError, IndexError) as error:
+        print(f"Failed to run {config_file}: {error!r}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def serve(stdin: TextIO, stdout: TextIO):
+    """Answer requests from stdin until told to quit.
+
+    Args:
+        stdin (TextIO): request stream.
+        stdout (TextIO): response stream.
+    """
+    stdout.write(READY + "\n")
+    stdout.flush()
+    for line in stdin:
+        fields = line.rstrip("\n").split("\t")
+        if fields[0] == QUIT:
+            break
+        if fields[0] == RUN and len(fields) == 4:
+            _, request_id, config_file, output_path = fields
+            stdout.write(f"{DONE}\t{request_id}\t{run(config_file, output_path)}\n")
+        elif fields[0] == RUN and len(fields) > 1:
+            print(f"Malformed request {line!r}", file=sys.stderr)
+            stdout.write(f"{DONE}\t{fields[1]}\t1\n")
+        else:
+            print(f"Malformed request {line!r}", file=sys.stderr)
+            stdout.write(f"{ERROR}\tmalformed request {line.rstrip()!r}\n")
+        stdout.flush()
+
+
+if __name__ == "__main__":
+    arguments = [argument for argument in sys.argv[1:] if argument != "--trace"]
+    if len(arguments) > 1:
+        # the jar logs on start-up, which is what Backend measures its start-up time on
+        print(f"Simulating {arguments[0]}", flush=True)
+        # a terminated run still writes the results it has so far
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda signum, frame: stop.set())
+        sys.exit(run(arguments[0], arguments[1], *(float(value) for value in arguments[2:4]), stop=stop,
+                     trace="--trace" in sys.argv))
+    serve(sys.stdin, sys.stdout)
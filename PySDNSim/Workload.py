@@ -0,0 +1,414 @@
+from abc import ABC, abstractmethod
+from typing import Any, Iterator, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Config import Config
+from PySDNSim.ConfigWriter import BINARY, JSON, write_columnar_config
+from PySDNSim.Experiment import Experiment
+from PySDNSim.Host import Host
+from PySDNSim.Log import logger
+from PySDNSim.Microservice import Microservice
+from PySDNSim.NetworkService import NetworkService
+from PySDNSim.NetworkServiceBatch import NetworkServiceBatch
+from PySDNSim.RunResult import RunResult
+
+
+class ArrivalProcess(ABC):
+    """
+    Arrival times of a network service over a horizon.
+    """
+
+    @abstractmethod
+    def times(self, rng: np.random.Generator, horizon: float) -> np.ndarray:
+        """Draw the arrivals of one horizon.
+
+        Args:
+            rng (np.random.Generator): random generator.
+            horizon (float): simulated seconds.
+
+        Returns:
+            np.ndarray: arrival times in seconds, in increasing order.
+        """
+
+
+class Poisson(ArrivalProcess):
+    """
+    Homogeneous Poisson arrivals.
+    """
+
+    def __init__(self, rate: float):
+        """Poisson arrivals.
+
+        Args:
+            rate (float): mean arrivals per second.
+
+        Raises:
+            RuntimeError: if the rate is negative.
+        """
+        if rate < 0:
+            raise RuntimeError("Arrival rate must not be negative.")
+        self.rate = rate
+
+    def times(self, rng: np.random.Generator, horizon: float) -> np.ndarray:
+        return np.sort(rng.uniform(0.0, horizon, rng.poisson(self.rate * horizon)))
+
+
+class Diurnal(ArrivalProcess):
+    """
+    Poisson arrivals whose rate follows a sinusoidal daily cycle, ``rate * (1 + amplitude * sin(2 pi t / period + phase))``.
+    """
+
+    def __init__(self, rate: float, amplitude: float = 0.5, period: float = 86400.0, phase: float = 0.0):
+        """Diurnal arrivals.
+
+        Args:
+            rate (float): mean arrivals per second over a period.
+            amplitude (float, optional): relative swing of the rate, between 0 and 1. Defaults to 0.5.
+            period (float, optional): seconds of one cycle. Defaults to one day.
+            phase (float, optional): phase of the cycle at time 0, in radians. Defaults to 0.0.
+
+        Raises:
+            RuntimeError: if the rate is negative or the amplitude is out of range.
+        """
+        if rate < 0:
+            raise RuntimeError("Arrival rate must not be negative.")
+        if not 0.0 <= amplitude <= 1.0:
+            raise RuntimeError("Amplitude of a diurnal cycle must be between 0 and 1.")
+        self.rate = rate
+        self.amplitude = amplitude
+        self.period = period
+        self.phase = phase
+
+    def times(self, rng: np.random.Generator, horizon: float) -> np.ndarray:
+        # thinning of a Poisson process at the peak rate
+        peak = self.rate * (1.0 + self.amplitude)
+        candidates = np.sort(rng.uniform(0.0, horizon, rng.poisson(peak * horizon)))
+        rate = self.rate * (1.0 + self.amplitude * np.sin(2.0 * np.pi * candidates / self.period + self.phase))
+        return candidates[rng.random(len(candidates)) * peak < rate]
+
+
+class MMPP(ArrivalProcess):
+    """
+    Markov-modulated Poisson arrivals: bursty traffic switching between states of different rates.
+
+    The process stays in a state for an exponential time, then moves to another state, uniformly at random
+    unless a transition matrix is given.
+    """
+
+    def __init__(self, rates: Sequence[float], durations: Sequence[float], transitions: Sequence[Sequence[float]] = None):
+        """Markov-modulated Poisson arrivals.
+
+        Args:
+            rates (Sequence[float]): arrivals per second in every state.
+            durations (Sequence[float]): mean seconds spent in every state.
+            transitions (Sequence[Sequence[float]], optional): probability of moving from a state to another, rows
+                sum to 1. Defaults to a uniform choice among the other states.
+
+        Raises:
+            RuntimeError: if the parameters mismatch or are out of range.
+        """
+        rates = np.asarray(rates, dtype=np.float64)
+        durations = np.asarray(durations, dtype=np.float64)
+        if rates.ndim != 1 or len(rates) < 2 or rates.shape != durations.shape:
+            raise RuntimeError("MMPP needs a rate and a duration for each of at least two states.")
+        if np.any(rates < 0) or np.any(durations <= 0):
+            raise RuntimeError("MMPP rates must not be negative and durations must be positive.")
+        if transitions is None:
+            transitions = (1.0 - np.eye(len(rates))) / (len(rates) - 1)
+        transitions = np.asarray(transitions, dtype=np.float64)
+        if transitions.shape != (len(rates), len(rates)) or not np.allclose(transitions.sum(axis=1), 1.0):
+            raise RuntimeError("MMPP transition matrix must be square with rows summing to 1.")
+        self.rates = rates
+        self.durations = durations
+        self.transitions = transitions
+
+    def _walk(self, cumulative: np.ndarray, draws: np.ndarray) -> np.ndarray:
+        """Every state the chain can be in after each step, for every state it starts from.
+
+        Step ``k`` moves state ``s`` to ``steps[k, s]``, the steps are composed with a prefix scan, doubling the
+        number of composed steps each pass, so the state sequence is drawn without a Python loop over the steps.
+        """
+        count = len(self.rates)
+        steps = np.minimum((draws[:, None, None] >= cumulative[None, :, :]).sum(axis=2), count - 1)
+        shift = 1
+        while shift < len(draws):
+            steps[shift:] = np.take_along_axis(steps[shift:], steps[:-shift], axis=1)
+            shift *= 2
+        return steps
+
+    def times(self, rng: np.random.Generator, horizon: float) -> np.ndarray:
+        # the state sequence is drawn in chunks, arrivals of all the sojourns at once
+        cumulative = np.cumsum(self.transitions, axis=1)
+        state = int(rng.integers(len(self.rates)))
+        states, starts, ends = list(), list(), list()
+        now = 0.0
+        chunk = max(16, int(horizon / self.durations.mean()) + 1)
+        while now < horizon:
+            walk = self._walk(cumulative, rng.random(chunk))[:, state]
+            sequence = np.concatenate(([state], walk[:-1]))
+            state = int(walk[-1])
+            stays = rng.exponential(self.durations[sequence])
+            stops = now + np.cumsum(stays)
+            states.append(sequence)
+            starts.append(stops - stays)
+            ends.append(stops)
+            now = float(stops[-1])
+        states = np.concatenate(states)
+        starts = np.concatenate(starts)
+        ends = np.minimum(np.concatenate(ends), horizon)
+        keep = starts < horizon
+        states, starts, ends = states[keep], starts[keep], ends[keep]
+        counts = rng.poisson(self.rates[states] * (ends - starts))
+        offsets = np.repeat(starts, counts)
+        spans = np.repeat(ends - starts, counts)
+        return np.sort(offsets + rng.random(len(offsets)) * spans)
+
+
+class LengthDistribution(ABC):
+    """
+    Random factor applied to the lengths of the jobs of a template, with a mean of 1.
+    """
+
+    @abstractmethod
+    def factors(self, rng: np.random.Generator, shape: Tuple[int, ...]) -> np.ndarray:
+        """Draw length factors.
+
+        Args:
+            rng (np.random.Generator): random generator.
+            shape (Tuple[int, ...]): shape of the factors.
+
+        Returns:
+            np.ndarray: the factors.
+        """
+
+
+class Pareto(LengthDistribution):
+    """
+    Pareto distributed lengths, heavy-tailed with a finite mean for ``alpha > 1``.
+    """
+
+    def __init__(self, alpha: float = 1.5):
+        """Pareto length factors.
+
+        Args:
+            alpha (float, optional): tail index, smaller values give heavier tails. Defaults to 1.5.
+
+        Raises:
+            RuntimeError: if alpha is not larger than 1.
+        """
+        if alpha <= 1.0:
+            raise RuntimeError("Pareto tail index must be larger than 1 for the lengths to have a mean.")
+        self.alpha = alpha
+
+    def factors(self, rng: np.random.Generator, shape: Tuple[int, ...]) -> np.ndarray:
+        minimum = (self.alpha - 1.0) / self.alpha
+        return minimum * (1.0 + rng.pareto(self.alpha, shape))
+
+
+class LogNormal(LengthDistribution):
+    """
+    Log-normally distributed lengths.
+    """
+
+    def __init__(self, sigma: float = 1.0):
+        """Log-normal length factors.
+
+        Args:
+            sigma (float, optional): standard deviation of the log of the factors. Defaults to 1.0.
+
+        Raises:
+            RuntimeError: if sigma is negative.
+        """
+        if sigma < 0:
+            raise RuntimeError("Standard deviation must not be negative.")
+        self.sigma = sigma
+
+    def factors(self, rng: np.random.Generator, shape: Tuple[int, ...]) -> np.ndarray:
+        return rng.lognormal(-self.sigma ** 2 / 2.0, self.sigma, shape)
+
+
+class _Template:
+    """
+    Job arrays of a network service template and how it arrives.
+    """
+
+    def __init__(self, ns: NetworkService, arrivals: ArrivalProcess, lengths: Union[LengthDistribution, None]):
+        ms, length, schedule = list(), list(), list()
+        for job, slot in ns.iter_jobs():
+            ms.append(job.ms_id)
+            length.append(job.length)
+            schedule.append(slot)
+        if not ms:
+            raise RuntimeError(f"Network service {ns.name} has no jobs.")
+        self.name = ns.name
+        self.flows = ns.flows
+        self.ms = np.array(ms, dtype=np.int64)
+        self.length = np.array(length, dtype=np.int64)
+        self.schedule = np.array(schedule, dtype=np.int64)
+        self.arrivals = arrivals
+        self.lengths = lengths
+
+
+class Workload:
+    """
+    Synthetic workload: streams of network service arrivals generated with NumPy.
+
+    Every template network service arrives following its own :class:`ArrivalProcess`. Arrival ``i`` of a template
+    becomes the network service ``<template>_<i>``, running the jobs of the template shifted to the schedule slot of
+    its arrival, with job lengths optionally drawn from a :class:`LengthDistribution`. Arrivals are generated as job
+    arrays in batches and streamed into the columnar configuration writer, so no Python object is created per job.
+
+    The random streams are derived from the seed, ``Config.seed`` unless given, one independent stream per template,
+    so adding a template does not change the arrivals of the others.
+    """
+    _templates: List[_Template]
+    _seed: Any
+    _batch_size: int
+    _debug: bool
+
+    def __init__(self, seed: Any = None, batch_size: int = 65536, debug: bool = False):
+        """Empty workload.
+
+        Args:
+            seed (Any, optional): seed of the random streams. Defaults to None, the seed of the configuration.
+            batch_size (int, optional): arrivals generated and written at once. Defaults to 65536.
+            debug (bool, optional): log the number of generated arrivals. Defaults to False.
+        """
+        self._templates = list()
+        self._seed = seed
+        self._batch_size = batch_size
+        self._debug = debug
+
+    @property
+    def seed(self):
+        return self._seed
+
+    @property
+    def debug(self):
+        return self._debug
+
+    def add(self, template: NetworkService, arrivals: ArrivalProcess, lengths: LengthDistribution = None) -> "Workload":
+        """Add a network service template.
+
+        Args:
+            template (NetworkService): network service whose jobs every arrival runs, schedules relative to the arrival.
+            arrivals (ArrivalProcess): arrival process of the template.
+            lengths (LengthDistribution, optional): factor drawn for the length of every job. Defaults to None,
+                the lengths of the template.
+
+        Raises:
+            RuntimeError: if the template has no jobs.
+
+        Returns:
+            Workload: this workload.
+        """
+        self._templates.append(_Template(template, arrivals, lengths))
+        return self
+
+    def batches(self, horizon: float, interval: float = 1.0, seed: Any = None) -> Iterator[NetworkServiceBatch]:
+        """Generate the arrivals of all templates.
+
+        Args:
+            horizon (float): simulated seconds during which network services arrive.
+            interval (float, optional): seconds of one schedule slot, see ``Config.interval``. Defaults to 1.0.
+            seed (Any, optional): seed of the random streams. Defaults to the seed of the workload.
+
+        Raises:
+            RuntimeError: if the workload has no templates or no seed.
+
+        Yields:
+            NetworkServiceBatch: up to ``batch_size`` arrivals of one template.
+        """
+        if not self._templates:
+            raise RuntimeError("Workload has no network service templates.")
+        seed = self._seed if seed is None else seed
+        if seed is None:
+            raise RuntimeError("Workload needs a seed.")
+        streams = np.random.SeedSequence(seed).spawn(len(self._templates))
+        for template, stream in zip(self._templates, streams):
+            rng = np.random.default_rng(stream)
+            slots = np.floor(template.arrivals.times(rng, horizon) / interval).astype(np.int64)
+            if self.debug:
+                logger.info(f"Generated {len(slots)} arrivals of network service\t {template.name}.")
+            for start in range(0, len(slots), self._batch_size):
+                batch = slots[start:start + self._batch_size]
+                schedules = batch[:, None] + template.schedule
+                if template.lengths is None:
+                    lengths = np.broadcast_to(template.length, schedules.shape)
+                else:
+                    factors = template.lengths.factors(rng, schedules.shape)
+                    lengths = np.maximum(np.rint(template.length * factors), 1).astype(np.int64)
+                yield NetworkServiceBatch(template.name, start, template.flows, template.ms, lengths, schedules)
+
+    def write_config(
+        self,
+        config: Config,
+        hosts: List[Host],
+        microservices: List[Microservice],
+        config_file: str,
+        horizon: float,
+        config_format: str = BINARY,
+        debug: bool = False,
+    ) -> str:
+        """Generate the workload straight into a configuration file.
+
+        Args:
+            config (Config): simulation configuration, its seed is used unless the workload has one.
+            hosts (List[Host]): hosts.
+            microservices (List[Microservice]): microservices, in the order the templates were created with.
+            config_file (str): file name in the configs directory.
+            horizon (float): simulated seconds during which network services arrive.
+            config_format (str, optional): "columnar" or "binary". Defaults to "binary".
+            debug (bool, optional): log the generated file. Defaults to False.
+
+        Raises:
+            RuntimeError: if the format is "json", which the jar needs one object per job for, or does not exist.
+
+        Returns:
+            str: hex digest of the configuration, usable with :meth:`PySDNSim.Cache.ResultCache.digest_key`.
+        """
+        if Backend.check_format(config_format) == JSON:
+            raise RuntimeError("Workloads are written in the columnar or binary format.")
+        return write_columnar_config(
+            config=config,
+            hosts=hosts,
+            microservices=microservices,
+            network_services=self.batches(horizon, config.interval, self._seed if self._seed is not None else config.seed),
+            config_file=config_file,
+            sidecar=config_format == BINARY,
+            debug=debug,
+        )
+
+    def run(
+        self,
+        backend: Backend,
+        name: str,
+        config: Config,
+        host: Host,
+        microservices: List[Microservice],
+        output_path: str,
+        horizon: float,
+    ) -> RunResult:
+        """Generate the workload and run it, e.g. with :class:`PySDNSim.Engine.PythonBackend`, see
+        :meth:`PySDNSim.Backend.Backend.run_batches`.
+
+        Args:
+            backend (Backend): backend reading the columnar or binary format.
+            name (str): experiment name.
+            config (Config): simulation configuration.
+            host (Host): host.
+            microservices (List[Microservice]): microservices.
+            output_path (str): directory under which the results are written.
+            horizon (float): simulated seconds during which network services arrive.
+
+        Raises:
+            RuntimeError: if the backend executable file is missing or the backend reads the json format.
+
+        Returns:
+            RunResult: exit code and timings of the run, rejected if the backend preflight rejects the experiment.
+        """
+        experiment = Experiment(name, config, host, microservices, list())
+        batches = self.batches(horizon, config.interval, self._seed if self._seed is not None else config.seed)
+        return backend.run_batches(experiment, batches, output_path)
@@ -0,0 +1,134 @@
+"""
+Helpers shared by the benchmarks: synthetic models and results, a stub backend and a timer that also records
+the peak of traced memory.
+"""
+import csv
+import gc
+import os
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+import numpy as np
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Config import Config
+from PySDNSim.Host import Host
+from PySDNSim.Microservice import Microservice
+from PySDNSim.NetworkService import NetworkService
+from PySDNSim.RunResult import RunResult
+
+
+def build_config() -> Config:
+    return Config(seed=1024)
+
+
+def build_host(replicas: int = 10) -> Host:
+    return Host(cpus=16, ram=65536, bw=10000, storage=102400, static_power=300.0, max_power=750.0, replicas=replicas)
+
+
+def build_microservices(count: int) -> List[Microservice]:
+    microservices: List[Microservice] = list()
+    for index in range(count):
+        ms = Microservice(name=f"ms_{index}", size=128, cpus=2, replicas=1, max_replicas=10, cpu_ratio=25,
+                          ram_ratio=32, bw_ratio=25)
+        ms.add_auto_scale("cpu", 0.5)
+        microservices.append(ms)
+    return microservices
+
+
+def job_columns(jobs: int, num_ms: int, jobs_per_ns: int, seed: int = 0) -> List[Tuple[List[str], List[int], List[int]]]:
+    """Microservice names, lengths and schedules of the jobs of every network service."""
+    rng = np.random.default_rng(seed)
+    columns = list()
+    for start in range(0, jobs, jobs_per_ns):
+        count = min(jobs_per_ns, jobs - start)
+        columns.append((
+            [f"ms_{index}" for index in rng.integers(0, num_ms, count)],
+            rng.integers(10, 10000, count).tolist(),
+            np.sort(rng.integers(0, max(count // 4, 1), count)).tolist(),
+        ))
+    return columns
+
+
+def build_network_services(microservices: List[Microservice], jobs: int, jobs_per_ns: int = 100) -> List[NetworkService]:
+    network_services: List[NetworkService] = list()
+    for index, (ms_names, lengths, schedules) in enumerate(job_columns(jobs, len(microservices), jobs_per_ns)):
+        ns = NetworkService(name=f"ns_{index}", flows=1)
+        ns.add_jobs(ms_names=ms_names, lengths=lengths, schedules=schedules, ms_pool=microservices)
+        network_services.append(ns)
+    return network_services
+
+
+def write_nsummary(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    start = rng.uniform(0, 100, rows)
+    finish = start + rng.exponential(5.0, rows)
+    complete = rng.random(rows) < 0.95
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "start", "finish", "complete"])
+        writer.writerows(zip((f"ns_{index % 100}" for index in range(rows)), start.round(6), finish.round(6),
+                             complete))
+
+
+def write_dc(path: str, rows: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    columns = ["time", "power", "cpu", "ram", "bw", "vms", "active_flows", "queued_flows"]
+    data = np.column_stack([np.arange(rows, dtype=np.float64), rng.uniform(300, 750, rows)] +
+                           [rng.random(rows) for _ in range(3)] + [rng.integers(1, 100, rows) for _ in range(3)])
+    with open(path, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        writer.writerows(data.round(6).tolist())
+
+
+class StubBackend(Backend):
+    """
+    Backend that writes synthetic results instead of running the jar, to time the Python side of a run.
+    """
+
+    def __init__(self, rows: int = 100, **kwargs):
+        super().__init__(**kwargs)
+        self._rows = rows
+
+    def _find_executable(self) -> bool:
+        return True
+
+    @property
+    def tag(self):
+        return "stub"
+
+    def _launch(self, name: str, config_file: str, output_path: str) -> RunResult:
+        start = time.perf_counter()
+        os.makedirs(output_path, exist_ok=True)
+        write_nsummary(os.path.join(output_path, "NSummary.csv"), self._rows)
+        write_dc(os.path.join(output_path, "DC.csv"), self._rows)
+        return RunResult(name=name, config_file=config_file, output_path=output_path, return_code=0,
+                         wall_time=time.perf_counter() - start)
+
+
+def measure(run: Callable[[], object], repeat: int = 3, budget: float = 1.0) -> Tuple[float, float, float]:
+    """Best wall time, peak traced memory and retained memory of a callable.
+
+    The callable is timed without tracing, up to ``repeat`` times while the total stays under ``budget``
+    seconds, then run once more under ``tracemalloc`` for its memory peak and for the memory still held by
+    its return value.
+
+    Returns:
+        Tuple[float, float, float]: seconds of the fastest run, peak MiB allocated during a run and MiB retained
+        by the result of a run.
+    """
+    times = list()
+    while len(times) < repeat and (not times or sum(times) < budget):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    kept = run()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return min(times), peak / 2 ** 20, current / 2 ** 20
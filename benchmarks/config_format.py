@@ -0,0 +1,51 @@
+"""
+Write time, peak memory and file size of the configuration formats for large network services.
+
+"json" is the indented format read by the jar, "columnar" streams parallel job arrays as compact JSON and
+"binary" streams them into a raw sidecar file.
+
+    python benchmarks/config_format.py [jobs ...]
+"""
+import os
+import sys
+import tempfile
+from typing import List
+
+from common import build_config, build_host, build_microservices, build_network_services, measure
+
+from PySDNSim.Backend import Backend
+from PySDNSim.ConfigWriter import FORMATS
+
+
+def report(jobs: int, config_format: str, microservices, network_services):
+    config, hosts = build_config(), [build_host(replicas=1)]
+
+    def run():
+        Backend.generate_config(
+            config=config,
+            hosts=hosts,
+            microservices=microservices,
+            network_services=network_services,
+            config_file="bench.json",
+            config_format=config_format,
+        )
+
+    seconds, peak, _ = measure(run, repeat=1)
+    size = sum(os.path.getsize(os.path.join("configs", name)) for name in os.listdir("configs"))
+    print(f"{jobs:>9} jobs  {config_format:<9} {seconds:8.3f} s  {peak:9.1f} MiB peak  "
+          f"{size / 2 ** 20:9.1f} MiB on disk")
+    for name in os.listdir("configs"):
+        os.remove(os.path.join("configs", name))
+
+
+def main(sizes: List[int]):
+    os.chdir(tempfile.mkdtemp())
+    for jobs in sizes:
+        microservices = build_microservices(50)
+        network_services = build_network_services(microservices, jobs, jobs_per_ns=max(jobs // 100, 1))
+        for config_format in FORMATS:
+            report(jobs, config_format, microservices, network_services)
+
+
+if __name__ == "__main__":
+    main([int(value) for value in sys.argv[1:]] or [10000, 100000, 1000000])
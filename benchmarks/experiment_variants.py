@@ -0,0 +1,67 @@
+"""
+Memory and build time of sweep variants of one experiment.
+
+Every variant scales one microservice and sets the number of flows, as a sweep would. The copy-on-write
+``Experiment`` is compared with deep copying the model per variant, which is what ``Experiment`` used to do.
+
+    python benchmarks/experiment_variants.py [variants]
+"""
+import sys
+from copy import deepcopy
+from typing import Callable, List
+
+from common import build_config, build_host, build_microservices, measure
+
+from PySDNSim.Experiment import Experiment
+from PySDNSim.NetworkService import NetworkService, create_network_service
+
+
+def build_model(num_ms: int = 50, num_ns: int = 20, jobs_per_ns: int = 20):
+    microservices = build_microservices(num_ms)
+    network_services: List[NetworkService] = list()
+    for index in range(num_ns):
+        network_services.append(
+            create_network_service(
+                name=f"ns_{index}",
+                microservices=[f"ms_{(index + job) % num_ms}" for job in range(jobs_per_ns)],
+                schdeule=list(range(jobs_per_ns)),
+                schedule_length=[10] * jobs_per_ns,
+                ms_pool=microservices,
+            )
+        )
+    return microservices, network_services
+
+
+def report(label: str, variants: int, build: Callable[[int], object]):
+    seconds, peak, retained = measure(lambda: [build(index) for index in range(variants)], repeat=1)
+    print(f"{label:<16} {variants:>8} variants  {seconds:8.3f} s  {retained:9.1f} MiB retained  "
+          f"{retained * 2 ** 20 / variants:9.0f} B/variant  {peak:9.1f} MiB peak")
+
+
+def main(variants: int = 100000):
+    config, host = build_config(), build_host()
+    microservices, network_services = build_model()
+    # snapshots shared by all variants, as a sweep takes them
+    ms_snapshot, ns_snapshot = tuple(microservices), tuple(network_services)
+
+    def shared(index: int) -> Experiment:
+        experiment = Experiment(f"{index}", config, host, ms_snapshot, ns_snapshot)
+        experiment.scale(f"ms_{index % len(microservices)}", "cpu", 1)
+        experiment.set_num_flows(index % 5 + 1)
+        return experiment
+
+    def deep_copied(index: int):
+        ms_copy = deepcopy(microservices)
+        ns_copy = deepcopy(network_services)
+        ms_copy[index % len(ms_copy)]._cpus += 1
+        for ns in ns_copy:
+            ns._flows = index % 5 + 1
+        return ms_copy, ns_copy
+
+    report("copy-on-write", variants, shared)
+    # deep copies are measured on fewer variants, memory per variant is what matters
+    report("deepcopy", max(variants // 1000, 1), deep_copied)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,46 @@
+"""
+Memory and construction time of model objects at scale.
+
+Builds one million ``Job`` objects and compares them with the previous layout: a per-instance ``__dict__`` and a
+``uuid4`` id per object.
+
+    python benchmarks/model_objects.py [jobs]
+"""
+import sys
+from typing import Callable, List
+from uuid import uuid4
+
+from common import build_microservices, measure
+
+from PySDNSim.Job import Job
+from PySDNSim.Microservice import Microservice
+
+
+class LegacyJob:
+    """
+    Job as it was before slots and integer ids, kept for comparison.
+    """
+
+    def __init__(self, ms_name: str, length: int, schedule: int, ms_pool: List[Microservice]):
+        self._id = uuid4()
+        for ms in ms_pool:
+            if ms.name == ms_name:
+                self._ms = ms
+                self._ms_id = ms_pool.index(ms)
+        self._length = length
+        self._schedule = schedule
+
+
+def report(label: str, jobs: int, build: Callable[[int], object]):
+    seconds, _, retained = measure(lambda: [build(index) for index in range(jobs)], repeat=1)
+    print(f"{label:<8} {jobs:>9} jobs  {seconds:8.3f} s  {retained:9.1f} MiB  {retained * 2 ** 20 / jobs:6.0f} B/job")
+
+
+def main(jobs: int = 1000000):
+    ms_pool = build_microservices(10)
+    report("slots", jobs, lambda index: Job(f"ms_{index % 10}", 10, index, ms_pool))
+    report("legacy", jobs, lambda index: LegacyJob(f"ms_{index % 10}", 10, index, ms_pool))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
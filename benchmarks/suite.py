@@ -0,0 +1,196 @@
+"""
+Benchmark suite of the Python side: model building, experiment variants, configuration generation and result
+parsing at synthetic scales. No JVM is needed, runs go through a stub backend.
+
+Every case reports the best wall time and the peak traced memory of one call. Results can be saved and compared
+with a baseline, the comparison exits with code 1 if a case got slower or used more memory than the threshold.
+
+    python benchmarks/suite.py [-k PATTERN] [--full] [--json RESULTS] [--compare BASELINE] [--threshold 1.25]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+from typing import Callable, Dict, List, Tuple
+
+from common import (
+    StubBackend,
+    build_config,
+    build_host,
+    build_microservices,
+    build_network_services,
+    job_columns,
+    measure,
+    write_dc,
+    write_nsummary,
+)
+
+from PySDNSim.Backend import Backend
+from PySDNSim.Experiment import Experiment
+from PySDNSim.MicroservicePool import MicroservicePool
+from PySDNSim.NetworkService import create_network_service
+from PySDNSim.Results import read_table
+
+MICROSERVICES = [10, 1000, 10000]
+JOBS = [1000, 10000, 100000]
+FULL_JOBS = JOBS + [1000000]
+ROWS = [1000, 100000]
+FULL_ROWS = ROWS + [1000000]
+
+
+def bench_create_network_service(jobs: int) -> Callable[[], object]:
+    pool = MicroservicePool(build_microservices(1000))
+    columns = job_columns(jobs, len(pool), jobs_per_ns=100)
+
+    def run():
+        return [
+            create_network_service(name=f"ns_{index}", microservices=ms_names, schdeule=schedules,
+                                   schedule_length=lengths, ms_pool=pool)
+            for index, (ms_names, lengths, schedules) in enumerate(columns)
+        ]
+
+    return run
+
+
+def bench_experiment(microservices: int) -> Callable[[], object]:
+    ms = build_microservices(microservices)
+    ns = build_network_services(ms, 1000)
+    config, host = build_config(), build_host()
+    return lambda: [Experiment(f"e_{index}", config, host, ms, ns) for index in range(100)]
+
+
+def bench_scale(microservices: int) -> Callable[[], object]:
+    ms = build_microservices(microservices)
+    ns = build_network_services(ms, 1000)
+    experiment = Experiment("e", build_config(), build_host(), MicroservicePool(ms), ns)
+
+    def run():
+        for index in range(0, microservices, max(microservices // 10, 1)):
+            experiment.scale(f"ms_{index}", "cpu", 1)
+        return experiment.microservices
+
+    return run
+
+
+def bench_scale_all(microservices: int) -> Callable[[], object]:
+    ms = build_microservices(microservices)
+    ns = build_network_services(ms, 1000)
+    experiment = Experiment("e", build_config(), build_host(), ms, ns)
+
+    def run():
+        experiment.scale_all("ram", 128)
+        return experiment.microservices
+
+    return run
+
+
+def bench_get_schedule(jobs: int) -> Callable[[], object]:
+    ns = build_network_services(build_microservices(1000), jobs)
+    return lambda: [service.get_schedule() for service in ns]
+
+
+def bench_generate_config(jobs: int) -> Callable[[], object]:
+    ms = build_microservices(100)
+    ns = build_network_services(ms, jobs)
+    config, host = build_config(), build_host()
+    return lambda: Backend.generate_config(config=config, hosts=[host], microservices=ms, network_services=ns,
+                                           config_file="bench.json")
+
+
+def bench_generate_config_binary(jobs: int) -> Callable[[], object]:
+    ms = build_microservices(100)
+    ns = build_network_services(ms, jobs)
+    config, host = build_config(), build_host()
+    return lambda: Backend.generate_config(config=config, hosts=[host], microservices=ms, network_services=ns,
+                                           config_file="bench.json", config_format="binary")
+
+
+def bench_parse_nsummary(rows: int) -> Callable[[], object]:
+    path = f"NSummary_{rows}.csv"
+    write_nsummary(path, rows)
+    return lambda: read_table(path)
+
+
+def bench_parse_dc(rows: int) -> Callable[[], object]:
+    path = f"DC_{rows}.csv"
+    write_dc(path, rows)
+    return lambda: read_table(path)
+
+
+def bench_stub_run(jobs: int) -> Callable[[], object]:
+    ms = build_microservices(100)
+    ns = build_network_services(ms, jobs)
+    backend = StubBackend()
+    experiment = Experiment("stub", build_config(), build_host(), ms, ns)
+    return lambda: backend.run_experiment(experiment, "results")
+
+
+def cases(full: bool) -> List[Tuple[str, str, List[int], Callable[[int], Callable[[], object]]]]:
+    jobs = FULL_JOBS if full else JOBS
+    rows = FULL_ROWS if full else ROWS
+    return [
+        ("create_network_service", "jobs", jobs, bench_create_network_service),
+        ("experiment_x100", "microservices", MICROSERVICES, bench_experiment),
+        ("scale", "microservices", MICROSERVICES, bench_scale),
+        ("scale_all", "microservices", MICROSERVICES, bench_scale_all),
+        ("get_schedule", "jobs", jobs, bench_get_schedule),
+        ("generate_config", "jobs", jobs, bench_generate_config),
+        ("generate_config_binary", "jobs", jobs, bench_generate_config_binary),
+        ("parse_nsummary", "rows", rows, bench_parse_nsummary),
+        ("parse_dc", "rows", rows, bench_parse_dc),
+        ("stub_run", "jobs", jobs, bench_stub_run),
+    ]
+
+
+def run(pattern: str = "", full: bool = False) -> Dict[str, Dict[str, float]]:
+    results = dict()
+    print(f"{'case':<44}{'seconds':>12}{'peak MiB':>12}")
+    for name, parameter, values, bench in cases(full):
+        for value in values:
+            label = f"{name}[{parameter}={value}]"
+            if pattern not in label:
+                continue
+            seconds, peak, _ = measure(bench(value))
+            results[label] = {"seconds": seconds, "peak_mb": peak}
+            print(f"{label:<44}{seconds:>12.5f}{peak:>12.2f}", flush=True)
+    return results
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline: Dict[str, Dict[str, float]], threshold: float) -> bool:
+    regressed = False
+    for label, current in results.items():
+        previous = baseline.get(label)
+        if previous is None:
+            continue
+        for metric in ("seconds", "peak_mb"):
+            if previous[metric] > 0 and current[metric] > threshold * previous[metric]:
+                regressed = True
+                print(f"REGRESSION {label} {metric}: {previous[metric]:.5g} -> {current[metric]:.5g}")
+    return not regressed
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", default="", help="only run cases whose label contains this")
+    parser.add_argument("--full", action="store_true", help="also run the 1M job and row scales")
+    parser.add_argument("--json", help="save the results to this file")
+    parser.add_argument("--compare", help="baseline results to compare with")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown factor reported as a regression")
+    args = parser.parse_args(argv)
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline_path = os.path.abspath(args.compare) if args.compare else None
+
+    os.chdir(tempfile.mkdtemp(prefix="pysdnsim-bench-"))
+    results = run(args.pattern, args.full)
+    if json_path:
+        with open(json_path, "w") as file:
+            json.dump(results, file, indent=2)
+    if baseline_path:
+        with open(baseline_path) as file:
+            return 0 if compare(results, json.load(file), args.threshold) else 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
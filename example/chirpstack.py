@@ -1,18 +1,22 @@
+import csv
+import os
 import random
 from copy import deepcopy
 from typing import List
 
-import pandas as pd
 # import plotly.graph_objects as go
 # import plotly.express as px
 # from dash import Dash, Input, Output, dcc, html
+from PySDNSim.Analytics import Analytics
 from PySDNSim.Backend import Backend
+from PySDNSim.Cache import ResultCache
 from PySDNSim.Config import Config
 from PySDNSim.Experiment import Experiment
 from PySDNSim.Host import Host
 from PySDNSim.Job import Job
 from PySDNSim.Microservice import Microservice
 from PySDNSim.NetworkService import NetworkService, create_network_service
+from PySDNSim.Results import DC, iter_sweep_chunks
 
 random.seed(1024)
 
@@ -148,7 +152,7 @@ retrive_data = create_network_service(
 ns_list.append(retrive_data)
 
 # find baseline for each network service
-backend = Backend()
+backend = Backend(cache=ResultCache())
 baseline_register_device = Experiment(
     name="register_device_baseline",
     config=sim_config,
@@ -176,6 +180,7 @@ backend.run_experiment(experiment=baseline_retrive_data, output_path="./results"
 
 chosen_ns: List[NetworkService] = deepcopy(random.choices(ns_list, k=100))
 # server network service one by one
+experiments = list()
 for iter in range(100):
     experiment = Experiment(
         name=f"1_ns_{iter}",
@@ -184,8 +189,10 @@ for iter in range(100):
         microservices=microservices,
         network_services=[chosen_ns[iter]],
     )
-    backend.run_experiment(experiment=experiment, output_path="./results/1_ns/")
+    experiments.append(experiment)
+backend.run_experiments(experiments=experiments, output_path="./results/1_ns/")
 
+experiments = list()
 for iter in range(20):
     experiment = Experiment(
         name=f"5_ns_{iter}",
@@ -194,9 +201,10 @@ for iter in range(20):
         microservices=microservices,
         network_services=chosen_ns[iter*5:(iter+1)*5],
     )
-    backend.run_experiment(experiment=experiment, output_path="./results/5_ns/")
-
+    experiments.append(experiment)
+backend.run_experiments(experiments=experiments, output_path="./results/5_ns/")
 
+experiments = list()
 for iter in range(10):
     experiment = Experiment(
         name=f"10_ns_{iter}",
@@ -205,75 +213,31 @@ for iter in range(10):
         microservices=microservices,
         network_services=chosen_ns[iter*10:(iter+1)*10],
     )
-    backend.run_experiment(experiment=experiment, output_path="./results/10_ns/")
-
-
-
-df = pd.read_csv(f"results\\register_device_baseline\\NSummary.csv")
-register_device_delay = df.loc[0, "finish"] - df.loc[0, "start"]
-
-df = pd.read_csv(f"results\\receive_data_baseline\\NSummary.csv")
-receive_data_delay = df.loc[0, "finish"] - df.loc[0, "start"]
+    experiments.append(experiment)
+backend.run_experiments(experiments=experiments, output_path="./results/10_ns/")
 
-df = pd.read_csv(f"results\\retrive_data_baseline\\NSummary.csv")
-retrive_data_delay = df.loc[0, "finish"] - df.loc[0, "start"]
 
-df_1_ns = pd.DataFrame(columns=['power'])
-for i in range(100):
-    df_i = pd.read_csv(f"results\\1_ns\\1_ns_{i}\\DC.csv")
-    df_i = df_i.loc[:,["power"]]
-    df_1_ns=pd.concat([df_1_ns,df_i],ignore_index=True)
-df_1_ns.index.name = "sample"
-df_1_ns.to_csv("results\\1_ns\\1_ns_power.csv")
 
-df_5_ns = pd.DataFrame(columns=['power'])
-for i in range(20):
-    df_i = pd.read_csv(f"results\\5_ns\\5_ns_{i}\\DC.csv")
-    df_i = df_i.loc[:,["power"]]
-    df_5_ns=pd.concat([df_5_ns,df_i],ignore_index=True)
-df_5_ns.index.name = "sample"
-df_5_ns.to_csv("results\\5_ns\\5_ns_power.csv")
+analytics = Analytics("results")
+# delay of every network service running alone
+baseline = analytics.baseline("*_baseline")
 
-df_10_ns = pd.DataFrame(columns=['power'])
-for i in range(10):
-    df_i = pd.read_csv(f"results\\10_ns\\10_ns_{i}\\DC.csv")
-    df_i = df_i.loc[:,["power"]]
-    df_10_ns=pd.concat([df_10_ns,df_i],ignore_index=True)
-df_10_ns.index.name = "sample"
-df_10_ns.to_csv("results\\10_ns\\10_ns_power.csv")
+for sweep in ("1_ns", "5_ns", "10_ns"):
+    with open(os.path.join("results", sweep, f"{sweep}_power.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["sample", "power"])
+        sample = 0
+        for _, chunk in iter_sweep_chunks(os.path.join("results", sweep), table=DC):
+            writer.writerows(zip(range(sample, sample + len(chunk)), chunk["power"]))
+            sample += len(chunk)
 
-# success_rate = list()
-# fail_rate = list()
-# delays = list()
-# for i in range(100):
-#     success = 0
-#     fail = 0
-#     average_delay = 0
-#     df = pd.read_csv(f"results\\{i}\\NSummary.csv")
-#     for row_index in range(len(df)):
-#         if df.loc[row_index, "complete"] == True:
-#             success = success + 1
-#             average_delay = average_delay + (
-#                 df.loc[row_index, "finish"] - df.loc[row_index, "start"]
-#             )
-#             if df.loc[row_index, "name"] == "register_device":
-#                 average_delay = average_delay - register_device_delay
-#             if df.loc[row_index, "name"] == "receive_data":
-#                 average_delay = average_delay - receive_data_delay
-#             if df.loc[row_index, "name"] == "retrive_data":
-#                 average_delay = average_delay - retrive_data_delay
-#         if df.loc[row_index, "complete"] == False:
-#             fail = fail + 1
-#             if df.loc[row_index, "name"] == "register_device":
-#                 average_delay = average_delay + register_device_delay
-#             if df.loc[row_index, "name"] == "receive_data":
-#                 average_delay = average_delay + receive_data_delay
-#             if df.loc[row_index, "name"] == "retrive_data":
-#                 average_delay = average_delay + retrive_data_delay
-#     average_delay = average_delay / len(df)
-#     delays.append(average_delay)
-#     success_rate.append(success / len(df))
-#     fail_rate.append(fail / len(df))
+    summary = analytics.summary(pattern=f"{sweep}_*", baseline=baseline, by_group=False)
+    with open(os.path.join("results", sweep, f"{sweep}_ns.csv"), "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["experiment", "success_rate", "fail_rate", "delay"])
+        writer.writerows(
+            zip(summary["experiment"], summary["success_rate"], 1 - summary["success_rate"], summary["delay_score"])
+        )
 
 # df = pd.DataFrame(
 #     {